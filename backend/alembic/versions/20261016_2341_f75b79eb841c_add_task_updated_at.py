@@ -0,0 +1,28 @@
+"""Add tasks.updated_at
+
+Keys the compiled verification rules cache; existing rows start at
+their created_at.
+
+Revision ID: f75b79eb841c
+Revises: 2028499285df
+Create Date: 2026-10-16 23:41:12.408153
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f75b79eb841c'
+down_revision = '2028499285df'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE tasks SET updated_at = created_at")
+    op.alter_column('tasks', 'updated_at', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'updated_at')
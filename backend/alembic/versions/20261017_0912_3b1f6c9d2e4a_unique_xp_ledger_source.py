@@ -0,0 +1,29 @@
+"""Make the XP ledger source index unique
+
+XP grants use it as their ON CONFLICT target, so a sourced award is
+applied at most once per user. Fails if duplicate sourced awards already
+exist; remove them (and correct users.xp_total) first.
+
+Revision ID: 3b1f6c9d2e4a
+Revises: f75b79eb841c
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3b1f6c9d2e4a'
+down_revision = 'f75b79eb841c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('uq_xp_ledger_source', 'xp_ledger', ['source_type', 'source_id', 'user_id'], unique=True, postgresql_where=sa.text('source_id IS NOT NULL'))
+    op.drop_index('ix_xp_ledger_source', table_name='xp_ledger', postgresql_where=sa.text('source_id IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.create_index('ix_xp_ledger_source', 'xp_ledger', ['source_id', 'source_type', 'user_id'], unique=False, postgresql_where=sa.text('source_id IS NOT NULL'))
+    op.drop_index('uq_xp_ledger_source', table_name='xp_ledger', postgresql_where=sa.text('source_id IS NOT NULL'))
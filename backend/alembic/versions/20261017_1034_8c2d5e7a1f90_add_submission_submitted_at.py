@@ -0,0 +1,29 @@
+"""Add submissions.submitted_at
+
+Time of the first submission or latest resubmission; transaction proofs
+count their not-found grace window from it. Existing rows start at their
+created_at.
+
+Revision ID: 8c2d5e7a1f90
+Revises: 3b1f6c9d2e4a
+Create Date: 2026-10-17 10:34:18.552031
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '8c2d5e7a1f90'
+down_revision = '3b1f6c9d2e4a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('submissions', sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE submissions SET submitted_at = created_at")
+    op.alter_column('submissions', 'submitted_at', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('submissions', 'submitted_at')
@@ -3,27 +3,30 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import redis.asyncio as aioredis
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal
+from app.core.instrumentation import InstrumentedRedis
+from app.core.nonce_store import InMemoryNonceStore, NonceStore, RedisNonceStore
 from app.core.security import verify_token
 from app.core.config import settings
+from app.core.user_cache import user_cache
 from app.models.user import User, UserRole
 
 # HTTP Bearer token scheme
 bearer_scheme = HTTPBearer()
+optional_bearer_scheme = HTTPBearer(auto_error=False)
 
 # Redis client singleton
 _redis_client: Optional[aioredis.Redis] = None
 
 
 async def get_redis() -> aioredis.Redis:
-    """Get Redis client"""
+    """Get Redis client (commands are counted in the request timings)"""
     global _redis_client
     if _redis_client is None:
-        _redis_client = await aioredis.from_url(
+        _redis_client = await InstrumentedRedis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True
@@ -31,11 +34,27 @@ async def get_redis() -> aioredis.Redis:
     return _redis_client
 
 
+# Process-local nonce store (NONCE_STORE=memory)
+_memory_nonce_store = InMemoryNonceStore()
+
+
+async def get_nonce_store() -> NonceStore:
+    """Get the configured SIWE nonce store"""
+    if settings.NONCE_STORE == "memory":
+        return _memory_nonce_store
+    return RedisNonceStore(await get_redis())
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ) -> User:
-    """Get current authenticated user from JWT token"""
+    """
+    Get current authenticated user from JWT token.
+
+    The user is served from the two-tier user cache; a database
+    connection is only checked out on a cache miss.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -59,13 +78,19 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    cached = await user_cache.get(user_id, redis_client)
+    if cached.user is not None:
+        return cached.user
+
+    # Cache miss - fetch user from database
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
 
     if user is None:
         raise credentials_exception
 
+    await user_cache.set(user, redis_client, cached.generation)
     return user
 
 
@@ -99,14 +124,14 @@ require_instructor = require_role(UserRole.INSTRUCTOR)
 
 
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer_scheme),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ) -> Optional[User]:
     """Get current user if authenticated, otherwise None"""
     if not credentials:
         return None
 
     try:
-        return await get_current_user(credentials, db)
+        return await get_current_user(credentials, redis_client)
     except HTTPException:
         return None
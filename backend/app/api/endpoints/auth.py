@@ -1,11 +1,16 @@
 """Authentication endpoints - SIWE wallet authentication"""
 
+import time
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as aioredis
 
+from app.core import metrics
 from app.core.database import get_db
-from app.api.deps import get_redis, get_current_active_user
+from app.api.deps import get_redis, get_nonce_store, get_current_active_user
+from app.core.executor import PoolSaturatedError
+from app.core.instrumentation import TimedRoute
+from app.core.nonce_store import NonceStore
 from app.services.auth_service import AuthService
 from app.schemas.auth import (
     NonceRequest,
@@ -17,7 +22,7 @@ from app.schemas.auth import (
 from app.models.user import User
 from app.core.security import verify_token, create_access_token
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/nonce", response_model=NonceResponse)
@@ -25,6 +30,7 @@ async def request_nonce(
     request: NonceRequest,
     db: AsyncSession = Depends(get_db),
     redis_client: aioredis.Redis = Depends(get_redis),
+    nonce_store: NonceStore = Depends(get_nonce_store),
 ):
     """
     Generate a nonce for SIWE authentication.
@@ -35,7 +41,7 @@ async def request_nonce(
     3. Prompt the user to sign the message with their wallet
     4. Call /auth/verify with the signature
     """
-    auth_service = AuthService(db, redis_client)
+    auth_service = AuthService(db, redis_client, nonce_store)
 
     try:
         nonce_response = await auth_service.generate_nonce(request.address)
@@ -52,6 +58,7 @@ async def verify_signature(
     request: VerifyRequest,
     db: AsyncSession = Depends(get_db),
     redis_client: aioredis.Redis = Depends(get_redis),
+    nonce_store: NonceStore = Depends(get_nonce_store),
 ):
     """
     Verify SIWE signature and issue JWT tokens.
@@ -59,31 +66,44 @@ async def verify_signature(
     The signature verification process:
     1. Validate the SIWE message format
     2. Verify the cryptographic signature
-    3. Check nonce validity (prevent replay attacks)
-    4. Get or create user account
-    5. Issue access and refresh tokens
+    3. Check nonce validity (prevent replay attacks), before any user
+       row is written
+    4. Get or create the user account and issue access and refresh
+       tokens (one Redis round trip with step 3 for existing users)
     """
-    auth_service = AuthService(db, redis_client)
+    auth_service = AuthService(db, redis_client, nonce_store)
 
     # Verify signature
-    is_valid, error_message = await auth_service.verify_signature(
-        address=request.address,
-        signature=request.signature,
-        message=request.message,
-    )
+    started = time.perf_counter()
+    try:
+        nonce, error_message = await auth_service.verify_signature(
+            address=request.address,
+            signature=request.signature,
+            message=request.message,
+        )
+    except PoolSaturatedError:
+        metrics.auth_verifications.labels("saturated").inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
 
-    if not is_valid:
+    metrics.auth_verify_duration.observe(time.perf_counter() - started)
+
+    token_response = None
+    if nonce is not None:
+        # Consume the nonce, then get or create the user and issue tokens
+        token_response, error_message = await auth_service.sign_in(request.address, nonce)
+
+    metrics.auth_verifications.labels("valid" if token_response else "invalid").inc()
+
+    if token_response is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=error_message or "Invalid signature",
         )
 
-    # Get or create user
-    user = await auth_service.get_or_create_user(request.address)
-
-    # Create tokens
-    token_response = await auth_service.create_tokens(user)
-
     return token_response
 
 
@@ -1,16 +1,23 @@
 """Course endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-
-from app.core.database import get_db
-from app.api.deps import get_current_active_user, get_current_user_optional
+import redis.asyncio as aioredis
+
+from app.core.catalog_cache import cache_name, catalog_cache
+from app.core.http_cache import CATALOG, ConditionalGet, conditional_get
+from app.core.instrumentation import TimedRoute, timed_serialization
+from app.core.database import get_db, get_db_readonly
+from app.api.deps import get_current_active_user, get_current_user_optional, get_redis
+from app.core.pagination import InvalidCursorError
 from app.services.course_service import CourseService
 from app.schemas.course import CourseResponse, CourseCreate, CourseUpdate, CourseEnrollResponse
 from app.models.user import User, UserRole
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("", response_model=dict)
@@ -20,11 +27,15 @@ async def list_courses(
     search: Optional[str] = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    count: Optional[str] = Query(None, regex="^(exact|estimated|none)$"),
+    db: AsyncSession = Depends(get_db_readonly),
+    redis_client: aioredis.Redis = Depends(get_redis),
     current_user: Optional[User] = Depends(get_current_user_optional),
+    cache: ConditionalGet = Depends(conditional_get(CATALOG)),
 ):
     """
-    List all courses with filters.
+    List all courses with filters, newest first.
 
     Query parameters:
     - published_only: Show only published courses (default: true)
@@ -32,37 +43,78 @@ async def list_courses(
     - search: Search in title and description
     - page: Page number (default: 1)
     - per_page: Items per page (default: 20, max: 100)
-
-    Returns paginated list of courses.
+    - cursor: `meta.next_cursor` from the previous page; pages by keyset
+      and ignores `page`
+    - count: Total to report - 'exact' (cached briefly), 'estimated'
+      (planner estimate) or 'none'. Defaults to 'exact' for page mode
+      and 'none' for cursor mode.
+
+    Returns paginated list of courses. Published-only pages are served
+    from the catalog cache and tagged with an ETag of the catalog version.
     """
-    course_service = CourseService(db)
+    course_service = CourseService(db, redis_client)
+
+    if count is None:
+        count = "none" if cursor else "exact"
+
+    async def load_page() -> str:
+        courses, total, next_cursor = await course_service.list_courses(
+            published_only=published_only,
+            difficulty=difficulty,
+            search=search,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            cursor=cursor,
+            count=count,
+        )
+
+        with timed_serialization():
+            return json.dumps(jsonable_encoder({
+                "success": True,
+                "data": [CourseResponse.from_orm(course) for course in courses],
+                "meta": {
+                    "page": None if cursor else page,
+                    "per_page": per_page,
+                    "total": total,
+                    "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+                    "count": count,
+                    "next_cursor": next_cursor,
+                },
+            }))
+
+    try:
+        if published_only:
+            name = cache_name(
+                "page",
+                difficulty=difficulty,
+                search=search,
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+                count=count,
+            )
+            version = await catalog_cache.version(redis_client)
+            if version is not None and (not_modified := cache.check(version, name)):
+                return not_modified
+            payload = await catalog_cache.get_or_load(redis_client, name, load_page)
+        else:
+            payload = await load_page()
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
-    offset = (page - 1) * per_page
-    courses, total = await course_service.list_courses(
-        published_only=published_only,
-        difficulty=difficulty,
-        search=search,
-        limit=per_page,
-        offset=offset,
-    )
-
-    return {
-        "success": True,
-        "data": [CourseResponse.from_orm(course) for course in courses],
-        "meta": {
-            "page": page,
-            "per_page": per_page,
-            "total": total,
-            "total_pages": (total + per_page - 1) // per_page,
-        },
-    }
+    return Response(content=payload, media_type="application/json", headers=cache.headers)
 
 
 @router.get("/{slug}", response_model=CourseResponse)
 async def get_course(
     slug: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
+    redis_client: aioredis.Redis = Depends(get_redis),
     current_user: Optional[User] = Depends(get_current_user_optional),
+    cache: ConditionalGet = Depends(conditional_get(CATALOG)),
 ):
     """
     Get course details by slug.
@@ -72,9 +124,37 @@ async def get_course(
     - Author info
     - XP total
     - Token gating requirements
+
+    Published courses are served from the catalog cache and tagged with
+    an ETag of the catalog version, so a matching If-None-Match gets a
+    304 without loading the course.
     """
     course_service = CourseService(db)
-    course = await course_service.get_course_by_slug(slug)
+    loaded = {}
+
+    # Read before the payload, so the tag is never newer than the body.
+    # Unpublishing bumps the version, so a tag never outlives publication.
+    version = await catalog_cache.version(redis_client)
+    if version is not None and (not_modified := cache.check(version, "course", slug)):
+        return not_modified
+
+    async def load_course() -> Optional[str]:
+        course = loaded["course"] = await course_service.get_course_by_slug(slug)
+        if course is None or not course.published:
+            return None
+        with timed_serialization():
+            return CourseResponse.model_validate(course).model_dump_json()
+
+    payload = await catalog_cache.get_or_load(redis_client, f"course:{slug}", load_course)
+    if payload is not None:
+        return Response(content=payload, media_type="application/json", headers=cache.headers)
+
+    # Missing or unpublished - never cached
+    cache.no_store()
+    if "course" in loaded:
+        course = loaded["course"]
+    else:
+        course = await course_service.get_course_by_slug(slug)
 
     if not course:
         raise HTTPException(
@@ -150,7 +230,7 @@ async def enroll_in_course(
 async def get_course_progress(
     course_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
 ):
     """
     Get user's progress in a course.
@@ -178,6 +258,7 @@ async def create_course(
     course_data: CourseCreate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """
     Create a new course.
@@ -196,7 +277,7 @@ async def create_course(
             detail="Only instructors and admins can create courses"
         )
 
-    course_service = CourseService(db)
+    course_service = CourseService(db, redis_client)
 
     try:
         course = await course_service.create_course(course_data, current_user.id)
@@ -214,13 +295,14 @@ async def update_course(
     course_update: CourseUpdate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """
     Update a course.
 
     Only the course author or admins can update courses.
     """
-    course_service = CourseService(db)
+    course_service = CourseService(db, redis_client)
 
     course = await course_service.get_course_by_id(course_id)
     if not course:
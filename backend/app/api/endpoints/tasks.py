@@ -2,11 +2,14 @@
 
 from uuid import UUID
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as aioredis
 
-from app.core.database import get_db
-from app.core.auth import get_current_user
+from app.core.database import get_db, get_db_readonly
+from app.core.http_cache import PRIVATE, ConditionalGet, conditional_get
+from app.core.instrumentation import TimedRoute
+from app.api.deps import get_current_user, get_redis
 from app.models.user import User
 from app.services.task_service import TaskService
 from app.schemas.task import (
@@ -17,10 +20,11 @@ from app.schemas.task import (
     SubmissionCreate,
     SubmissionReview,
     SubmissionResponse,
+    SubmissionAccepted,
     SubmissionWithTask,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 # ===== Task Endpoints =====
@@ -31,6 +35,7 @@ async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """
     Create a new task (instructor/admin only).
@@ -42,7 +47,7 @@ async def create_task(
     - **auto_verify**: Whether to auto-verify submissions
     - **verification_rules**: Rules for auto-verification
     """
-    service = TaskService(db)
+    service = TaskService(db, redis_client)
     task = await service.create_task(task_data, current_user)
     return task
 
@@ -51,15 +56,24 @@ async def create_task(
 async def get_course_tasks(
     course_id: UUID,
     current_user: Optional[User] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
+    redis_client: aioredis.Redis = Depends(get_redis),
+    cache: ConditionalGet = Depends(conditional_get(PRIVATE)),
 ):
     """
     Get all tasks for a course.
 
-    Includes user's submission status if authenticated.
+    Includes user's submission status if authenticated. Tagged with an
+    ETag of the course's task version and the user's submission version.
     """
-    service = TaskService(db)
+    service = TaskService(db, redis_client)
     user_id = current_user.id if current_user else None
+
+    if user_id:
+        versions = await service.get_course_tasks_version(course_id, user_id)
+        if versions is not None and (not_modified := cache.check(course_id, user_id, *versions)):
+            return not_modified
+
     tasks = await service.get_course_tasks(course_id, user_id)
 
     # Add user submissions to response
@@ -81,7 +95,7 @@ async def get_course_tasks(
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
 ):
     """Get a task by ID"""
     service = TaskService(db)
@@ -95,9 +109,10 @@ async def update_task(
     task_data: TaskUpdate,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """Update a task (instructor/admin only)"""
-    service = TaskService(db)
+    service = TaskService(db, redis_client)
     task = await service.update_task(task_id, task_data, current_user)
     return task
 
@@ -107,20 +122,24 @@ async def delete_task(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """Delete a task (instructor/admin only)"""
-    service = TaskService(db)
+    service = TaskService(db, redis_client)
     await service.delete_task(task_id, current_user)
 
 
 # ===== Submission Endpoints =====
 
 
-@router.post("/submissions", response_model=SubmissionResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/submissions", response_model=SubmissionAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def submit_task(
     submission_data: SubmissionCreate,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """
     Submit a task completion.
@@ -131,17 +150,26 @@ async def submit_task(
     - **transaction_proof**: Include transaction_hash
     - **quiz**: Include submission_text with quiz answers
     - **text_submission**: Include submission_text
+
+    The submission is stored as pending and verified in the background
+    (or reviewed by an instructor); poll `status_url` (also sent as
+    Location) for the outcome.
     """
-    service = TaskService(db)
+    service = TaskService(db, redis_client)
     submission = await service.submit_task(submission_data, current_user)
-    return submission
+
+    status_url = request.app.url_path_for("get_submission", submission_id=str(submission.id))
+    response.headers["Location"] = status_url
+    return SubmissionAccepted(
+        **SubmissionResponse.model_validate(submission).model_dump(), status_url=status_url
+    )
 
 
 @router.get("/submissions/{submission_id}", response_model=SubmissionWithTask)
 async def get_submission(
     submission_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
 ):
     """Get a submission by ID"""
     service = TaskService(db)
@@ -165,7 +193,7 @@ async def get_user_submissions(
     user_id: UUID,
     course_id: Optional[UUID] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
 ):
     """
     Get all submissions for a user.
@@ -190,6 +218,7 @@ async def review_submission(
     review_data: SubmissionReview,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """
     Review a submission (instructor/admin only).
@@ -198,7 +227,7 @@ async def review_submission(
     - **xp_awarded**: XP to award (if approved)
     - **feedback**: Optional feedback for the learner
     """
-    service = TaskService(db)
+    service = TaskService(db, redis_client)
     submission = await service.review_submission(submission_id, review_data, current_user)
     return submission
 
@@ -207,7 +236,7 @@ async def review_submission(
 async def get_pending_submissions(
     course_id: Optional[UUID] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
 ):
     """
     Get all pending submissions (instructor/admin only).
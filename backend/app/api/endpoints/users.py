@@ -1,16 +1,23 @@
 """User endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
+from uuid import UUID
+import redis.asyncio as aioredis
 
-from app.core.database import get_db
-from app.api.deps import get_current_active_user
+from app.core.database import get_db, get_db_readonly
+from app.core.http_cache import BADGES, LEADERBOARD, ConditionalGet, conditional_get
+from app.core.instrumentation import TimedRoute
+from app.api.deps import get_current_active_user, get_redis, require_admin
+from app.services.leaderboard_service import LeaderboardService
 from app.services.user_service import UserService
-from app.schemas.user import UserResponse, UserUpdate, UserPublic
-from app.models.user import User
+from app.services.xp_service import XPService, XPGrantRow, BulkXPGrantProgress
+from app.schemas.user import UserResponse, UserUpdate, UserPublic, UserRoleUpdate
+from app.schemas.xp import BulkXPGrantRequest, BulkXPGrantResponse
+from app.models.user import User, UserRole
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -34,6 +41,7 @@ async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """
     Update current user's profile.
@@ -44,7 +52,7 @@ async def update_current_user(
     - bio
     - profile_picture_url
     """
-    user_service = UserService(db)
+    user_service = UserService(db, redis_client)
 
     try:
         updated_user = await user_service.update_user(current_user.id, user_update)
@@ -56,11 +64,36 @@ async def update_current_user(
         )
 
 
+@router.patch("/{user_id}/role", response_model=UserResponse)
+async def update_user_role(
+    user_id: UUID,
+    role_update: UserRoleUpdate,
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
+):
+    """
+    Change a user's role (admin only).
+
+    Cached copies of the user are invalidated on every worker, so the new
+    role applies to the user's next request.
+    """
+    user_service = UserService(db, redis_client)
+
+    try:
+        return await user_service.set_role(user_id, UserRole(role_update.role))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
 @router.get("/{user_id}/xp")
 async def get_user_xp_history(
     user_id: str,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
 ):
     """
     Get user's XP history.
@@ -91,10 +124,52 @@ async def get_user_xp_history(
     }
 
 
+@router.post("/xp/grants", response_model=BulkXPGrantResponse)
+async def bulk_grant_xp(
+    request: BulkXPGrantRequest,
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+    redis_client: aioredis.Redis = Depends(get_redis),
+):
+    """
+    Grant XP to many users at once (admin only).
+
+    Used for campaign and bounty payouts. Rows are applied in chunks of
+    `chunk_size`, each committed on its own. Rows already present in the
+    ledger for the same (source_type, source_id, user_id) are skipped, so
+    a failed payout can be re-submitted as-is.
+    """
+    xp_service = XPService(db, redis_client)
+
+    async def report(progress: BulkXPGrantProgress) -> None:
+        print(
+            f"XP grant chunk {progress.chunk}: {progress.processed}/{progress.total} rows, "
+            f"{progress.awarded} awarded, {progress.skipped} skipped"
+        )
+
+    result = await xp_service.bulk_award_xp(
+        (
+            XPGrantRow(
+                user_id=grant.user_id,
+                amount=grant.amount,
+                source_type=grant.source_type,
+                source_id=grant.source_id,
+                reason=grant.reason,
+            )
+            for grant in request.grants
+        ),
+        chunk_size=request.chunk_size,
+        on_progress=report,
+    )
+
+    return BulkXPGrantResponse(**result._asdict())
+
+
 @router.get("/{user_id}/badges")
 async def get_user_badges(
     user_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
+    cache: ConditionalGet = Depends(conditional_get(BADGES)),
 ):
     """
     Get user's earned badges.
@@ -104,8 +179,14 @@ async def get_user_badges(
     - Earn date
     - NFT minting status
     - Token ID (if minted)
+
+    Tagged with an ETag of the badge count, latest earn date and minting
+    progress.
     """
     user_service = UserService(db)
+    if not_modified := cache.check(user_id, *await user_service.get_user_badges_version(user_id)):
+        return not_modified
+
     badges = await user_service.get_user_badges(user_id)
 
     return {
@@ -127,37 +208,59 @@ async def get_user_badges(
 
 @router.get("/leaderboard", response_model=List[dict])
 async def get_leaderboard(
-    limit: int = 100,
-    offset: int = 0,
-    time_period: str = "all_time",
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    time_period: str = Query("all_time", regex="^(all_time|weekly|monthly)$"),
+    redis_client: aioredis.Redis = Depends(get_redis),
+    cache: ConditionalGet = Depends(conditional_get(LEADERBOARD)),
 ):
     """
     Get platform leaderboard.
 
     Query parameters:
-    - limit: Number of users to return (default: 100)
+    - limit: Number of users to return (default: 100, max: 500)
     - offset: Pagination offset (default: 0)
     - time_period: 'all_time', 'weekly', 'monthly' (default: all_time)
 
+    Served from Redis sorted sets maintained on every XP award, so pages
+    cost O(log n + limit) and do not query Postgres; a window that was
+    never built is served empty while the worker rebuilds it. Tagged with
+    an ETag of the leaderboard version, which every award bumps.
+
     Returns ranked list of users with:
     - Rank
     - User info (username, wallet, profile pic)
-    - Total XP
+    - XP for the period
     """
-    user_service = UserService(db)
-    leaderboard = await user_service.get_leaderboard(limit, offset, time_period)
-
-    return [
-        {
-            "rank": entry["rank"],
-            "user": {
-                "id": str(entry["user"].id),
-                "wallet_address": entry["user"].wallet_address,
-                "username": entry["user"].username,
-                "profile_picture_url": entry["user"].profile_picture_url,
-            },
-            "xp_total": entry["xp_total"],
-        }
-        for entry in leaderboard
-    ]
+    leaderboard_service = LeaderboardService(redis_client)
+    version = await leaderboard_service.version()
+    window = leaderboard_service.window_key(time_period)
+    if not_modified := cache.check(version, window, limit, offset):
+        return not_modified
+
+    return await leaderboard_service.get_page(time_period, limit, offset)
+
+
+@router.get("/{user_id}/rank")
+async def get_user_rank(
+    user_id: UUID,
+    time_period: str = Query("all_time", regex="^(all_time|weekly|monthly)$"),
+    k: int = Query(5, ge=0, le=50),
+    redis_client: aioredis.Redis = Depends(get_redis),
+):
+    """
+    Get a user's leaderboard rank and neighbourhood.
+
+    Query parameters:
+    - time_period: 'all_time', 'weekly', 'monthly' (default: all_time)
+    - k: Number of users to include above and below (default: 5, max: 50)
+
+    Returns:
+    - Rank (users with equal XP share a rank) and ordinal position
+    - Percentile (share of ranked users at or below this user)
+    - The users ranked just above and below
+    """
+    leaderboard_service = LeaderboardService(redis_client)
+    rank = await leaderboard_service.get_rank(user_id, time_period, k)
+
+    return {"success": True, "data": rank}
@@ -0,0 +1,81 @@
+"""In-process caching primitives"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry expiry.
+
+    Meant for hot, per-worker lookups (verified tokens, user read models).
+    Not thread-safe; it is only touched from the event loop.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry and mark it most recently used"""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+
+        deadline, value = entry
+        if deadline <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """
+        Store an entry.
+
+        Args:
+            ttl: Seconds to live (defaults to the cache-wide ttl)
+            expires_at: Absolute unix timestamp, e.g. a JWT `exp` claim
+        """
+        if self.max_size <= 0:
+            return
+
+        now = time.monotonic()
+        if expires_at is not None:
+            deadline = now + (expires_at - time.time())
+        elif ttl is not None or self.ttl is not None:
+            deadline = now + (ttl if ttl is not None else self.ttl)
+        else:
+            deadline = float("inf")
+
+        if self.ttl is not None:
+            deadline = min(deadline, now + self.ttl)
+        if deadline <= now:
+            return
+
+        self._data[key] = (deadline, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove an entry if present"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
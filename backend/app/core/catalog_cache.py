@@ -0,0 +1,161 @@
+"""Versioned cache for the public course catalog"""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Awaitable, Callable, Optional
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.versions import bump_versions, read_versions, version_seed
+
+VERSION_KEY = "catalog:version"
+
+# Read the catalog version (seeding it with ARGV[2] if missing, see
+# app.core.versions) and the entry under it in one round trip
+_LOOKUP_SCRIPT = """
+local version = redis.call('GET', KEYS[1])
+if not version then
+    version = ARGV[2]
+    redis.call('SET', KEYS[1], version)
+end
+return {version, redis.call('GET', 'catalog:' .. version .. ':' .. ARGV[1])}
+"""
+
+
+def cache_name(kind: str, **params) -> str:
+    """Stable entry name for a parameterised result, e.g. a listing page"""
+    digest = hashlib.blake2b(
+        json.dumps(params, sort_keys=True, default=str).encode(), digest_size=12
+    ).hexdigest()
+    return f"{kind}:{digest}"
+
+
+class CatalogCache:
+    """
+    Serialized catalog payloads in Redis under `catalog:{version}:...`.
+
+    Writes bump the version instead of deleting keys, so every cached
+    page and course goes stale at once and old entries simply expire.
+    Concurrent misses for one entry are coalesced: within a worker they
+    share one load, and across workers a short Redis lock lets a single
+    worker hit the database while the others wait for its result.
+    """
+
+    def __init__(self, ttl: int, lock_ttl: float = 5.0, lock_wait: float = 1.0):
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._scripts: dict[int, object] = {}
+
+    def _lookup(self, redis_client: aioredis.Redis):
+        script = self._scripts.get(id(redis_client))
+        if script is None:
+            script = self._scripts[id(redis_client)] = redis_client.register_script(_LOOKUP_SCRIPT)
+        return script
+
+    async def get_or_load(
+        self,
+        redis_client: aioredis.Redis,
+        name: str,
+        loader: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        """
+        Get a cached payload, loading and storing it on a miss.
+
+        `loader` returns the serialized payload, or None for results that
+        must not be cached (e.g. unpublished courses). Redis errors fall
+        back to the loader.
+        """
+        try:
+            version, raw = await self._lookup(redis_client)(
+                keys=[VERSION_KEY], args=[name, version_seed()]
+            )
+        except RedisError as e:
+            print(f"Catalog cache unavailable: {e}")
+            return await loader()
+
+        if raw is not None:
+            return raw
+
+        key = f"catalog:{version}:{name}"
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            raw = await self._load(redis_client, key, loader)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise; don't warn if there are none
+            raise
+        else:
+            future.set_result(raw)
+            return raw
+        finally:
+            del self._inflight[key]
+
+    async def _load(
+        self,
+        redis_client: aioredis.Redis,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        lock_key = f"{key}:lock"
+        try:
+            locked = await redis_client.set(lock_key, 1, nx=True, px=int(self.lock_ttl * 1000))
+        except RedisError:
+            return await loader()
+
+        if not locked:
+            # Another worker is loading this entry - wait for its result
+            deadline = time.monotonic() + self.lock_wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                try:
+                    raw = await redis_client.get(key)
+                except RedisError:
+                    break
+                if raw is not None:
+                    return raw
+            return await loader()
+
+        try:
+            raw = await loader()
+            if raw is not None:
+                await redis_client.set(key, raw, ex=self.ttl)
+            return raw
+        except RedisError as e:
+            print(f"Catalog cache write failed: {e}")
+            return raw
+        finally:
+            try:
+                await redis_client.delete(lock_key)
+            except RedisError:
+                pass
+
+    async def version(self, redis_client: aioredis.Redis) -> Optional[str]:
+        """Current catalog version, None if Redis is unavailable"""
+        try:
+            (version,) = await read_versions(redis_client, VERSION_KEY)
+            return version
+        except RedisError as e:
+            print(f"Catalog cache unavailable: {e}")
+            return None
+
+    async def bump(self, redis_client: Optional[aioredis.Redis]) -> None:
+        """Invalidate every cached catalog entry"""
+        if redis_client is None:
+            return
+        try:
+            await bump_versions(redis_client, VERSION_KEY)
+        except RedisError as e:
+            print(f"Catalog version bump failed: {e}")
+
+
+catalog_cache = CatalogCache(ttl=settings.CATALOG_CACHE_TTL)
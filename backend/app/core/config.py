@@ -37,11 +37,37 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 0
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_REPLICA_ROUTING: str = "round_robin"  # round_robin | least_loaded
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_CHECK_INTERVAL: int = 5
+    DATABASE_READ_YOUR_WRITES_SECONDS: int = 10
+    # Boot check that the database is at the Alembic head revision
+    DATABASE_SCHEMA_CHECK: str = "strict"  # strict | warn | off
+    # N+1 / lazy-load detection per request (tests and staging only)
+    QUERY_GUARD_MODE: str = "off"  # off | warn | raise
+    QUERY_GUARD_MAX_REPEATS: int = 5
+
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def assemble_replica_urls(cls, v: str | List[str]) -> List[str]:
+        if isinstance(v, str):
+            return [url.strip() for url in v.split(",")]
+        return v
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600
 
+    # Course catalog
+    COURSE_COUNT_CACHE_TTL: int = 60
+    CATALOG_CACHE_TTL: int = 600
+
+    # Authenticated-user cache (L1 in-process, L2 Redis)
+    USER_CACHE_L1_SIZE: int = 10000
+    USER_CACHE_L1_TTL: int = 30
+    USER_CACHE_L2_TTL: int = 300
+
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
@@ -51,6 +77,15 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "RS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    JWT_PUBLIC_KEY: Optional[str] = None  # Defaults to the public half of JWT_SECRET_KEY
+    JWT_BACKEND: str = "jose"  # jose | pyjwt
+    JWT_VERIFY_CACHE_SIZE: int = 10000
+
+    # SIWE sign-in
+    SIWE_VERIFY_EXECUTOR: str = "process"  # process | thread
+    SIWE_VERIFY_WORKERS: int = 2
+    SIWE_VERIFY_MAX_PENDING: int = 64
+    NONCE_STORE: str = "redis"  # redis | memory (single node / tests)
 
     # File Storage
     AWS_ACCESS_KEY_ID: Optional[str] = None
@@ -64,6 +99,32 @@ class Settings(BaseSettings):
     BASE_SEPOLIA_RPC_URL: str
     BASE_MAINNET_RPC_URL: str
     ETHEREUM_RPC_URL: str
+    # Transaction proofs: chain used when a task sets no chain_id, calls per
+    # JSON-RPC batch request, default confirmations, the depth after which a
+    # receipt is final and cached without expiry, and how long an unknown
+    # hash is retried before the submission is rejected
+    CHAIN_DEFAULT_ID: int = 84532
+    CHAIN_RPC_BATCH_SIZE: int = 50
+    CHAIN_MIN_CONFIRMATIONS: int = 3
+    CHAIN_FINALITY_CONFIRMATIONS: int = 64
+    CHAIN_TX_NOT_FOUND_GRACE_SECONDS: int = 1800
+
+    # Outbound HTTP (chain RPC, link checks): one pooled client per process
+    HTTP_CLIENT_TIMEOUT: float = 10.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 20
+
+    # Link submissions: probe links before approving. Timeout per request,
+    # deadline per verification batch, politeness limits per host, and how
+    # long live / dead results are cached
+    LINK_CHECK_ENABLED: bool = True
+    LINK_CHECK_TIMEOUT: float = 5.0
+    LINK_CHECK_DEADLINE: float = 20.0
+    LINK_CHECK_MAX_REDIRECTS: int = 5
+    LINK_CHECK_PER_HOST_CONCURRENCY: int = 2
+    LINK_CHECK_HOST_INTERVAL: float = 0.25
+    LINK_CHECK_CACHE_TTL: int = 3600
+    LINK_CHECK_FAILURE_CACHE_TTL: int = 300
 
     # Contract Addresses
     LEARN_TOKEN_ADDRESS: Optional[str] = None
@@ -81,15 +142,27 @@ class Settings(BaseSettings):
     FROM_EMAIL: str = "noreply@learnfi.com"
 
     # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 100
     AUTH_RATE_LIMIT_PER_MINUTE: int = 5
+    SUBMISSION_RATE_LIMIT_PER_MINUTE: int = 10
+    READ_RATE_LIMIT_PER_MINUTE: int = 300
 
     # Monitoring
     SENTRY_DSN: Optional[str] = None
     SENTRY_ENVIRONMENT: str = "development"
+    # Per-request db/pool/redis/serialization breakdown in a Server-Timing header
+    SERVER_TIMING_ENABLED: bool = False
+    # Prometheus /metrics; set the directory to aggregate samples across workers
+    METRICS_ENABLED: bool = True
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None
 
     # Feature Flags
     ENABLE_AUTO_VERIFICATION: bool = True
+    # Celery verification worker: submissions per batch, and the age after
+    # which a pending auto-verify submission is assumed lost and re-queued
+    VERIFICATION_BATCH_SIZE: int = 200
+    VERIFICATION_STALE_SECONDS: int = 120
     ENABLE_NFT_MINTING: bool = False
     ENABLE_STAKING: bool = False
     ENABLE_EMAIL_NOTIFICATIONS: bool = False
@@ -1,9 +1,17 @@
 """Database configuration and session management"""
 
+import ast
+from pathlib import Path
 from typing import AsyncGenerator
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
+from app.core import metrics
 from app.core.config import settings
+from app.core.instrumentation import TimedQueuePool
+from app.core.replicas import ReplicaRouter, request_subject
 
 # Create async engine
 engine = create_async_engine(
@@ -12,7 +20,9 @@ engine = create_async_engine(
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_pre_ping=True,
+    poolclass=TimedQueuePool,
 )
+metrics.track_pool(engine.sync_engine.pool, "primary")
 
 # Create async session maker
 AsyncSessionLocal = async_sessionmaker(
@@ -23,12 +33,58 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+
+class ReadOnlySession(Session):
+    """Session for read-only requests - flushing (any write) is an error"""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_flush(session, flush_context, instances):
+    raise RuntimeError("Attempted to write through a read-only session")
+
+
+# Read-only sessions run in autocommit mode on the same pool: no BEGIN or
+# COMMIT round trips, and no transaction held open between queries
+ReadOnlySessionLocal = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+# Read replicas for get_db_readonly (none configured: reads use the primary)
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    strategy=settings.DATABASE_REPLICA_ROUTING,
+    max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
 # Create declarative base for models
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session"""
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get database session.
+
+    When replicas are configured, a request that wrote pins the user's
+    reads to the primary for DATABASE_READ_YOUR_WRITES_SECONDS.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -39,13 +95,84 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+        if replica_router.enabled and session.info.get("wrote"):
+            subject = request_subject(request)
+            if subject:
+                await replica_router.mark_write(subject)
+
+
+async def get_db_readonly(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a read-only database session.
+
+    Never commits. A connection is only checked out from the pool on the
+    first query, so handlers answered from cache never take one. Routed
+    to a read replica when one is configured and healthy.
+    """
+    bind = await replica_router.read_engine(request_subject(request)) if replica_router.enabled else None
+    async with ReadOnlySessionLocal(bind=bind) if bind else ReadOnlySessionLocal() as session:
+        yield session
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+
+def migration_heads(versions_dir: Path = MIGRATIONS_DIR) -> set[str]:
+    """
+    Head revisions of the Alembic migration scripts.
+
+    Reads the `revision`/`down_revision` assignments directly instead of
+    loading alembic.script, which costs more import time than the check.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in versions_dir.glob("*.py"):
+        for node in ast.parse(path.read_text()).body:
+            if not isinstance(node, ast.Assign) or not isinstance(node.targets[0], ast.Name):
+                continue
+            name = node.targets[0].id
+            if name == "revision":
+                revisions.add(ast.literal_eval(node.value))
+            elif name == "down_revision":
+                down = ast.literal_eval(node.value)
+                if isinstance(down, str):
+                    parents.add(down)
+                elif down:
+                    parents.update(down)
+    return revisions - parents
+
+
+async def verify_schema() -> None:
+    """
+    Check the database has been migrated to the Alembic head.
+
+    Boot runs this single query instead of create_all's DDL round trips;
+    schema changes are applied by `alembic upgrade head` before deploy.
+    DATABASE_SCHEMA_CHECK=strict refuses to start on a mismatch, `warn`
+    only reports it and `off` skips the check.
+    """
+    if settings.DATABASE_SCHEMA_CHECK == "off":
+        return
+
+    expected = migration_heads()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars())
+    except DBAPIError:
+        current = set()  # never migrated
 
-async def init_db() -> None:
-    """Initialize database - create tables"""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if current != expected:
+        message = (
+            f"Database schema is at {sorted(current) or 'no revision'}, expected "
+            f"{sorted(expected)} - run `alembic upgrade head`"
+        )
+        if settings.DATABASE_SCHEMA_CHECK == "strict":
+            raise RuntimeError(message)
+        print(f"   WARNING: {message}")
 
 
 async def close_db() -> None:
     """Close database connection"""
     await engine.dispose()
+    await replica_router.dispose()
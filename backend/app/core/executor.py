@@ -0,0 +1,72 @@
+"""Bounded worker pools for CPU-bound work that must stay off the event loop"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a bounded executor already has max_pending jobs queued"""
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool with a queue-depth limit.
+
+    `run` rejects immediately with PoolSaturatedError once `max_pending`
+    jobs are queued or running, so a burst sheds load instead of building
+    an unbounded backlog. Process pools use the spawn start method and are
+    created on first use.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        max_workers: int,
+        max_pending: int,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.initializer = initializer
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=self.initializer,
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in the pool, or fail fast when saturated"""
+        if self.pending >= self.max_pending:
+            raise PoolSaturatedError(f"{self.pending} jobs pending")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(fn, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop the pool (pending jobs are cancelled)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
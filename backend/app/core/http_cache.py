@@ -0,0 +1,73 @@
+"""Conditional GET - strong ETags, If-None-Match and Cache-Control"""
+
+import hashlib
+import json
+from typing import Callable, Optional
+from fastapi import Request, Response
+
+# Cache-Control per kind of resource. Shared caches may hold public
+# resources briefly; everything is revalidated with If-None-Match after.
+CATALOG = "public, max-age=30, stale-while-revalidate=60"
+LEADERBOARD = "public, max-age=15, stale-while-revalidate=30"
+BADGES = "public, max-age=60"
+PRIVATE = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag for the version parts a representation is derived from"""
+    digest = hashlib.blake2b(
+        json.dumps(parts, default=str, separators=(",", ":")).encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers `etag` (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class ConditionalGet:
+    """
+    Per-request helper for conditional GETs.
+
+    Endpoints compute the ETag from cheap version data (a Redis counter,
+    updated_at, an aggregate) before loading the resource, and return the
+    304 from `check` without touching the body. Headers are added to the
+    injected response, so they also apply when the endpoint returns data.
+    """
+
+    def __init__(self, request: Request, response: Response, cache_control: str):
+        self.request = request
+        self.response = response
+        self.cache_control = cache_control
+        self.headers: dict[str, str] = {}
+
+    def check(self, *parts) -> Optional[Response]:
+        """Tag the response; return a 304 if the client already has it"""
+        etag = make_etag(*parts)
+        self.headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        self.response.headers.update(self.headers)
+        if etag_matches(self.request, etag):
+            return Response(status_code=304, headers=self.headers)
+        return None
+
+    def no_store(self) -> None:
+        """Drop the tag for a response that must not be cached"""
+        if "etag" in self.response.headers:
+            del self.response.headers["etag"]
+        self.headers = {"Cache-Control": "private, no-store"}
+        self.response.headers.update(self.headers)
+
+
+def conditional_get(cache_control: str) -> Callable[[Request, Response], ConditionalGet]:
+    """Dependency factory: `cache: ConditionalGet = Depends(conditional_get(CATALOG))`"""
+
+    def dependency(request: Request, response: Response) -> ConditionalGet:
+        return ConditionalGet(request, response, cache_control)
+
+    return dependency
@@ -0,0 +1,74 @@
+"""Shared outbound HTTP client - one keep-alive connection pool per process"""
+
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+_client: Optional["httpx.AsyncClient"] = None
+_probe_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """
+    Process-wide AsyncClient, created on first use.
+
+    Connections are bound to the event loop that opened them, so callers
+    that run their own loop (Celery tasks) must close_http_client() before
+    it ends.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        # Imported here: httpx stays out of the API's startup path
+        import httpx
+
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+            ),
+            headers={"User-Agent": f"{settings.APP_NAME}/{settings.APP_VERSION}"},
+        )
+    return _client
+
+
+def get_probe_client() -> "httpx.AsyncClient":
+    """
+    Process-wide AsyncClient for requests pinned to a vetted IP address
+    (link probes), created on first use.
+
+    Keep-alive is off: pooled connections are keyed by scheme, address and
+    port, so a TLS connection opened for one host name would otherwise be
+    reused for another name on the same address, under the first name's
+    SNI and certificate. Proxy settings from the environment are ignored,
+    so requests go to the vetted address. Closed by close_http_client().
+    """
+    global _probe_client
+    if _probe_client is None or _probe_client.is_closed:
+        # Imported here: httpx stays out of the API's startup path
+        import httpx
+
+        _probe_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=0,
+            ),
+            headers={"User-Agent": f"{settings.APP_NAME}/{settings.APP_VERSION}"},
+            trust_env=False,
+        )
+    return _probe_client
+
+
+async def close_http_client() -> None:
+    """Close the shared clients, if they were opened"""
+    global _client, _probe_client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _probe_client is not None:
+        await _probe_client.aclose()
+        _probe_client = None
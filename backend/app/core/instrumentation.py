@@ -0,0 +1,269 @@
+"""Per-request timings - database, pool, Redis and serialization
+
+A `RequestTimings` object lives in a context variable for the duration
+of each HTTP request. Engine, pool and Redis hooks add to it from
+anywhere in the request (including SQLAlchemy's greenlets, which share
+the request's context), and `InstrumentationMiddleware` turns it into
+an opt-in `Server-Timing` header and per-route Prometheus histograms.
+"""
+
+import asyncio
+import copy
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, get_request_handler
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
+
+from app.core import metrics
+from app.core.config import settings
+
+
+class RequestTimings:
+    """Counters for one request; times are in seconds"""
+
+    __slots__ = (
+        "started", "queries", "query_time", "pool_waits", "pool_wait",
+        "redis_commands", "redis_time", "serialization_time", "endpoint_returned",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.pool_waits = 0
+        self.pool_wait = 0.0
+        self.redis_commands = 0
+        self.redis_time = 0.0
+        self.serialization_time = 0.0
+        # When the route's endpoint returned, until its response is rendered
+        self.endpoint_returned: Optional[float] = None
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value (durations in ms)"""
+        return ", ".join([
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.queries} queries"',
+            f'pool;dur={self.pool_wait * 1000:.1f};desc="{self.pool_waits} checkouts"',
+            f'redis;dur={self.redis_time * 1000:.1f};desc="{self.redis_commands} commands"',
+            f"serialize;dur={self.serialization_time * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ])
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the request being handled, None outside requests"""
+    return _current.get()
+
+
+# ===== Database =====
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._instrumentation_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    if timings is not None and context is not None:
+        timings.queries += 1
+        timings.query_time += time.perf_counter() - context._instrumentation_start
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            timings = _current.get()
+            if timings is not None:
+                timings.pool_waits += 1
+                timings.pool_wait += time.perf_counter() - start
+
+
+# ===== Redis =====
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline timed as one round trip"""
+
+    async def execute(self, raise_on_error: bool = True):
+        commands = len(self.command_stack)
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.redis_command_duration.labels("PIPELINE").observe(elapsed)
+            timings = _current.get()
+            if timings is not None:
+                timings.redis_commands += commands
+                timings.redis_time += elapsed
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client that times every command (and pipeline) for metrics and request timings"""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.redis_command_duration.labels(str(args[0]).upper()).observe(elapsed)
+            timings = _current.get()
+            if timings is not None:
+                timings.redis_commands += 1
+                timings.redis_time += elapsed
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+# ===== Serialization =====
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Count the block as serialization (endpoints encoding their own body)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.serialization_time += time.perf_counter() - start
+
+
+def _mark_endpoint_returned() -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.endpoint_returned = time.perf_counter()
+
+
+class TimedRoute(APIRoute):
+    """
+    Route marking when its endpoint returns.
+
+    FastAPI then validates and dumps the result against the response model
+    (`serialize_response`) and builds the response; `TimedJSONResponse`
+    counts everything from the mark to the rendered body as serialization.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def endpoint(*args, **kwargs):
+                try:
+                    return await call(*args, **kwargs)
+                finally:
+                    _mark_endpoint_returned()
+        else:
+            @functools.wraps(call)
+            def endpoint(*args, **kwargs):
+                try:
+                    return call(*args, **kwargs)
+                finally:
+                    _mark_endpoint_returned()
+
+        dependant = copy.copy(self.dependant)
+        dependant.call = endpoint
+        return get_request_handler(
+            dependant=dependant,
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=self.secure_cloned_response_field,
+            response_model_include=self.response_model_include,
+            response_model_exclude=self.response_model_exclude,
+            response_model_by_alias=self.response_model_by_alias,
+            response_model_exclude_unset=self.response_model_exclude_unset,
+            response_model_exclude_defaults=self.response_model_exclude_defaults,
+            response_model_exclude_none=self.response_model_exclude_none,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+        )
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    Default response class - times JSON encoding of the response body,
+    from the endpoint's return (response model included) on `TimedRoute`s
+    """
+
+    def render(self, content) -> bytes:
+        start = time.perf_counter()
+        try:
+            return super().render(content)
+        finally:
+            timings = _current.get()
+            if timings is not None:
+                if timings.endpoint_returned is not None:
+                    start, timings.endpoint_returned = timings.endpoint_returned, None
+                timings.serialization_time += time.perf_counter() - start
+
+
+# ===== Middleware =====
+
+
+class InstrumentationMiddleware:
+    """
+    Pure ASGI middleware collecting `RequestTimings` for every request.
+
+    Adds a Server-Timing header when SERVER_TIMING_ENABLED is set, and
+    records each finished request in the Prometheus metrics under its
+    route template (unmatched paths share one label).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    total = time.perf_counter() - timings.started
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", timings.server_timing(total).encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                status,
+                timings,
+                time.perf_counter() - timings.started,
+            )
@@ -0,0 +1,158 @@
+"""Prometheus metrics
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker writes its samples to
+files in that directory and /metrics aggregates all of them, so one
+scrape covers every uvicorn worker. The directory must exist and should
+be emptied before the workers start.
+"""
+
+import os
+from typing import Optional
+
+from app.core.config import settings
+
+# prometheus_client picks its value storage when it is first imported
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.pool import Pool  # noqa: E402
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# ===== HTTP =====
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+    buckets=SECONDS_BUCKETS,
+)
+http_request_db_time = Histogram(
+    "http_request_db_seconds", "Time spent in database queries per request", ["method", "route"],
+    buckets=SECONDS_BUCKETS,
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries", "Database queries per request", ["method", "route"],
+    buckets=COUNT_BUCKETS,
+)
+http_request_pool_wait = Histogram(
+    "http_request_pool_wait_seconds", "Time spent waiting for pool connections per request",
+    ["method", "route"], buckets=SECONDS_BUCKETS,
+)
+http_request_redis_time = Histogram(
+    "http_request_redis_seconds", "Time spent in Redis per request", ["method", "route"],
+    buckets=SECONDS_BUCKETS,
+)
+http_request_serialization_time = Histogram(
+    "http_request_serialization_seconds", "Response encoding time per request",
+    ["method", "route"], buckets=SECONDS_BUCKETS,
+)
+
+
+def observe_request(method: str, route: str, status: int, timings, total: float) -> None:
+    """Record a finished request (`timings` is its RequestTimings)"""
+    http_requests.labels(method, route, str(status)).inc()
+    http_request_duration.labels(method, route).observe(total)
+    http_request_db_time.labels(method, route).observe(timings.query_time)
+    http_request_db_queries.labels(method, route).observe(timings.queries)
+    http_request_pool_wait.labels(method, route).observe(timings.pool_wait)
+    http_request_redis_time.labels(method, route).observe(timings.redis_time)
+    http_request_serialization_time.labels(method, route).observe(timings.serialization_time)
+
+
+# ===== Database pool =====
+
+db_pool_size = Gauge(
+    "db_pool_size", "Configured pool size", ["pool"], multiprocess_mode="livesum"
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections checked out", ["pool"], multiprocess_mode="livesum"
+)
+db_pool_overflow = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size", ["pool"], multiprocess_mode="livesum"
+)
+
+
+def track_pool(pool: Pool, name: str) -> None:
+    """Keep the pool gauges for `pool` current on every checkout and checkin"""
+
+    def update(*args) -> None:
+        db_pool_checked_out.labels(name).set(pool.checkedout())
+        db_pool_overflow.labels(name).set(max(pool.overflow(), 0))
+
+    db_pool_size.labels(name).set(pool.size())
+    update()
+    event.listen(pool, "checkout", update)
+    event.listen(pool, "checkin", update)
+
+
+# ===== Redis =====
+
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds", "Redis command latency (pipelines as one round trip)",
+    ["command"], buckets=SECONDS_BUCKETS,
+)
+
+# ===== Domain =====
+
+xp_awards = Counter(
+    "xp_awards_total", "XP ledger entries written", ["kind"]
+)
+xp_awarded = Counter(
+    "xp_awarded_total", "XP points awarded"
+)
+submission_queue_depth = Gauge(
+    "submission_verification_queue_depth", "Submissions waiting for verification",
+    multiprocess_mode="mostrecent",
+)
+verification_queue_length = Gauge(
+    "verification_queue_length", "Submissions queued for the verification worker", ["task_type"],
+    multiprocess_mode="mostrecent",
+)
+auth_verifications = Counter(
+    "auth_verify_total", "SIWE verifications", ["result"]
+)
+auth_verify_duration = Histogram(
+    "auth_verify_duration_seconds",
+    "SIWE signature verification latency, executor queue wait included (nonce check excluded)",
+    buckets=SECONDS_BUCKETS,
+)
+
+
+def record_xp_awards(kind: str, xp_changes: list[int]) -> None:
+    """Count ledger entries written by a single or bulk award"""
+    if xp_changes:
+        xp_awards.labels(kind).inc(len(xp_changes))
+        xp_awarded.inc(sum(change for change in xp_changes if change > 0))
+
+
+# ===== Exposition =====
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition body and content type, aggregated over all workers in multiprocess mode"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop this worker's live gauges from the aggregate (call on shutdown)"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
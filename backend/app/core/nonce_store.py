@@ -0,0 +1,153 @@
+"""SIWE nonce storage - issue and single-use consume"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+import redis.asyncio as aioredis
+
+
+# KEYS: nonce, refresh token record  ARGV: signed nonce, refresh token, ttl
+_REDEEM_SCRIPT = """
+local stored = redis.call('GET', KEYS[1])
+if stored then
+    redis.call('DEL', KEYS[1])
+    if stored == ARGV[1] then
+        redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+    end
+end
+return stored
+"""
+
+
+class NonceStore(ABC):
+    """
+    Single-use nonce storage keyed by wallet address.
+
+    `consume` returns the stored nonce and removes it in the same step, so
+    a nonce can never be used twice.
+    """
+
+    @abstractmethod
+    async def issue(self, address: str, nonce: str, ttl: int) -> None:
+        """Store `nonce` for `address`, replacing any previous one, for `ttl` seconds"""
+
+    @abstractmethod
+    async def consume(self, address: str) -> Optional[str]:
+        """Remove and return the address's nonce, None if there is none"""
+
+    async def redeem(
+        self,
+        address: str,
+        nonce: str,
+        refresh_key: str,
+        refresh_token: str,
+        ttl: int,
+        redis_client: Optional[aioredis.Redis] = None,
+    ) -> Optional[str]:
+        """
+        Consume the address's nonce and, if it equals the signed `nonce`,
+        store the sign-in's refresh token record for `ttl` seconds.
+
+        Returns the consumed nonce, None if there was none.
+        """
+        stored = await self.consume(address)
+        if stored == nonce and redis_client is not None:
+            await redis_client.set(refresh_key, refresh_token, ex=ttl)
+        return stored
+
+
+class RedisNonceStore(NonceStore):
+    """
+    Redis-backed store: SET ... EX to issue, GETDEL to consume (one round
+    trip each). `redeem` consumes and writes the refresh token record in
+    one script call on this store's client.
+    """
+
+    def __init__(self, redis_client: aioredis.Redis):
+        self.redis = redis_client
+
+    @staticmethod
+    def _key(address: str) -> str:
+        return f"nonce:{address.lower()}"
+
+    async def issue(self, address: str, nonce: str, ttl: int) -> None:
+        await self.redis.set(self._key(address), nonce, ex=ttl)
+
+    async def consume(self, address: str) -> Optional[str]:
+        return await self.redis.getdel(self._key(address))
+
+    async def redeem(
+        self,
+        address: str,
+        nonce: str,
+        refresh_key: str,
+        refresh_token: str,
+        ttl: int,
+        redis_client: Optional[aioredis.Redis] = None,
+    ) -> Optional[str]:
+        return await self.redis.eval(
+            _REDEEM_SCRIPT, 2, self._key(address), refresh_key, nonce, refresh_token, ttl
+        )
+
+
+class InMemoryNonceStore(NonceStore):
+    """
+    Process-local store for single-node and test deployments without Redis.
+
+    Expiry uses a hashed timing wheel: each nonce is filed under the slot
+    of the tick it expires in, and every call advances the wheel over the
+    ticks elapsed since the last call, dropping what expired. Work per call
+    is proportional to elapsed ticks and expiring entries, not store size.
+    """
+
+    def __init__(self, slots: int = 512, tick: float = 1.0):
+        self.slots = slots
+        self.tick = tick
+        self._nonces: dict[str, tuple[str, float]] = {}
+        self._wheel: list[set[str]] = [set() for _ in range(slots)]
+        self._current_tick = self._tick_of(time.monotonic())
+
+    def _tick_of(self, at: float) -> int:
+        return math.floor(at / self.tick)
+
+    def _file(self, key: str, expires_at: float) -> None:
+        self._wheel[math.ceil(expires_at / self.tick) % self.slots].add(key)
+
+    def _advance(self) -> float:
+        now = time.monotonic()
+        now_tick = self._tick_of(now)
+        first = max(self._current_tick + 1, now_tick - self.slots + 1)
+
+        for tick in range(first, now_tick + 1):
+            bucket = self._wheel[tick % self.slots]
+            for key in list(bucket):
+                bucket.discard(key)
+                entry = self._nonces.get(key)
+                if entry is None:
+                    continue
+                if entry[1] <= now:
+                    del self._nonces[key]
+                else:
+                    # Re-issued since, or more than one wheel revolution away
+                    self._file(key, entry[1])
+
+        self._current_tick = now_tick
+        return now
+
+    async def issue(self, address: str, nonce: str, ttl: int) -> None:
+        now = self._advance()
+        key = address.lower()
+        expires_at = now + ttl
+        self._nonces[key] = (nonce, expires_at)
+        self._file(key, expires_at)
+
+    async def consume(self, address: str) -> Optional[str]:
+        now = self._advance()
+        entry = self._nonces.pop(address.lower(), None)
+        if entry is None or entry[1] <= now:
+            return None
+        return entry[0]
+
+    def __len__(self) -> int:
+        return len(self._nonces)
@@ -0,0 +1,29 @@
+"""Opaque keyset-pagination cursors"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client-supplied cursor cannot be decoded"""
+
+
+def encode_cursor(kind: str, *values: Any) -> str:
+    """Encode the sort key of the last row on a page"""
+    raw = json.dumps([kind, *values], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str) -> list:
+    """Decode a cursor produced by `encode_cursor` for the same sort `kind`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+    if not isinstance(decoded, list) or not decoded or decoded[0] != kind:
+        raise InvalidCursorError("Cursor does not match this listing")
+    return decoded[1:]
@@ -0,0 +1,190 @@
+"""Query guard - N+1 and lazy-load detection for tests and staging
+
+While a `QueryLog` is active (per request via `QueryGuardMiddleware`, or
+in a test via `track`), every statement is counted under its normalized
+SQL (literals, bind parameters and IN lists collapsed). A statement
+repeating more than `max_repeats` times in one log, or any relationship
+lazy load, is reported: `raise` mode raises `QueryGuardError` at the
+offending statement, `warn` mode prints a report when the request ends.
+
+Enable with QUERY_GUARD_MODE=warn|raise; it is off in production.
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+
+
+class QueryGuardError(RuntimeError):
+    """A repeated statement or lazy load in raise mode"""
+
+
+_LITERALS = re.compile(
+    r"'(?:[^']|'')*'"            # string literals
+    r"|\$\d+(?:::\w+(?:\[\])*)?"  # asyncpg parameters, with their casts
+    r"|%\(\w+\)s|\?"             # pyformat / qmark parameters
+    r"|\b\d+(?:\.\d+)?\b"        # numbers
+)
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL with values replaced by `?` and IN lists collapsed to `(?...)`"""
+    statement = _LITERALS.sub("?", statement)
+    statement = _LISTS.sub("(?...)", statement)
+    return " ".join(statement.split())
+
+
+class QueryLog:
+    """Statements (by normalized SQL) and lazy loads seen in one scope"""
+
+    def __init__(
+        self,
+        mode: str = "warn",
+        max_repeats: Optional[int] = None,
+        parent: Optional["QueryLog"] = None,
+    ):
+        self.mode = mode
+        self.max_repeats = max_repeats
+        self.parent = parent
+        self.statements: Counter[str] = Counter()
+        self.lazy_loads: list[str] = []
+
+    @property
+    def total(self) -> int:
+        return sum(self.statements.values())
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Statements run more than `max_repeats` times, most frequent first"""
+        if self.max_repeats is None:
+            return []
+        return [(sql, n) for sql, n in self.statements.most_common() if n > self.max_repeats]
+
+    def record_statement(self, sql: str) -> None:
+        self.statements[sql] += 1
+        count = self.statements[sql]
+        if self.mode == "raise" and self.max_repeats is not None and count == self.max_repeats + 1:
+            raise QueryGuardError(
+                f"Statement ran more than {self.max_repeats} times (likely N+1): {_shorten(sql)}"
+            )
+
+    def record_lazy_load(self, attribute: str) -> None:
+        self.lazy_loads.append(attribute)
+        if self.mode == "raise":
+            raise QueryGuardError(
+                f"Lazy load of {attribute} - add selectinload/joinedload to the query"
+            )
+
+    def report(self) -> list[str]:
+        """Human-readable problems; empty when the scope was clean"""
+        lines = [f"{n}x {_shorten(sql)}" for sql, n in self.repeated()]
+        lines.extend(f"lazy load of {attribute}" for attribute in dict.fromkeys(self.lazy_loads))
+        return lines
+
+
+def _shorten(sql: str, limit: int = 160) -> str:
+    return sql if len(sql) <= limit else sql[:limit - 3] + "..."
+
+
+_current: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def current_log() -> Optional[QueryLog]:
+    """Innermost active query log, None when nothing is tracking"""
+    return _current.get()
+
+
+@contextmanager
+def track(mode: str = "raise", max_repeats: Optional[int] = None) -> Iterator[QueryLog]:
+    """
+    Track statements run in this context. Nested logs also feed their
+    parents, so a test can budget a request the middleware is tracking.
+    """
+    install()
+    log = QueryLog(mode, max_repeats, parent=_current.get())
+    token = _current.set(log)
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+
+
+# ===== Hooks =====
+
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = _current.get()
+    if log is None:
+        return
+    sql = normalize_sql(statement)
+    while log is not None:
+        log.record_statement(sql)
+        log = log.parent
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState):
+    log = _current.get()
+    if (
+        log is None
+        or not orm_execute_state.is_select
+        or orm_execute_state.lazy_loaded_from is None
+    ):
+        return
+    path = orm_execute_state.loader_strategy_path
+    attribute = (
+        f"{path[-2].class_.__name__}.{path[-1].key}"
+        if path is not None and len(path) >= 2
+        else orm_execute_state.lazy_loaded_from.class_.__name__
+    )
+    while log is not None:
+        log.record_lazy_load(attribute)
+        log = log.parent
+
+
+def install() -> None:
+    """Register the engine and session hooks (idempotent)"""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        _installed = True
+
+
+# ===== Middleware =====
+
+
+class QueryGuardMiddleware:
+    """
+    Pure ASGI middleware tracking each request in its own `QueryLog`.
+
+    Uses QUERY_GUARD_MODE and QUERY_GUARD_MAX_REPEATS; in warn mode the
+    problems of a request are printed once it has finished.
+    """
+
+    def __init__(self, app, mode: Optional[str] = None, max_repeats: Optional[int] = None):
+        self.app = app
+        self.mode = mode or settings.QUERY_GUARD_MODE
+        self.max_repeats = max_repeats if max_repeats is not None else settings.QUERY_GUARD_MAX_REPEATS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.mode == "off":
+            return await self.app(scope, receive, send)
+
+        with track(self.mode, self.max_repeats) as log:
+            await self.app(scope, receive, send)
+
+        problems = log.report()
+        if problems:
+            route = getattr(scope.get("route"), "path", scope["path"])
+            print(f"Query guard: {scope['method']} {route} ran {log.total} statements")
+            for problem in problems:
+                print(f"   {problem}")
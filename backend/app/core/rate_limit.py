@@ -0,0 +1,187 @@
+"""Distributed rate limiting - GCRA in Redis with local token leases"""
+
+import json
+import math
+import time
+from typing import Awaitable, Callable, NamedTuple, Optional
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import verify_token
+
+# GCRA lease: grant up to ARGV[4] requests in one call.
+# KEYS[1] = theoretical arrival time (ms); ARGV = now_ms, emission interval
+# ms, burst capacity, requested. Returns {granted, retry_after_ms}.
+_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local available = math.floor((now + capacity * interval - tat) / interval)
+if available < 1 then
+    return {0, tat + interval - capacity * interval - now}
+end
+
+local granted = math.min(available, requested)
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now))
+return {granted, 0}
+"""
+
+
+class RateLimit(NamedTuple):
+    group: str
+    per_minute: int
+
+
+class _Lease:
+    """Tokens already granted by Redis, spendable locally until `expires_at`"""
+
+    __slots__ = ("tokens", "expires_at")
+
+    def __init__(self, tokens: int, expires_at: float):
+        self.tokens = tokens
+        self.expires_at = expires_at
+
+
+def route_limit(method: str, path: str) -> Optional[RateLimit]:
+    """Map a request to its rate-limit group, None when exempt"""
+    api = settings.API_V1_PREFIX
+    if not path.startswith(api):
+        return None
+
+    if path.startswith(f"{api}/auth"):
+        return RateLimit("auth", settings.AUTH_RATE_LIMIT_PER_MINUTE)
+    if method == "POST" and path.rstrip("/") == f"{api}/tasks/submissions":
+        return RateLimit("submissions", settings.SUBMISSION_RATE_LIMIT_PER_MINUTE)
+    if method in ("GET", "HEAD"):
+        return RateLimit("reads", settings.READ_RATE_LIMIT_PER_MINUTE)
+    return RateLimit("default", settings.RATE_LIMIT_PER_MINUTE)
+
+
+def client_identity(scope: dict) -> str:
+    """Authenticated user id when a valid bearer token is present, else client IP"""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                payload = verify_token(token)
+                if payload and payload.get("sub"):
+                    return f"user:{payload['sub']}"
+            break
+
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimiter:
+    """
+    Per-client, per-group GCRA limiter.
+
+    Redis holds the authoritative state and is consulted with a single Lua
+    call that leases a small batch of tokens to this worker. Requests are
+    served from the local lease until it is spent or stale, so most allowed
+    requests never reach Redis. Denials are cached locally until the
+    client's retry time. Redis errors fail open.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], Awaitable[aioredis.Redis]],
+        lease_fraction: float = 0.05,
+        lease_ttl: float = 1.0,
+        max_clients: int = 100_000,
+    ):
+        self.redis_factory = redis_factory
+        self.lease_fraction = lease_fraction
+        self.lease_ttl = lease_ttl
+        self._leases = TTLCache(max_size=max_clients, ttl=lease_ttl)
+        self._blocked = TTLCache(max_size=max_clients)
+        self._script = None
+
+    def _lease_size(self, per_minute: int) -> int:
+        return max(1, int(per_minute * self.lease_fraction))
+
+    async def hit(self, identity: str, limit: RateLimit) -> float:
+        """Count one request; returns 0 when allowed, else seconds to wait"""
+        key = f"ratelimit:{limit.group}:{identity}"
+        now = time.monotonic()
+
+        blocked_until = self._blocked.get(key)
+        if blocked_until is not None:
+            return max(blocked_until - now, 0.001)
+
+        lease: Optional[_Lease] = self._leases.get(key)
+        if lease is not None and lease.tokens > 0 and lease.expires_at > now:
+            lease.tokens -= 1
+            return 0
+
+        try:
+            granted, retry_after_ms = await self._acquire(key, limit)
+        except RedisError as e:
+            print(f"Rate limiter unavailable, allowing request: {e}")
+            return 0
+
+        if granted < 1:
+            retry_after = max(retry_after_ms, 1) / 1000
+            self._blocked.set(key, now + retry_after, ttl=retry_after)
+            return retry_after
+
+        self._leases.set(key, _Lease(granted - 1, now + self.lease_ttl))
+        return 0
+
+    async def _acquire(self, key: str, limit: RateLimit) -> tuple[int, int]:
+        if self._script is None:
+            redis_client = await self.redis_factory()
+            self._script = redis_client.register_script(_GCRA_SCRIPT)
+
+        granted, retry_after_ms = await self._script(
+            keys=[key],
+            args=[
+                int(time.time() * 1000),
+                60_000 / limit.per_minute,
+                limit.per_minute,
+                self._lease_size(limit.per_minute),
+            ],
+        )
+        return int(granted), int(retry_after_ms)
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware enforcing `route_limit` groups with 429 + Retry-After"""
+
+    def __init__(self, app, redis_factory: Callable[[], Awaitable[aioredis.Redis]]):
+        self.app = app
+        self.limiter = RateLimiter(redis_factory)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        limit = route_limit(scope["method"], scope["path"])
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        retry_after = await self.limiter.hit(client_identity(scope), limit)
+        if not retry_after:
+            return await self.app(scope, receive, send)
+
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,171 @@
+"""Read-replica routing - engine registry, lag ejection and read-your-writes"""
+
+import asyncio
+import itertools
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.cache import TTLCache
+from app.core import metrics
+from app.core.instrumentation import TimedQueuePool
+from app.core.security import verify_token
+
+# Seconds of replay lag; 0 on a caught-up replica (or a primary)
+_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    """A replica engine and its last observed health"""
+
+    def __init__(self, url: str, pool_size: int, max_overflow: int):
+        self.engine: AsyncEngine = create_async_engine(
+            url,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+            poolclass=TimedQueuePool,
+        ).execution_options(isolation_level="AUTOCOMMIT")
+        metrics.track_pool(self.engine.sync_engine.pool, f"replica:{self.engine.url.host}")
+        self.healthy = True
+        self.lag: Optional[float] = None
+
+    @property
+    def load(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()
+
+
+class ReplicaRouter:
+    """
+    Chooses the engine for read-only sessions.
+
+    Reads go to a healthy replica (round-robin or least checked-out
+    connections) and fall back to the primary when none is healthy. A
+    background monitor ejects replicas lagging more than `max_lag` seconds
+    and re-admits them once caught up.
+
+    After a user's own write, their reads stick to the primary for
+    `sticky_seconds`. The mark is kept locally and in Redis so other
+    workers honour it too.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        strategy: str,
+        max_lag: float,
+        sticky_seconds: int,
+        pool_size: int,
+        max_overflow: int,
+    ):
+        if strategy not in ("round_robin", "least_loaded"):
+            raise ValueError(f"Unknown replica routing strategy: {strategy}")
+
+        self.replicas = [Replica(url, pool_size, max_overflow) for url in urls]
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.redis: Optional[aioredis.Redis] = None
+        self._sticky = TTLCache(max_size=100_000, ttl=sticky_seconds)
+        self._cycle = itertools.cycle(self.replicas)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @staticmethod
+    def _sticky_key(subject: str) -> str:
+        return f"read_primary:{subject}"
+
+    def choose(self) -> Optional[Replica]:
+        """Pick a healthy replica, None to use the primary"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_loaded":
+            return min(healthy, key=lambda replica: replica.load)
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica
+        return None
+
+    async def read_engine(self, subject: Optional[str]) -> Optional[AsyncEngine]:
+        """Engine for a read-only session, None for the primary"""
+        if not self.enabled:
+            return None
+        if subject and await self.is_sticky(subject):
+            return None
+
+        replica = self.choose()
+        return replica.engine if replica else None
+
+    async def mark_write(self, subject: str) -> None:
+        """Pin the subject's reads to the primary for `sticky_seconds`"""
+        if not self.enabled:
+            return
+
+        self._sticky.set(subject, True)
+        if self.redis is not None:
+            try:
+                await self.redis.set(self._sticky_key(subject), 1, ex=self.sticky_seconds)
+            except RedisError as e:
+                print(f"Read-your-writes mark failed: {e}")
+
+    async def is_sticky(self, subject: str) -> bool:
+        if self._sticky.get(subject):
+            return True
+        if self.redis is None:
+            return False
+
+        try:
+            return bool(await self.redis.exists(self._sticky_key(subject)))
+        except RedisError:
+            # Without the shared mark, the primary is the safe choice
+            return True
+
+    async def check_lag(self) -> None:
+        """Measure replica lag and eject (or re-admit) replicas"""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    replica.lag = float((await conn.execute(_LAG_SQL)).scalar_one())
+                healthy = replica.lag <= self.max_lag
+            except Exception as e:
+                print(f"Replica check failed for {replica.engine.url!r}: {e}")
+                replica.lag = None
+                healthy = False
+
+            if healthy != replica.healthy:
+                state = "re-admitted" if healthy else f"ejected (lag {replica.lag})"
+                print(f"Replica {replica.engine.url!r} {state}")
+            replica.healthy = healthy
+
+    async def monitor(self, interval: float) -> None:
+        """Run lag checks every `interval` seconds (runs until cancelled)"""
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+def request_subject(request: Request) -> Optional[str]:
+    """Token subject of the request's bearer token, if it is valid"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = verify_token(token)
+    return payload.get("sub") if payload else None
@@ -1,13 +1,131 @@
 """Security utilities - JWT token generation and validation"""
 
+import hashlib
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Any, Optional
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-# Password hashing context (for optional email/password auth)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """Password hashing context (for optional email/password auth), built on first use"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class InvalidTokenError(Exception):
+    """Raised by JWT backends when a token fails verification"""
+
+
+class JWTBackend(ABC):
+    """
+    JWT signing/verification backend.
+
+    Keys are parsed once when the backend is built, not per token. When no
+    verification key is given, asymmetric algorithms verify with the public
+    half of the signing key.
+    """
+
+    algorithm: str
+
+    @abstractmethod
+    def encode(self, claims: dict) -> str:
+        """Signed token for `claims`"""
+
+    @abstractmethod
+    def decode(self, token: str) -> dict:
+        """Verified claims of `token`; raises InvalidTokenError"""
+
+
+class JoseJWTBackend(JWTBackend):
+    """python-jose backend (default)"""
+
+    def __init__(self, algorithm: str, signing_key: str, verification_key: Optional[str] = None):
+        from jose import JWTError, jwk, jwt
+
+        self.algorithm = algorithm
+        self._jwt = jwt
+        self._error = JWTError
+        self._signing_key = jwk.construct(signing_key, algorithm)
+        if verification_key:
+            self._verification_key = jwk.construct(verification_key, algorithm)
+        elif algorithm.startswith(("RS", "ES", "PS")):
+            self._verification_key = self._signing_key.public_key()
+        else:
+            self._verification_key = self._signing_key
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self._verification_key, algorithms=[self.algorithm])
+        except self._error as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+class PyJWTBackend(JWTBackend):
+    """PyJWT backend using pre-loaded `cryptography` key objects (requires `pyjwt`)"""
+
+    def __init__(self, algorithm: str, signing_key: str, verification_key: Optional[str] = None):
+        import jwt
+        from jwt.algorithms import get_default_algorithms
+
+        self.algorithm = algorithm
+        self._jwt = jwt
+        algorithm_impl = get_default_algorithms()[algorithm]
+        self._signing_key = algorithm_impl.prepare_key(signing_key)
+        if verification_key:
+            self._verification_key = algorithm_impl.prepare_key(verification_key)
+        elif hasattr(self._signing_key, "public_key"):
+            self._verification_key = self._signing_key.public_key()
+        else:
+            self._verification_key = self._signing_key
+
+    def encode(self, claims: dict) -> str:
+        return self._jwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self._verification_key, algorithms=[self.algorithm])
+        except self._jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+JWT_BACKENDS: dict[str, type[JWTBackend]] = {
+    "jose": JoseJWTBackend,
+    "pyjwt": PyJWTBackend,
+}
+
+_jwt_backend: Optional[JWTBackend] = None
+
+# Verified token payloads keyed by token digest, each expiring at its `exp`
+_verified_tokens = TTLCache(max_size=settings.JWT_VERIFY_CACHE_SIZE)
+
+
+def load_jwt_keys() -> JWTBackend:
+    """Parse the configured JWT keys once (called at startup)"""
+    global _jwt_backend
+    backend_class = JWT_BACKENDS.get(settings.JWT_BACKEND)
+    if backend_class is None:
+        raise ValueError(f"Unknown JWT_BACKEND: {settings.JWT_BACKEND}")
+
+    _jwt_backend = backend_class(
+        settings.JWT_ALGORITHM,
+        settings.JWT_SECRET_KEY,
+        settings.JWT_PUBLIC_KEY,
+    )
+    _verified_tokens.clear()
+    return _jwt_backend
+
+
+def get_jwt_backend() -> JWTBackend:
+    """Get the JWT backend, loading keys on first use"""
+    return _jwt_backend or load_jwt_keys()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -25,12 +143,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         "type": "access"
     })
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM
-    )
-    return encoded_jwt
+    return get_jwt_backend().encode(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
@@ -44,32 +157,42 @@ def create_refresh_token(data: dict) -> str:
         "type": "refresh"
     })
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM
-    )
-    return encoded_jwt
+    return get_jwt_backend().encode(to_encode)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode JWT token"""
+    """
+    Verify and decode JWT token.
+
+    Successfully verified payloads are cached until their `exp`, so
+    repeated requests with the same token skip the signature check.
+    """
+    digest = _token_digest(token)
+    payload: Optional[dict[str, Any]] = _verified_tokens.get(digest)
+    if payload is not None:
+        return dict(payload)
+
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        return payload
-    except JWTError:
+        payload = get_jwt_backend().decode(token)
+    except InvalidTokenError:
         return None
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _verified_tokens.set(digest, payload, expires_at=exp)
+
+    return dict(payload)
+
 
 def hash_password(password: str) -> str:
     """Hash password (for optional email/password auth)"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
@@ -0,0 +1,194 @@
+"""Two-tier cache for the authenticated-user read model"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+# Lifetime of a user's generation counter after its last invalidation
+GENERATION_TTL = 86400
+
+# KEYS: user, generation  ARGV: generation read before the database read,
+# serialized user, ttl
+# Writes only if no invalidation bumped the generation in between.
+_SET_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+_FIELDS = (
+    "wallet_address",
+    "username",
+    "email",
+    "profile_picture_url",
+    "bio",
+    "xp_total",
+)
+
+
+class CachedUser(NamedTuple):
+    """Cache lookup: the user on a hit, else the generation to `set` with"""
+
+    user: Optional[User]
+    generation: Optional[str] = None
+
+
+class UserCache:
+    """
+    L1 (per-worker TTL/LRU) in front of L2 (Redis) for `User` rows.
+
+    Entries are stored serialized and every hit builds a fresh, transient
+    `User`, so callers cannot mutate the cached copy. `invalidate` evicts
+    locally, deletes the Redis copy, bumps the user's generation and
+    publishes the ids so every other worker evicts its L1 too.
+
+    A miss returns the generation read alongside the Redis copy; `set`
+    only stores the row read from the database if that generation is
+    still current, so a read racing an invalidation cannot put the stale
+    row back.
+    """
+
+    def __init__(self, l1_size: int, l1_ttl: float, l2_ttl: int):
+        self.l1 = TTLCache(max_size=l1_size, ttl=l1_ttl)
+        self.l2_ttl = l2_ttl
+
+    @staticmethod
+    def _key(user_id) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def _generation_key(user_id) -> str:
+        return f"user:{user_id}:generation"
+
+    @staticmethod
+    def _serialize(user: User) -> str:
+        data = {field: getattr(user, field) for field in _FIELDS}
+        data.update({
+            "id": str(user.id),
+            "role": user.role.value,
+            "created_at": user.created_at.isoformat(),
+            "updated_at": user.updated_at.isoformat(),
+        })
+        return json.dumps(data)
+
+    @staticmethod
+    def _deserialize(raw: str) -> User:
+        data = json.loads(raw)
+        return User(
+            id=uuid.UUID(data["id"]),
+            role=UserRole(data["role"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            **{field: data[field] for field in _FIELDS},
+        )
+
+    async def get(self, user_id, redis_client: Optional[aioredis.Redis]) -> CachedUser:
+        """Get a cached user (L1, then L2); on a miss, the current generation"""
+        key = str(user_id)
+        raw = self.l1.get(key)
+        generation = None
+        if raw is None and redis_client is not None:
+            try:
+                raw, generation = await redis_client.mget(
+                    self._key(key), self._generation_key(key)
+                )
+                generation = generation or "0"
+            except RedisError:
+                raw = None
+            if raw is not None:
+                self.l1.set(key, raw)
+
+        if raw is not None:
+            return CachedUser(self._deserialize(raw))
+        return CachedUser(None, generation)
+
+    async def set(
+        self,
+        user: User,
+        redis_client: Optional[aioredis.Redis],
+        generation: Optional[str] = None,
+    ) -> None:
+        """
+        Populate both tiers after a database read.
+
+        `generation` is the one returned by the `get` that missed; the row
+        is dropped if the user was invalidated since. Without it (Redis
+        unavailable at lookup) only L1 is populated.
+        """
+        raw = self._serialize(user)
+        if redis_client is not None and generation is not None:
+            try:
+                stored = await redis_client.eval(
+                    _SET_SCRIPT,
+                    2,
+                    self._key(user.id),
+                    self._generation_key(user.id),
+                    generation,
+                    raw,
+                    self.l2_ttl,
+                )
+            except RedisError:
+                stored = True  # L1 only, as without Redis
+            if not stored:
+                return
+        self.l1.set(str(user.id), raw)
+
+    async def invalidate(
+        self, user_ids: Iterable, redis_client: Optional[aioredis.Redis]
+    ) -> None:
+        """Evict users from every tier and every worker"""
+        ids = [str(user_id) for user_id in user_ids]
+        if not ids:
+            return
+
+        for user_id in ids:
+            self.l1.pop(user_id)
+
+        if redis_client is not None:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for user_id in ids:
+                        pipe.incr(self._generation_key(user_id))
+                        pipe.expire(self._generation_key(user_id), GENERATION_TTL)
+                    pipe.delete(*(self._key(user_id) for user_id in ids))
+                    pipe.publish(INVALIDATION_CHANNEL, ",".join(ids))
+                    await pipe.execute()
+            except RedisError as e:
+                print(f"User cache invalidation failed: {e}")
+
+    async def listen(self, redis_client: aioredis.Redis) -> None:
+        """Evict L1 entries published by other workers (runs until cancelled)"""
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        for user_id in message["data"].split(","):
+                            self.l1.pop(user_id)
+            except RedisError as e:
+                # Messages may have been missed while disconnected
+                print(f"User cache listener disconnected: {e}")
+                self.l1.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+user_cache = UserCache(
+    l1_size=settings.USER_CACHE_L1_SIZE,
+    l1_ttl=settings.USER_CACHE_L1_TTL,
+    l2_ttl=settings.USER_CACHE_L2_TTL,
+)
@@ -0,0 +1,52 @@
+"""Version counters behind ETags
+
+Counters live in Redis and are bumped on every change to what they
+version. A missing counter (fresh Redis, flush, eviction, failover) is
+seeded from the clock in microseconds rather than starting at 0, so a
+version never repeats one a client may still hold in an old ETag and a
+conditional GET cannot match stale content.
+"""
+
+import time
+
+import redis.asyncio as aioredis
+
+# Lua: seed KEYS[i] with ARGV[1] unless it exists (use with a seed argument)
+SEED_OR_INCR = "if not redis.call('SET', {key}, {seed}, 'NX') then redis.call('INCR', {key}) end"
+
+# KEYS: counters  ARGV: seed
+# Returns every counter, seeding the missing ones
+_READ_SCRIPT = """
+local versions = {}
+for i, key in ipairs(KEYS) do
+    local version = redis.call('GET', key)
+    if not version then
+        version = ARGV[1]
+        redis.call('SET', key, version)
+    end
+    versions[i] = version
+end
+return versions
+"""
+
+# KEYS: counters  ARGV: seed
+_BUMP_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    %s
+end
+""" % SEED_OR_INCR.format(key="key", seed="ARGV[1]")
+
+
+def version_seed() -> int:
+    """Starting value for a missing counter: the clock, far above its past values"""
+    return time.time_ns() // 1000
+
+
+async def read_versions(redis_client: aioredis.Redis, *keys: str) -> list[str]:
+    """Current value of each counter (one round trip)"""
+    return await redis_client.eval(_READ_SCRIPT, len(keys), *keys, version_seed())
+
+
+async def bump_versions(redis_client: aioredis.Redis, *keys: str) -> None:
+    """Bump each counter (one round trip)"""
+    await redis_client.eval(_BUMP_SCRIPT, len(keys), *keys, version_seed())
@@ -1,13 +1,26 @@
 """Main FastAPI application"""
 
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as aioredis
 
+from app.api.deps import get_redis
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core import metrics
+from app.core.database import verify_schema, close_db, get_db_readonly, replica_router
+from app.core.http_client import close_http_client
+from app.core.instrumentation import InstrumentationMiddleware, TimedJSONResponse
+from app.core.query_guard import QueryGuardMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.security import load_jwt_keys
+from app.core.user_cache import user_cache
+from app.services.auth_service import siwe_executor
+from app.services.task_service import TaskService
 
 
 @asynccontextmanager
@@ -17,13 +30,29 @@ async def lifespan(app: FastAPI):
     print(f"🚀 Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     print(f"   Environment: {settings.ENVIRONMENT}")
     print(f"   Debug: {settings.DEBUG}")
-    await init_db()
-    print("   Database initialized")
+    await verify_schema()
+    print("   Database schema verified")
+    load_jwt_keys()
+    print("   JWT keys loaded")
+    user_cache_listener = asyncio.create_task(user_cache.listen(await get_redis()))
+    replica_monitor = None
+    if replica_router.enabled:
+        replica_router.redis = await get_redis()
+        replica_monitor = asyncio.create_task(
+            replica_router.monitor(settings.DATABASE_REPLICA_CHECK_INTERVAL)
+        )
+        print(f"   Routing reads to {len(replica_router.replicas)} replica(s)")
     yield
     # Shutdown
     print("   Shutting down...")
+    user_cache_listener.cancel()
+    if replica_monitor:
+        replica_monitor.cancel()
+    siwe_executor.shutdown()
+    await close_http_client()
     await close_db()
     print("   Database connections closed")
+    metrics.mark_process_dead()
 
 
 # Create FastAPI app
@@ -34,9 +63,20 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    default_response_class=TimedJSONResponse,
     lifespan=lifespan,
 )
 
+# Add N+1 / lazy-load detection (tests and staging)
+if settings.QUERY_GUARD_MODE != "off":
+    app.add_middleware(QueryGuardMiddleware)
+
+# Add per-request timings (innermost, so the matched route is known)
+app.add_middleware(InstrumentationMiddleware)
+
+# Add rate limiting (inside CORS so 429s carry CORS headers)
+app.add_middleware(RateLimitMiddleware, redis_factory=get_redis)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -76,6 +116,21 @@ async def health():
     )
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics(
+        db: AsyncSession = Depends(get_db_readonly),
+        redis_client: aioredis.Redis = Depends(get_redis),
+    ):
+        """Prometheus metrics (all workers when PROMETHEUS_MULTIPROC_DIR is set)"""
+        service = TaskService(db, redis_client)
+        metrics.submission_queue_depth.set(await service.count_pending_submissions())
+        for task_type, length in (await service.verification_queue_lengths()).items():
+            metrics.verification_queue_length.labels(task_type).set(length)
+        body, content_type = metrics.render_latest()
+        return Response(content=body, media_type=content_type)
+
+
 # API v1 routes
 from app.api.endpoints import auth, users, courses, tasks
 
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, Numeric, Enum
+from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, Numeric, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
@@ -68,6 +68,7 @@ class UserBadge(Base):
     """UserBadge model - badges earned by users"""
 
     __tablename__ = "user_badges"
+    __table_args__ = (Index("ix_user_badges_user_id", "user_id"),)
 
     # Primary Key
     id: Mapped[uuid.UUID] = mapped_column(
@@ -2,8 +2,8 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Integer, Text, Boolean, DateTime, ForeignKey, Numeric, Float, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Integer, Text, Boolean, DateTime, ForeignKey, Numeric, Float, Enum, Index, Computed, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 import enum
@@ -21,6 +21,18 @@ class Course(Base):
     """Course model - learning courses"""
 
     __tablename__ = "courses"
+    __table_args__ = (
+        # Keyset pagination of listings (newest first)
+        Index("ix_courses_created_at_id", "created_at", "id"),
+        # Full-text search and typo-tolerant title matching
+        Index("ix_courses_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_courses_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     # Primary Key
     id: Mapped[uuid.UUID] = mapped_column(
@@ -33,6 +45,17 @@ class Course(Base):
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     thumbnail_url: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Search (maintained by Postgres on every write; title ranks above description)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     # Course Details
     difficulty_level: Mapped[DifficultyLevel | None] = mapped_column(
         Enum(DifficultyLevel), nullable=True
@@ -79,6 +102,9 @@ class CourseEnrollment(Base):
     """Course enrollment - tracks user enrollment and progress"""
 
     __tablename__ = "course_enrollments"
+    __table_args__ = (
+        UniqueConstraint("course_id", "user_id", name="uq_course_enrollments_course_user"),
+    )
 
     # Primary Key
     id: Mapped[uuid.UUID] = mapped_column(
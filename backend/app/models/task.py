@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Integer, Text, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import String, Integer, Text, Boolean, DateTime, ForeignKey, Enum, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
@@ -31,6 +31,10 @@ class Task(Base):
     """Task model - assignments within courses"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Course task lists, in creation order
+        Index("ix_tasks_course_id_created_at", "course_id", "created_at"),
+    )
 
     # Primary Key
     id: Mapped[uuid.UUID] = mapped_column(
@@ -58,6 +62,10 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
+    # Part of the compiled verification rules cache key
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
 
     # Relationships
     course: Mapped["Course"] = relationship("Course", back_populates="tasks")
@@ -73,6 +81,17 @@ class Submission(Base):
     """Submission model - task submissions from users"""
 
     __tablename__ = "submissions"
+    __table_args__ = (
+        # One submission per user and task (resubmissions update it)
+        UniqueConstraint("task_id", "user_id", name="uq_submissions_task_user"),
+        Index("ix_submissions_user_id", "user_id"),
+        # Review queue, oldest first
+        Index(
+            "ix_submissions_pending_created_at",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
 
     # Primary Key
     id: Mapped[uuid.UUID] = mapped_column(
@@ -109,6 +128,10 @@ class Submission(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
+    # First submission or latest resubmission
+    submitted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
     reviewed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
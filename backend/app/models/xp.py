@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy import String, Integer, BigInteger, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
@@ -12,13 +12,26 @@ class XPLedger(Base):
     """XP Ledger - immutable append-only log of XP changes"""
 
     __tablename__ = "xp_ledger"
+    __table_args__ = (
+        # Per-user history, newest first (also serves plain user_id lookups)
+        Index("ix_xp_ledger_user_id_created_at", "user_id", "created_at"),
+        # At most one sourced award per user (ON CONFLICT target of XP grants)
+        Index(
+            "uq_xp_ledger_source",
+            "source_type",
+            "source_id",
+            "user_id",
+            unique=True,
+            postgresql_where=text("source_id IS NOT NULL"),
+        ),
+    )
 
     # Primary Key (auto-incrementing)
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
     # Foreign Keys
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
 
     # XP Change Details
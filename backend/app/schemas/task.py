@@ -85,6 +85,12 @@ class SubmissionResponse(SubmissionBase):
     model_config = {"from_attributes": True}
 
 
+class SubmissionAccepted(SubmissionResponse):
+    """Submission accepted for (asynchronous) verification"""
+
+    status_url: str
+
+
 class SubmissionWithTask(SubmissionResponse):
     """Submission response with task details"""
 
@@ -26,6 +26,11 @@ class UserUpdate(BaseModel):
     profile_picture_url: Optional[str] = None
 
 
+class UserRoleUpdate(BaseModel):
+    """User role update schema (admin only)"""
+    role: str = Field(..., pattern="^(learner|instructor|admin|partner)$")
+
+
 class UserResponse(BaseModel):
     """User response schema"""
     id: UUID
@@ -0,0 +1,31 @@
+"""XP schemas"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+
+
+class XPGrant(BaseModel):
+    """Single row of a bulk XP grant"""
+    user_id: UUID
+    amount: int
+    source_type: str = Field("admin_grant", max_length=30)
+    source_id: Optional[UUID] = Field(
+        None, description="Campaign/bounty id - required for idempotent re-runs"
+    )
+    reason: Optional[str] = Field(None, max_length=200)
+
+
+class BulkXPGrantRequest(BaseModel):
+    """Bulk XP grant request (campaigns, bounty payouts)"""
+    grants: List[XPGrant] = Field(..., min_length=1)
+    chunk_size: int = Field(1000, ge=1, le=10000)
+
+
+class BulkXPGrantResponse(BaseModel):
+    """Bulk XP grant summary"""
+    requested: int
+    awarded: int
+    skipped: int
+    xp_awarded: int
+    chunks: int
@@ -3,24 +3,41 @@
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
-from siwe import SiweMessage
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import redis.asyncio as aioredis
 
 from app.core.config import settings
+from app.core.executor import BoundedExecutor
+from app.core.nonce_store import NonceStore
 from app.core.security import create_access_token, create_refresh_token
 from app.models.user import User
 from app.schemas.auth import NonceResponse, TokenResponse
 from app.schemas.user import UserResponse
+from app.services.leaderboard_service import LeaderboardService
+from app.services.siwe_verifier import verify_siwe_message, warm_up
+
+# Pool for SIWE parsing/ecrecover so login storms don't block the event loop
+siwe_executor = BoundedExecutor(
+    kind=settings.SIWE_VERIFY_EXECUTOR,
+    max_workers=settings.SIWE_VERIFY_WORKERS,
+    max_pending=settings.SIWE_VERIFY_MAX_PENDING,
+    initializer=warm_up,
+)
 
 
 class AuthService:
     """Authentication service for SIWE and JWT"""
 
-    def __init__(self, db: AsyncSession, redis_client: Optional[aioredis.Redis] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis_client: Optional[aioredis.Redis] = None,
+        nonce_store: Optional[NonceStore] = None,
+    ):
         self.db = db
         self.redis = redis_client
+        self.nonce_store = nonce_store
 
     async def generate_nonce(self, address: str) -> NonceResponse:
         """Generate a nonce for SIWE authentication"""
@@ -36,10 +53,9 @@ class AuthService:
             expiration_time=expiration_time
         )
 
-        # Store nonce in Redis with 5-minute expiration
-        if self.redis:
-            nonce_key = f"nonce:{address}"
-            await self.redis.setex(nonce_key, 300, nonce)  # 5 minutes
+        # Store nonce with 5-minute expiration
+        if self.nonce_store:
+            await self.nonce_store.issue(address, nonce, 300)
 
         return NonceResponse(
             nonce=nonce,
@@ -73,93 +89,139 @@ Expiration Time: {expiration_time.isoformat()}"""
         address: str,
         signature: str,
         message: str
-    ) -> Tuple[bool, Optional[str]]:
-        """Verify SIWE signature"""
-        try:
-            # Parse SIWE message
-            siwe_message = SiweMessage.from_message(message=message)
-
-            # Verify the signature
-            siwe_message.verify(signature=signature)
-
-            # Check if nonce is valid (if using Redis)
-            if self.redis:
-                nonce_key = f"nonce:{address}"
-                stored_nonce = await self.redis.get(nonce_key)
-
-                if not stored_nonce:
-                    return False, "Nonce expired or invalid"
-
-                if stored_nonce.decode() != siwe_message.nonce:
-                    return False, "Nonce mismatch"
-
-                # Delete nonce after successful verification (prevent replay)
-                await self.redis.delete(nonce_key)
-
-            # Verify address matches
-            if siwe_message.address.lower() != address.lower():
-                return False, "Address mismatch"
-
-            return True, None
-
-        except Exception as e:
-            return False, f"Signature verification failed: {str(e)}"
-
-    async def get_or_create_user(self, wallet_address: str) -> User:
-        """Get existing user or create new one"""
-        # Normalize address to lowercase
-        wallet_address = wallet_address.lower()
-
-        # Try to find existing user
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Verify SIWE signature.
+
+        Parsing and signature recovery run in `siwe_executor`; raises
+        PoolSaturatedError when its queue is full. The signed nonce is not
+        checked here: `sign_in` consumes it together with storing the
+        refresh token.
+
+        Returns:
+            (signed nonce, None) if `address` signed the message, else
+            (None, error)
+        """
+        nonce, signer, error = await siwe_executor.run(verify_siwe_message, message, signature)
+        if error:
+            return None, error
+
+        if signer.lower() != address.lower():
+            return None, "Address mismatch"
+
+        return nonce, None
+
+    async def get_user(self, wallet_address: str) -> Optional[User]:
+        """User signed in with this wallet, if any"""
         result = await self.db.execute(
-            select(User).where(User.wallet_address == wallet_address)
+            select(User).where(User.wallet_address == wallet_address.lower())
         )
-        user = result.scalar_one_or_none()
-
-        if user:
-            return user
+        return result.scalar_one_or_none()
 
-        # Create new user
-        new_user = User(wallet_address=wallet_address)
+    async def create_user(self, wallet_address: str) -> User:
+        """Create the user for a wallet"""
+        new_user = User(wallet_address=wallet_address.lower())
         self.db.add(new_user)
         await self.db.commit()
         await self.db.refresh(new_user)
 
+        if self.redis:
+            await LeaderboardService(self.redis).update_profile(new_user)
+
         return new_user
 
-    async def create_tokens(self, user: User) -> TokenResponse:
-        """Create access and refresh tokens for user"""
-        # Create token data
+    async def get_or_create_user(self, wallet_address: str) -> User:
+        """Get existing user or create new one"""
+        return await self.get_user(wallet_address) or await self.create_user(wallet_address)
+
+    @staticmethod
+    def _refresh_key(user_id) -> str:
+        return f"refresh_token:{user_id}"
+
+    @staticmethod
+    def _tokens(user: User) -> Tuple[str, str]:
+        """Access and refresh tokens for user"""
         token_data = {
             "sub": str(user.id),
             "wallet_address": user.wallet_address,
             "role": user.role.value,
         }
+        return create_access_token(token_data), create_refresh_token(token_data)
+
+    @staticmethod
+    def _token_response(user: User, access_token: str, refresh_token: str) -> TokenResponse:
+        return TokenResponse(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+            user=UserResponse.from_orm(user)
+        )
 
-        # Generate tokens
-        access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token(token_data)
+    @staticmethod
+    def _nonce_error(stored_nonce: Optional[str], nonce: str) -> Optional[str]:
+        if not stored_nonce:
+            return "Nonce expired or invalid"
+        if stored_nonce != nonce:
+            return "Nonce mismatch"
+        return None
+
+    async def sign_in(
+        self, address: str, nonce: str
+    ) -> Tuple[Optional[TokenResponse], Optional[str]]:
+        """
+        Consume the signed nonce and issue tokens for a verified signature.
+
+        The nonce is consumed (whether or not it matches) before any user
+        row is written, so a replayed or invalid nonce never creates one.
+        For an existing user, consuming it and storing the refresh token
+        take one Redis round trip; a first sign-in creates the user after
+        the nonce checks out.
+
+        Returns:
+            (tokens, None), or (None, error) if the nonce is stale or unknown
+        """
+        user = await self.get_user(address)
+        ttl = settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+        try:
+            if user is not None:
+                access_token, refresh_token = self._tokens(user)
+                if self.nonce_store:
+                    stored_nonce = await self.nonce_store.redeem(
+                        address, nonce, self._refresh_key(user.id), refresh_token, ttl, self.redis
+                    )
+                    if error := self._nonce_error(stored_nonce, nonce):
+                        return None, error
+                elif self.redis:
+                    await self.redis.setex(self._refresh_key(user.id), ttl, refresh_token)
+                return self._token_response(user, access_token, refresh_token), None
+
+            if self.nonce_store:
+                if error := self._nonce_error(await self.nonce_store.consume(address), nonce):
+                    return None, error
+
+        except Exception as e:
+            return None, f"Nonce verification failed: {str(e)}"
+
+        return await self.create_tokens(await self.create_user(address)), None
+
+    async def create_tokens(self, user: User) -> TokenResponse:
+        """Create access and refresh tokens for user"""
+        access_token, refresh_token = self._tokens(user)
 
         # Store refresh token in Redis (optional - for revocation)
         if self.redis:
-            refresh_key = f"refresh_token:{user.id}"
             await self.redis.setex(
-                refresh_key,
+                self._refresh_key(user.id),
                 settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
                 refresh_token
             )
 
-        return TokenResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer",
-            user=UserResponse.from_orm(user)
-        )
+        return self._token_response(user, access_token, refresh_token)
 
     async def revoke_token(self, user_id: str) -> bool:
         """Revoke user's refresh token"""
         if self.redis:
-            refresh_key = f"refresh_token:{user_id}"
-            await self.redis.delete(refresh_key)
+            await self.redis.delete(self._refresh_key(user_id))
             return True
         return False
@@ -0,0 +1,299 @@
+"""On-chain transaction proof verification over batched JSON-RPC
+
+Transaction proof rules (`Task.verification_rules`):
+    chain_id:           84532 Base Sepolia, 8453 Base, 1 Ethereum
+                        (default CHAIN_DEFAULT_ID)
+    contract_address:   the transaction must be sent to this address
+    min_value:          minimum value in wei
+    min_confirmations:  default CHAIN_MIN_CONFIRMATIONS, capped at
+                        CHAIN_FINALITY_CONFIRMATIONS
+
+The transaction must have succeeded and been sent from the learner's
+wallet.
+
+For each chain, the hashes in a verification batch are looked up with
+eth_getTransactionByHash and eth_getTransactionReceipt, plus one
+eth_blockNumber, all sent as JSON-RPC batch requests over the shared
+HTTP pool. A receipt at least CHAIN_FINALITY_CONFIRMATIONS deep will not
+be reorganized away, so it is cached without expiry: per worker, then
+in Redis for every worker.
+"""
+
+import asyncio
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, NamedTuple, Optional
+
+import httpx
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.models.task import Submission, Task
+from app.services.verification_service import VerificationResult
+
+# Chain id -> settings attribute holding its RPC URL
+CHAIN_RPC_URL_SETTINGS = {
+    84532: "BASE_SEPOLIA_RPC_URL",
+    8453: "BASE_MAINNET_RPC_URL",
+    1: "ETHEREUM_RPC_URL",
+}
+
+_TX_HASH = re.compile(r"^0x[0-9a-f]{64}$")
+
+# Final proofs per worker, in front of Redis
+_final_proofs = TTLCache(max_size=10_000)
+
+# Transaction known to the node but not mined yet
+_PENDING = object()
+
+
+class ChainRPCError(Exception):
+    """Raised when a JSON-RPC endpoint fails or answers with an error"""
+
+
+class TxProof(NamedTuple):
+    """What verification needs from a mined transaction and its receipt"""
+
+    sender: str
+    to: Optional[str]
+    value: int
+    block_number: int
+    succeeded: bool
+
+    @classmethod
+    def from_rpc(cls, tx: dict, receipt: dict) -> "TxProof":
+        return cls(
+            sender=tx["from"].lower(),
+            to=(tx.get("to") or "").lower() or None,
+            value=int(tx["value"], 16),
+            block_number=int(receipt["blockNumber"], 16),
+            succeeded=int(receipt.get("status", "0x1"), 16) == 1,
+        )
+
+
+class JSONRPCBatchClient:
+    """JSON-RPC client sending calls as batch requests of up to `batch_size`"""
+
+    def __init__(self, url: str, http_client: httpx.AsyncClient, batch_size: int):
+        self.url = url
+        self.http_client = http_client
+        self.batch_size = max(1, batch_size)
+
+    async def call_many(self, calls: list[tuple[str, list]]) -> list[Any]:
+        """Results of (method, params) calls, in order; any error fails the lot"""
+        chunks = [calls[i:i + self.batch_size] for i in range(0, len(calls), self.batch_size)]
+        results = await asyncio.gather(*(self._post(chunk) for chunk in chunks))
+        return [result for chunk in results for result in chunk]
+
+    async def _post(self, calls: list[tuple[str, list]]) -> list[Any]:
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        try:
+            response = await self.http_client.post(self.url, json=payload)
+            response.raise_for_status()
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise ChainRPCError(str(e) or type(e).__name__) from e
+
+        if not isinstance(body, list):
+            error = body.get("error") if isinstance(body, dict) else body
+            raise ChainRPCError(f"Batch request rejected: {error}")
+
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        results = []
+        for i, (method, _) in enumerate(calls):
+            item = by_id.get(i)
+            if item is None:
+                raise ChainRPCError(f"No response to {method}")
+            if item.get("error"):
+                raise ChainRPCError(f"{method}: {item['error']}")
+            results.append(item.get("result"))
+        return results
+
+
+def _age_seconds(at: datetime) -> float:
+    now = datetime.now(timezone.utc) if at.tzinfo else datetime.utcnow()
+    return (now - at).total_seconds()
+
+
+class ChainVerifier:
+    """
+    Verifies transaction proof submissions against their chains.
+
+    `rpc_urls` maps chain id to endpoint and defaults to the configured
+    Base Sepolia, Base and Ethereum URLs.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[aioredis.Redis] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        rpc_urls: Optional[dict[int, str]] = None,
+    ):
+        self.redis = redis_client
+        self.http_client = http_client or get_http_client()
+        self.rpc_urls = rpc_urls if rpc_urls is not None else {
+            chain_id: getattr(settings, name) for chain_id, name in CHAIN_RPC_URL_SETTINGS.items()
+        }
+
+    @staticmethod
+    def _cache_key(chain_id: int, tx_hash: str) -> str:
+        return f"chain:tx:{chain_id}:{tx_hash}"
+
+    async def verify_batch(self, items: list[tuple[Submission, Task]]) -> list[VerificationResult]:
+        """Verify (submission, task) pairs, one round of batch requests per chain"""
+        results: list[Optional[VerificationResult]] = [None] * len(items)
+        checks = []
+        wanted: dict[int, set[str]] = {}
+        for position, (submission, task) in enumerate(items):
+            rules = task.verification_rules or {}
+            tx_hash = (submission.transaction_hash or "").lower()
+            chain_id = int(rules.get("chain_id") or settings.CHAIN_DEFAULT_ID)
+            if not tx_hash:
+                results[position] = VerificationResult(False, "Transaction hash is required")
+            elif not _TX_HASH.match(tx_hash):
+                results[position] = VerificationResult(False, "Invalid transaction hash format")
+            elif not self.rpc_urls.get(chain_id):
+                results[position] = VerificationResult(False, f"Unsupported chain: {chain_id}")
+            else:
+                wanted.setdefault(chain_id, set()).add(tx_hash)
+                checks.append((position, submission, rules, chain_id, tx_hash))
+
+        chain_ids = list(wanted)
+        lookups = await asyncio.gather(
+            *(self.lookup(chain_id, wanted[chain_id]) for chain_id in chain_ids),
+            return_exceptions=True,
+        )
+        by_chain = dict(zip(chain_ids, lookups))
+
+        for position, submission, rules, chain_id, tx_hash in checks:
+            lookup = by_chain[chain_id]
+            if isinstance(lookup, ChainRPCError):
+                print(f"Chain {chain_id} RPC error: {lookup}")
+                results[position] = VerificationResult(False, "Chain RPC unavailable", retry=True)
+                continue
+            if isinstance(lookup, BaseException):
+                raise lookup
+            head, proofs = lookup
+            try:
+                results[position] = self._check(submission, rules, chain_id, proofs.get(tx_hash), head)
+            except (TypeError, ValueError) as e:
+                results[position] = VerificationResult(False, f"Verification failed: {e}")
+        return results
+
+    async def lookup(self, chain_id: int, tx_hashes: set[str]) -> tuple[Optional[int], dict[str, Any]]:
+        """
+        (head block, proofs by hash) for `tx_hashes` on one chain.
+
+        A proof is a TxProof, or _PENDING while the transaction is not
+        mined; unknown hashes are absent. The head is None when every
+        proof came from the final-receipt cache.
+        """
+        proofs: dict[str, Any] = {}
+        for tx_hash in tx_hashes:
+            proof = _final_proofs.get((chain_id, tx_hash))
+            if proof is not None:
+                proofs[tx_hash] = proof
+
+        missing = [tx_hash for tx_hash in tx_hashes if tx_hash not in proofs]
+        if missing and self.redis:
+            try:
+                cached = await self.redis.mget([self._cache_key(chain_id, tx_hash) for tx_hash in missing])
+            except RedisError as e:
+                print(f"Redis error reading transaction cache: {e}")
+                cached = [None] * len(missing)
+            for tx_hash, raw in zip(missing, cached):
+                if raw:
+                    proof = TxProof(*json.loads(raw))
+                    proofs[tx_hash] = proof
+                    _final_proofs.set((chain_id, tx_hash), proof)
+            missing = [tx_hash for tx_hash in missing if tx_hash not in proofs]
+
+        if not missing:
+            return None, proofs
+
+        client = JSONRPCBatchClient(self.rpc_urls[chain_id], self.http_client, settings.CHAIN_RPC_BATCH_SIZE)
+        calls = [("eth_blockNumber", [])]
+        for tx_hash in missing:
+            calls.append(("eth_getTransactionByHash", [tx_hash]))
+            calls.append(("eth_getTransactionReceipt", [tx_hash]))
+        results = await client.call_many(calls)
+
+        head = int(results[0], 16)
+        final: dict[str, TxProof] = {}
+        for i, tx_hash in enumerate(missing):
+            tx, receipt = results[1 + 2 * i], results[2 + 2 * i]
+            if tx is None:
+                continue
+            if not receipt or receipt.get("blockNumber") is None:
+                proofs[tx_hash] = _PENDING
+                continue
+            proof = TxProof.from_rpc(tx, receipt)
+            proofs[tx_hash] = proof
+            if head - proof.block_number + 1 >= settings.CHAIN_FINALITY_CONFIRMATIONS:
+                final[tx_hash] = proof
+
+        if final:
+            await self._cache_final(chain_id, final)
+        return head, proofs
+
+    async def _cache_final(self, chain_id: int, proofs: dict[str, TxProof]) -> None:
+        for tx_hash, proof in proofs.items():
+            _final_proofs.set((chain_id, tx_hash), proof)
+        if not self.redis:
+            return
+        try:
+            await self.redis.mset(
+                {self._cache_key(chain_id, tx_hash): json.dumps(proof) for tx_hash, proof in proofs.items()}
+            )
+        except RedisError as e:
+            print(f"Redis error writing transaction cache: {e}")
+
+    def _check(
+        self,
+        submission: Submission,
+        rules: dict,
+        chain_id: int,
+        proof: Any,
+        head: Optional[int],
+    ) -> VerificationResult:
+        # Counted from the latest (re)submission, which may carry a new hash
+        in_grace = _age_seconds(submission.submitted_at) < settings.CHAIN_TX_NOT_FOUND_GRACE_SECONDS
+        if proof is None:
+            if in_grace:
+                return VerificationResult(False, "Transaction not found yet", retry=True)
+            return VerificationResult(False, f"Transaction not found on chain {chain_id}")
+        if proof is _PENDING:
+            if in_grace:
+                return VerificationResult(False, "Transaction is not mined yet", retry=True)
+            return VerificationResult(False, "Transaction was never mined")
+
+        if not proof.succeeded:
+            return VerificationResult(False, "Transaction reverted")
+
+        if proof.sender != submission.user.wallet_address.lower():
+            return VerificationResult(False, "Transaction was not sent from your wallet")
+
+        contract = rules.get("contract_address")
+        if contract and proof.to != contract.lower():
+            return VerificationResult(False, f"Transaction must be sent to {contract}")
+
+        min_value = int(rules.get("min_value") or 0)
+        if proof.value < min_value:
+            return VerificationResult(False, f"Transaction value must be at least {min_value} wei")
+
+        finality = settings.CHAIN_FINALITY_CONFIRMATIONS
+        required = min(int(rules.get("min_confirmations", settings.CHAIN_MIN_CONFIRMATIONS)), finality)
+        confirmations = head - proof.block_number + 1 if head is not None else finality
+        if confirmations < required:
+            return VerificationResult(
+                False, f"Waiting for confirmations ({confirmations}/{required})", retry=True
+            )
+
+        return VerificationResult(True, None)
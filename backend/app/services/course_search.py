@@ -0,0 +1,56 @@
+"""Course search - weighted full-text matching with trigram typo tolerance"""
+
+import re
+from typing import NamedTuple, Optional
+from sqlalchemy import ColumnElement, func, literal, or_
+
+from app.models.course import Course
+
+SEARCH_CONFIG = "english"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class CourseSearch(NamedTuple):
+    """WHERE clause and relevance score for a search string"""
+
+    condition: ColumnElement
+    relevance: ColumnElement
+
+
+def prefix_tsquery(search: str) -> Optional[str]:
+    """
+    Turn free text into a prefix tsquery: 'solid contr' -> 'solid:* & contr:*'.
+
+    Only word characters survive, so user input cannot inject tsquery
+    operators. Returns None when nothing searchable is left.
+    """
+    words = _WORD.findall(search.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def course_search(search: str) -> Optional[CourseSearch]:
+    """
+    Build the match condition and relevance for `search`.
+
+    A course matches when every word prefix-matches its search vector
+    (title weighted above description), or when the search is a close
+    trigram match for a word in the title, which absorbs typos. Both
+    branches are served by GIN indexes. Relevance adds the weighted
+    full-text rank to the title similarity.
+    """
+    tsquery_text = prefix_tsquery(search)
+    if tsquery_text is None:
+        return None
+
+    tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+    term = literal(search.strip())
+
+    condition = or_(
+        Course.search_vector.op("@@")(tsquery),
+        term.op("<%")(Course.title),
+    )
+    relevance = func.ts_rank(Course.search_vector, tsquery) + func.word_similarity(term, Course.title)
+    return CourseSearch(condition, relevance)
@@ -1,21 +1,40 @@
 """Course service - course management and enrollment"""
 
-from typing import Optional, List
+import json
+from typing import NamedTuple, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import Select, select, and_, func, text, tuple_
+from sqlalchemy.dialects import postgresql
+import redis.asyncio as aioredis
 from uuid import UUID
 from datetime import datetime
 
+from app.core.cache import TTLCache
+from app.core.catalog_cache import cache_name, catalog_cache
+from app.core.config import settings
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
 from app.models.course import Course, CourseEnrollment
+from app.services.course_search import CourseSearch, course_search
 from app.models.user import User
 from app.schemas.course import CourseCreate, CourseUpdate
 
 
+# Exact listing totals per filter set when Redis is unavailable
+_course_counts = TTLCache(max_size=1024, ttl=settings.COURSE_COUNT_CACHE_TTL)
+
+
+class CoursePage(NamedTuple):
+    courses: List[Course]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
 class CourseService:
     """Course management service"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis_client: Optional[aioredis.Redis] = None):
         self.db = db
+        self.redis = redis_client
 
     async def create_course(self, course_data: CourseCreate, author_id: UUID) -> Course:
         """Create a new course"""
@@ -26,6 +45,7 @@ class CourseService:
         self.db.add(course)
         await self.db.commit()
         await self.db.refresh(course)
+        await catalog_cache.bump(self.redis)
         return course
 
     async def get_course_by_id(self, course_id: UUID) -> Optional[Course]:
@@ -42,15 +62,12 @@ class CourseService:
         )
         return result.scalar_one_or_none()
 
-    async def list_courses(
+    def _filtered_query(
         self,
-        published_only: bool = True,
-        difficulty: Optional[str] = None,
-        search: Optional[str] = None,
-        limit: int = 20,
-        offset: int = 0,
-    ) -> tuple[List[Course], int]:
-        """List courses with filters"""
+        published_only: bool,
+        difficulty: Optional[str],
+        search: Optional[CourseSearch],
+    ) -> Select:
         query = select(Course)
 
         # Filters
@@ -61,25 +78,106 @@ class CourseService:
             query = query.where(Course.difficulty_level == difficulty)
 
         if search:
-            query = query.where(
-                or_(
-                    Course.title.ilike(f"%{search}%"),
-                    Course.description.ilike(f"%{search}%"),
+            query = query.where(search.condition)
+
+        return query
+
+    async def list_courses(
+        self,
+        published_only: bool = True,
+        difficulty: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+    ) -> CoursePage:
+        """
+        List courses with filters, newest first or, when searching, most
+        relevant first.
+
+        Pages by `offset`, or by keyset when `cursor` (the `next_cursor` of
+        the previous page) is given, which costs the same at any depth.
+
+        Args:
+            count: 'exact' (cached per filter set), 'estimated' (planner
+                row estimate) or 'none'
+        """
+        matcher = course_search(search) if search else None
+        query = self._filtered_query(published_only, difficulty, matcher)
+
+        if matcher:
+            # Most relevant first; the cursor carries (relevance, id)
+            kind = "relevance"
+            sort_key = (matcher.relevance, Course.id)
+            page_query = query.add_columns(matcher.relevance)
+        else:
+            kind = "created"
+            sort_key = (Course.created_at, Course.id)
+            page_query = query
+
+        if cursor:
+            position, course_id = decode_cursor(cursor, kind)
+            try:
+                after = (
+                    float(position) if matcher else datetime.fromisoformat(position),
+                    UUID(course_id),
                 )
-            )
+            except (TypeError, ValueError) as e:
+                raise InvalidCursorError("Malformed cursor") from e
+            page_query = page_query.where(tuple_(*sort_key) < after)
+        else:
+            page_query = page_query.offset(offset)
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        # One extra row tells us whether there is a next page
+        result = await self.db.execute(
+            page_query.order_by(*(column.desc() for column in sort_key)).limit(limit + 1)
+        )
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            position = last[1] if matcher else last[0].created_at.isoformat()
+            next_cursor = encode_cursor(kind, position, str(last[0].id))
+
+        courses = [row[0] for row in rows]
 
-        # Pagination
-        query = query.limit(limit).offset(offset)
+        if count == "exact":
+            total = await self._exact_count(query, (published_only, difficulty, search and search.strip()))
+        elif count == "estimated":
+            total = await self._estimated_count(query)
+        else:
+            total = None
 
-        result = await self.db.execute(query)
-        courses = result.scalars().all()
+        return CoursePage(courses, total, next_cursor)
 
-        return courses, total
+    async def _exact_count(self, query: Select, filters: tuple) -> int:
+        async def count() -> str:
+            count_query = select(func.count()).select_from(query.subquery())
+            return str((await self.db.execute(count_query)).scalar())
+
+        # Cached under the catalog version when Redis is available
+        if self.redis is not None:
+            return int(await catalog_cache.get_or_load(self.redis, cache_name("count", filters=filters), count))
+
+        total = _course_counts.get(filters)
+        if total is None:
+            total = int(await count())
+            _course_counts.set(filters, total)
+        return total
+
+    async def _estimated_count(self, query: Select) -> int:
+        compiled = query.with_only_columns(Course.id).compile(
+            dialect=postgresql.dialect(paramstyle="named"),
+        )
+        plan = (
+            await self.db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"), compiled.params)
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     async def update_course(
         self, course_id: UUID, course_update: CourseUpdate
@@ -95,6 +193,7 @@ class CourseService:
 
         await self.db.commit()
         await self.db.refresh(course)
+        await catalog_cache.bump(self.redis)
         return course
 
     async def enroll_user(self, course_id: UUID, user_id: UUID) -> CourseEnrollment:
@@ -0,0 +1,132 @@
+"""Multi-keyword matcher - Aho-Corasick automaton
+
+Finds which of many keywords occur in a text in a single pass over it,
+instead of one substring scan per keyword.
+"""
+
+from collections import deque
+from typing import Iterable
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+
+    `find` returns the indices (into the original list) of the keywords
+    present in a text. Matching is case-insensitive with Unicode case
+    folding ("Straße" matches "STRASSE") unless `case_sensitive`; with
+    `word_boundary` a keyword only counts when it is not directly preceded
+    or followed by a letter, digit or underscore. Empty keywords never
+    match.
+
+    Transitions resolved through failure links are memoized per state,
+    so after warm-up each character costs one dict lookup. Instances are
+    immutable apart from that memo and can be shared and cached.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        case_sensitive: bool = False,
+        word_boundary: bool = False,
+    ):
+        self.keywords = list(keywords)
+        self.case_sensitive = case_sensitive
+        self.word_boundary = word_boundary
+
+        goto: list[dict[str, int]] = [{}]
+        # Per state: (keyword index, keyword length) of every keyword ending there
+        outputs: list[tuple[tuple[int, int], ...]] = [()]
+        for index, keyword in enumerate(self.keywords):
+            keyword = self._normalize(keyword)
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][ch] = next_state
+                state = next_state
+            outputs[state] += ((index, len(keyword)),)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(ch, 0)
+                outputs[next_state] += outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._output_indices = [tuple(index for index, _ in output) for output in outputs]
+        self._delta = [dict(transitions) for transitions in goto]
+        self._alphabet = frozenset(ch for transitions in goto for ch in transitions)
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.casefold()
+
+    def _transition(self, state: int, ch: str) -> int:
+        while True:
+            next_state = self._goto[state].get(ch)
+            if next_state is not None:
+                return next_state
+            if state == 0:
+                return 0
+            state = self._fail[state]
+
+    def find(self, text: str) -> set[int]:
+        """Indices of the keywords that occur in `text`"""
+        text = self._normalize(text)
+        if self.word_boundary:
+            return self._find_words(text)
+
+        delta, outputs, alphabet = self._delta, self._output_indices, self._alphabet
+        found: set[int] = set()
+        state = 0
+        for ch in text:
+            next_state = delta[state].get(ch)
+            if next_state is None:
+                if ch not in alphabet:
+                    state = 0
+                    continue
+                next_state = delta[state][ch] = self._transition(state, ch)
+            state = next_state
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def _find_words(self, text: str) -> set[int]:
+        delta, outputs, alphabet = self._delta, self._outputs, self._alphabet
+        found: set[int] = set()
+        state = 0
+        last = len(text) - 1
+        for position, ch in enumerate(text):
+            next_state = delta[state].get(ch)
+            if next_state is None:
+                if ch not in alphabet:
+                    state = 0
+                    continue
+                next_state = delta[state][ch] = self._transition(state, ch)
+            state = next_state
+            if not outputs[state]:
+                continue
+            if position < last and _is_word_char(text[position + 1]):
+                continue
+            for index, length in outputs[state]:
+                start = position - length + 1
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    found.add(index)
+        return found
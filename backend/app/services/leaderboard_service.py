@@ -0,0 +1,462 @@
+"""Leaderboard service - time-windowed leaderboards in Redis sorted sets"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from uuid import UUID
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as aioredis
+
+from app.core.versions import SEED_OR_INCR, bump_versions, read_versions, version_seed
+from app.models.user import User
+from app.models.xp import XPLedger
+
+PERIODS = ("all_time", "weekly", "monthly")
+
+PROFILES_KEY = "leaderboard:profiles"
+
+# Bumped on every change to any window or profile (leaderboard ETags,
+# seeded as in app.core.versions)
+VERSION_KEY = "leaderboard:version"
+
+# Rows per ZADD/HSET pipeline while rebuilding a window
+REBUILD_BATCH_SIZE = 5000
+
+# Lifetime of a rebuild's lock, scratch set and delta buffer, in case the
+# rebuild dies before swapping its window in
+REBUILD_TIMEOUT = 3600
+
+# Minimum seconds between rebuilds requested by pages of an unbuilt window
+REBUILD_REQUEST_INTERVAL = 60
+
+# KEYS: version, then window, built marker, rebuild lock and delta buffer
+# prefix of each window
+# ARGV: rebuild timeout, version seed, then per window its expiry (unix
+# time, 0 for none), command (ZADD or ZINCRBY), member count and
+# (member, score, delta) triples.
+# Windows without a built marker are skipped (a rebuild computes them);
+# while a window is rebuilding, deltas are also buffered for the swap in
+# the buffer of the run holding the lock (prefix:token).
+_AWARD_SCRIPT = """
+local arg = 3
+for i = 2, #KEYS, 4 do
+    local expiry = tonumber(ARGV[arg])
+    local command = ARGV[arg + 1]
+    local first = arg + 3
+    arg = first + 3 * tonumber(ARGV[arg + 2])
+    local built = redis.call('EXISTS', KEYS[i + 1]) == 1
+    local token = redis.call('GET', KEYS[i + 2])
+    local deltas = token and (KEYS[i + 3] .. ':' .. token)
+    for j = first, arg - 1, 3 do
+        if built then
+            redis.call(command, KEYS[i], ARGV[j + 1], ARGV[j])
+        end
+        if deltas then
+            redis.call('HINCRBY', deltas, ARGV[j], ARGV[j + 2])
+        end
+    end
+    if built and expiry > 0 then
+        redis.call('EXPIREAT', KEYS[i], expiry)
+    end
+    if deltas then
+        redis.call('EXPIRE', deltas, ARGV[1])
+    end
+end
+""" + SEED_OR_INCR.format(key="KEYS[1]", seed="ARGV[2]")
+
+# KEYS: window, scratch, delta buffer, rebuild lock, built marker, version
+# ARGV: expiry (unix time, 0 for none), run token, streamed row count,
+# version seed
+# Folds the deltas buffered while streaming into the run's scratch set,
+# then swaps it in and marks the window built. Returns 0, leaving the
+# window alone, if the run no longer holds the lock or its scratch set
+# is gone although rows were streamed into it.
+_SWAP_SCRIPT = """
+if redis.call('GET', KEYS[4]) ~= ARGV[2] then
+    redis.call('DEL', KEYS[2], KEYS[3])
+    return 0
+end
+local deltas = redis.call('HGETALL', KEYS[3])
+for i = 1, #deltas, 2 do
+    redis.call('ZINCRBY', KEYS[2], deltas[i + 1], deltas[i])
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('RENAME', KEYS[2], KEYS[1])
+elseif tonumber(ARGV[3]) == 0 and #deltas == 0 then
+    -- Nobody has XP in the window
+    redis.call('DEL', KEYS[1])
+else
+    redis.call('DEL', KEYS[3], KEYS[4])
+    return 0
+end
+redis.call('DEL', KEYS[3], KEYS[4])
+redis.call('SET', KEYS[5], 1)
+local expiry = tonumber(ARGV[1])
+if expiry > 0 then
+    redis.call('EXPIREAT', KEYS[1], expiry)
+    redis.call('EXPIREAT', KEYS[5], expiry)
+end
+""" + SEED_OR_INCR.format(key="KEYS[6]", seed="ARGV[4]") + """
+return 1
+"""
+
+# KEYS: rebuild lock, scratch, delta buffer  ARGV: run token
+# Drops a failed run's keys and its lock, unless another run holds it
+_ABORT_SCRIPT = """
+redis.call('DEL', KEYS[2], KEYS[3])
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+"""
+
+# KEYS: window, profiles  ARGV: member, k
+# Returns total, score, position, greater, first_position, first_greater,
+# window (flat member/score list) and the window's profiles.
+_RANK_SCRIPT = """
+local total = redis.call('ZCARD', KEYS[1])
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+local k = tonumber(ARGV[2])
+local position = false
+local greater
+local anchor
+if score then
+    position = redis.call('ZREVRANK', KEYS[1], ARGV[1])
+    greater = redis.call('ZCOUNT', KEYS[1], '(' .. score, '+inf')
+    anchor = position
+else
+    greater = redis.call('ZCOUNT', KEYS[1], '(0', '+inf')
+    anchor = greater
+end
+local first = math.max(anchor - k, 0)
+local window = redis.call('ZREVRANGE', KEYS[1], first, anchor + k, 'WITHSCORES')
+local first_greater = 0
+local profiles = {}
+if #window > 0 then
+    first_greater = redis.call('ZCOUNT', KEYS[1], '(' .. window[2], '+inf')
+    local members = {}
+    for i = 1, #window, 2 do
+        members[#members + 1] = window[i]
+    end
+    profiles = redis.call('HMGET', KEYS[2], unpack(members))
+end
+return {total, score, position, greater, first, first_greater, window, profiles}
+"""
+
+
+def schedule_rebuild(period: str) -> None:
+    """Send a rebuild of `period` to the Celery worker (blocking)"""
+    # Imported here: Celery stays out of the API's startup path
+    from app.workers.celery_app import celery_app
+
+    try:
+        celery_app.send_task("app.workers.leaderboard.rebuild_leaderboards", args=[[period]])
+    except Exception as e:
+        # Broker unreachable; the scheduled rebuild builds the window
+        print(f"Leaderboard rebuild scheduling failed: {e}")
+
+
+def _window_start(period: str, at: datetime) -> Optional[datetime]:
+    """Start of the window containing `at` (UTC), None for all-time"""
+    day = at.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "weekly":
+        return day - timedelta(days=day.weekday())
+    if period == "monthly":
+        return day.replace(day=1)
+    return None
+
+
+def _window_end(period: str, start: datetime) -> datetime:
+    """Exclusive end of the window starting at `start`"""
+    if period == "weekly":
+        return start + timedelta(days=7)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+class LeaderboardService:
+    """
+    Leaderboards kept incrementally in Redis.
+
+    One sorted set per window (all-time, current ISO week, current month),
+    scored by XP and keyed by user id, plus a hash of public profiles so a
+    page can be served without touching Postgres. Windowed keys are named
+    after their window, so they roll over at the boundary and expire one
+    window after they close. `rebuild` recomputes a window from `users` /
+    `xp_ledger` and marks it built; awards only update built windows. It is
+    scheduled on the Celery beat to seed new windows and repair drift.
+    """
+
+    def __init__(self, redis_client: aioredis.Redis, db: Optional[AsyncSession] = None):
+        self.redis = redis_client
+        self.db = db
+
+    @staticmethod
+    def window_key(period: str, at: Optional[datetime] = None) -> str:
+        """Redis key of the window containing `at`"""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown leaderboard period: {period}")
+
+        at = at or datetime.utcnow()
+        if period == "weekly":
+            year, week, _ = at.isocalendar()
+            return f"leaderboard:weekly:{year}-W{week:02d}"
+        if period == "monthly":
+            return f"leaderboard:monthly:{at:%Y-%m}"
+        return "leaderboard:all_time"
+
+    @staticmethod
+    def _window_expiry(period: str, at: datetime) -> int:
+        """Unix time at which a window key may be dropped (one window after it closes)"""
+        start = _window_start(period, at)
+        end = _window_end(period, _window_end(period, start))
+        return int((end - datetime(1970, 1, 1)).total_seconds())
+
+    @staticmethod
+    def _profile(user_id, wallet_address, username, profile_picture_url) -> str:
+        """Serialized public profile stored in the profiles hash"""
+        return json.dumps({
+            "id": str(user_id),
+            "wallet_address": wallet_address,
+            "username": username,
+            "profile_picture_url": profile_picture_url,
+        })
+
+    async def record_award(
+        self,
+        user_id: UUID,
+        xp_change: int,
+        balance_after: int,
+        at: Optional[datetime] = None,
+    ) -> None:
+        """Apply one XP award to every built window (single round trip)"""
+        member = str(user_id)
+        await self._apply(
+            at or datetime.utcnow(),
+            # All-time score is the authoritative balance, so it self-heals
+            {"all_time": ("ZADD", [(member, balance_after, xp_change)])},
+            [(member, xp_change, xp_change)],
+        )
+
+    async def record_awards(
+        self,
+        awards: Iterable[tuple[UUID, int]],
+        at: Optional[datetime] = None,
+    ) -> None:
+        """Apply a batch of (user_id, xp_change) awards to every built window"""
+        deltas: dict[str, int] = {}
+        for user_id, xp_change in awards:
+            deltas[str(user_id)] = deltas.get(str(user_id), 0) + xp_change
+        if not deltas:
+            return
+
+        await self._apply(
+            at or datetime.utcnow(),
+            {},
+            [(member, delta, delta) for member, delta in deltas.items()],
+        )
+
+    async def _apply(
+        self,
+        at: datetime,
+        commands: dict[str, tuple[str, list[tuple[str, int, int]]]],
+        increments: list[tuple[str, int, int]],
+    ) -> None:
+        """
+        Run the award script over every window: `commands` overrides the
+        (command, triples) of a period, other periods get ZINCRBY `increments`.
+
+        A window is only updated once a rebuild has marked it built, so an
+        award on an empty Redis cannot create a partial window that passes
+        for a complete one; the scheduled rebuild, or one requested by
+        `get_page`, fills it in.
+        """
+        keys = [VERSION_KEY]
+        args = [REBUILD_TIMEOUT, version_seed()]
+        for period in PERIODS:
+            key = self.window_key(period, at)
+            command, triples = commands.get(period, ("ZINCRBY", increments))
+            keys += [key, f"{key}:built", f"{key}:rebuilding", f"{key}:deltas"]
+            expiry = self._window_expiry(period, at) if period != "all_time" else 0
+            args += [expiry, command, len(triples)]
+            for triple in triples:
+                args.extend(triple)
+        await self.redis.eval(_AWARD_SCRIPT, len(keys), *keys, *args)
+
+    async def update_profile(self, user: User) -> None:
+        """Store the public profile shown next to a leaderboard entry"""
+        await self.redis.hset(
+            PROFILES_KEY,
+            str(user.id),
+            self._profile(user.id, user.wallet_address, user.username, user.profile_picture_url),
+        )
+        await bump_versions(self.redis, VERSION_KEY)
+
+    async def version(self) -> str:
+        """Current leaderboard version"""
+        (version,) = await read_versions(self.redis, VERSION_KEY)
+        return version
+
+    async def get_page(
+        self,
+        period: str = "all_time",
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict]:
+        """
+        Get a leaderboard page in O(log n + limit), without touching Postgres.
+
+        When the window has never been built (fresh Redis, or a new week or
+        month before its scheduled rebuild) the page is served from whatever
+        the window holds, usually nothing, and a rebuild is sent to the
+        Celery worker, at most once per REBUILD_REQUEST_INTERVAL.
+        """
+        key = self.window_key(period)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(key, offset, offset + limit - 1, withscores=True)
+            pipe.exists(f"{key}:built")
+            entries, built = await pipe.execute()
+
+        if not built and await self.redis.set(
+            f"{key}:rebuild_requested", 1, nx=True, ex=REBUILD_REQUEST_INTERVAL
+        ):
+            await asyncio.to_thread(schedule_rebuild, period)
+
+        if not entries:
+            return []
+
+        # Ties share a rank, so the first entry's rank depends on how many
+        # users score strictly more than it
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcount(key, f"({entries[0][1]}", "+inf")
+            pipe.hmget(PROFILES_KEY, [member for member, _ in entries])
+            first_greater, profiles = await pipe.execute()
+
+        return self._ranked(entries, profiles, offset + 1, first_greater + 1)
+
+    async def get_rank(
+        self, user_id: UUID, period: str = "all_time", k: int = 5
+    ) -> dict:
+        """
+        Get a user's rank, percentile and the +/-k users around them.
+
+        One round trip (Lua script) doing ZSCORE/ZREVRANK/ZCOUNT/ZREVRANGE
+        and HMGET, all O(log n + k). Users with equal XP share the same rank
+        (standard competition ranking: 1, 2, 2, 4); `position` is the
+        user's ordinal place in the tie-broken order. Users without XP in
+        the window are ranked after everyone who has some.
+        """
+        total, score, position, greater, first_position, first_greater, window, profiles = (
+            await self.redis.eval(
+                _RANK_SCRIPT, 2, self.window_key(period), PROFILES_KEY, str(user_id), k
+            )
+        )
+
+        xp = int(float(score)) if score is not None else 0
+        population = total if position is not None else total + 1
+        entries = [(window[i], float(window[i + 1])) for i in range(0, len(window), 2)]
+
+        return {
+            "user_id": str(user_id),
+            "time_period": period,
+            "rank": greater + 1,
+            "position": position + 1 if position is not None else None,
+            "xp_total": xp,
+            "percentile": round(100 * (population - greater) / population, 2),
+            "total_ranked": total,
+            "neighbours": self._ranked(entries, profiles, first_position + 1, first_greater + 1),
+        }
+
+    @staticmethod
+    def _ranked(
+        entries: list[tuple[str, float]],
+        profiles: list[Optional[str]],
+        first_position: int,
+        first_rank: int,
+    ) -> list[dict]:
+        """Attach competition ranks and cached profiles to (member, score) pairs"""
+        page = []
+        rank = first_rank
+        previous_score = None
+        for position, ((member, score), profile) in enumerate(
+            zip(entries, profiles), start=first_position
+        ):
+            if previous_score is not None and score != previous_score:
+                rank = position
+            previous_score = score
+
+            user = json.loads(profile) if profile else {
+                "id": member,
+                "wallet_address": None,
+                "username": None,
+                "profile_picture_url": None,
+            }
+            page.append({"rank": rank, "position": position, "user": user, "xp_total": int(score)})
+        return page
+
+    async def rebuild(self, period: str, at: Optional[datetime] = None) -> Optional[int]:
+        """
+        Recompute a window from Postgres and atomically swap it in.
+
+        One rebuild per window runs at a time: each run takes the window's
+        lock (SET NX) with a random token and streams into its own scratch
+        set. Awards recorded while the rows stream are buffered per member
+        and folded into the new window at the swap. An award committed just
+        before the query's snapshot but recorded after the rebuild started
+        is counted twice, until the next rebuild.
+
+        Returns:
+            Number of ranked users, or None if another rebuild holds the
+            window or this one lost its lock or scratch set before the swap
+        """
+        if self.db is None:
+            raise ValueError("Leaderboard rebuild requires a database session")
+
+        at = at or datetime.utcnow()
+        key = self.window_key(period, at)
+        token = uuid.uuid4().hex
+        lock = f"{key}:rebuilding"
+        if not await self.redis.set(lock, token, nx=True, ex=REBUILD_TIMEOUT):
+            return None
+
+        scratch = f"{key}:rebuild:{token}"
+        deltas = f"{key}:deltas:{token}"
+        profile_columns = (User.id, User.wallet_address, User.username, User.profile_picture_url)
+
+        start = _window_start(period, at)
+        if start is None:
+            query = select(*profile_columns, User.xp_total).where(User.xp_total > 0)
+        else:
+            window_xp = (
+                select(XPLedger.user_id, func.sum(XPLedger.xp_change).label("xp"))
+                .where(XPLedger.created_at >= start)
+                .where(XPLedger.created_at < _window_end(period, start))
+                .group_by(XPLedger.user_id)
+                .having(func.sum(XPLedger.xp_change) > 0)
+                .subquery()
+            )
+            query = select(*profile_columns, window_xp.c.xp).join(
+                window_xp, window_xp.c.user_id == User.id
+            )
+
+        count = 0
+        try:
+            result = await self.db.stream(query.execution_options(yield_per=REBUILD_BATCH_SIZE))
+            async for rows in result.partitions():
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.zadd(scratch, {str(row[0]): row[4] for row in rows})
+                    pipe.expire(scratch, REBUILD_TIMEOUT)
+                    pipe.hset(PROFILES_KEY, mapping={str(row[0]): self._profile(*row[:4]) for row in rows})
+                    await pipe.execute()
+                count += len(rows)
+        except BaseException:
+            await self.redis.eval(_ABORT_SCRIPT, 3, lock, scratch, deltas, token)
+            raise
+
+        expiry = self._window_expiry(period, at) if start is not None else 0
+        swapped = await self.redis.eval(
+            _SWAP_SCRIPT, 6, key, scratch, deltas, lock, f"{key}:built", VERSION_KEY,
+            expiry, token, count, version_seed(),
+        )
+        return count if swapped else None
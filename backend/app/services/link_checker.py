@@ -0,0 +1,222 @@
+"""Link liveness checks for link submissions
+
+Links are parsed with urlsplit, so domain rules compare the real host
+(`https://evil.com/?github.com` is on evil.com). Each link is probed
+with HEAD, falling back to GET when the server rejects HEAD, following at
+most LINK_CHECK_MAX_REDIRECTS redirects. Every hop must stay on http(s)
+and its host must resolve to global addresses only; the request is then
+sent to the vetted address (with the original Host header and TLS server
+name), so a second DNS answer cannot redirect it. Probes go through a
+shared client without keep-alive (see get_probe_client), with at most
+LINK_CHECK_PER_HOST_CONCURRENCY requests in flight per host, spaced
+LINK_CHECK_HOST_INTERVAL seconds apart. Results are cached per worker
+by URL.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from typing import Awaitable, Callable, NamedTuple, Optional
+from urllib.parse import SplitResult, urljoin, urlsplit
+
+import httpx
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_client import get_probe_client
+
+# Probe results by URL; dead links expire sooner
+_results = TTLCache(max_size=10_000)
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Statuses some servers answer HEAD with while GET would work
+_HEAD_UNSUPPORTED = {403, 405, 501}
+_PRIVATE_SUFFIXES = (".localhost", ".local", ".internal", ".lan", ".home.arpa")
+# Feedback for every failure below HTTP: learners learn nothing about the network
+_UNREACHABLE = "link unreachable"
+
+Resolver = Callable[[str, int], Awaitable[list[str]]]
+
+
+class LinkStatus(NamedTuple):
+    """Probe outcome of one link"""
+
+    alive: bool
+    status: Optional[int] = None
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+
+
+def parse_link(url: str) -> Optional[SplitResult]:
+    """Parsed http(s) URL with a host, or None"""
+    try:
+        parts = urlsplit(url.strip())
+        parts.port  # raises on a malformed port
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    return parts
+
+
+def link_host(parts: SplitResult) -> str:
+    """Lowercase host without a trailing dot"""
+    return parts.hostname.rstrip(".")
+
+
+def host_matches(host: str, domain: str) -> bool:
+    """True if `host` is `domain` or one of its subdomains"""
+    domain = domain.lower().strip().rstrip(".")
+    return host == domain or host.endswith("." + domain)
+
+
+def is_public_host(host: str) -> bool:
+    """False for loopback, private and link-local addresses and local names"""
+    try:
+        return ipaddress.ip_address(host).is_global
+    except ValueError:
+        pass
+    try:
+        # Shorthand IPv4 forms resolvers accept: 0x7f.1, 2130706433, 127.1
+        return ipaddress.ip_address(socket.inet_aton(host)).is_global
+    except OSError:
+        pass
+    return "." in host and host != "localhost" and not host.endswith(_PRIVATE_SUFFIXES)
+
+
+async def resolve_host(host: str, port: int) -> list[str]:
+    """Every address `host` resolves to"""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+async def public_address(host: str, port: int, resolver: Resolver = resolve_host) -> Optional[str]:
+    """First address of `host` if all of them are global, else None"""
+    try:
+        addresses = [ipaddress.ip_address(address) for address in await resolver(host, port)]
+    except (OSError, UnicodeError, ValueError):
+        return None
+    if not addresses or not all(address.is_global for address in addresses):
+        return None
+    return str(addresses[0])
+
+
+def link_rule_error(links: Optional[list[str]], required_domain: Optional[str]) -> Optional[str]:
+    """Why `links` break the format or domain rules, or None"""
+    if not links:
+        return "At least one link is required"
+
+    hosts = []
+    for link in links:
+        parts = parse_link(link)
+        if parts is None:
+            return f"Invalid URL format: {link}"
+        host = link_host(parts)
+        if not is_public_host(host):
+            return f"Link must point to a public host: {link}"
+        hosts.append(host)
+
+    if required_domain and not any(host_matches(host, required_domain) for host in hosts):
+        return f"Link must be from domain: {required_domain}"
+    return None
+
+
+class LinkChecker:
+    """
+    Probes links concurrently with per-host limits.
+
+    Host slots are bound to the running event loop, so create one checker
+    per verification batch. `resolver` maps a host and port to addresses
+    (getaddrinfo by default).
+    """
+
+    def __init__(
+        self, http_client: Optional[httpx.AsyncClient] = None, resolver: Resolver = resolve_host
+    ):
+        self.http_client = http_client or get_probe_client()
+        self.resolver = resolver
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._next_request: dict[str, float] = {}
+
+    async def check_many(self, urls: list[str], deadline: float) -> dict[str, LinkStatus]:
+        """
+        Statuses by URL for every link checked within `deadline` seconds.
+
+        Links still in flight when the deadline passes are left out.
+        """
+        statuses: dict[str, LinkStatus] = {}
+        probes: dict[asyncio.Task, str] = {}
+        for url in dict.fromkeys(urls):
+            cached = _results.get(url)
+            if cached is not None:
+                statuses[url] = cached
+            else:
+                probes[asyncio.create_task(self.check(url))] = url
+
+        if probes:
+            done, pending = await asyncio.wait(probes, timeout=deadline)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                statuses[probes[task]] = task.result()
+        return statuses
+
+    async def check(self, url: str) -> LinkStatus:
+        """Probe one link, following redirects; the result is cached"""
+        status = await self._probe(url)
+        ttl = settings.LINK_CHECK_CACHE_TTL if status.alive else settings.LINK_CHECK_FAILURE_CACHE_TTL
+        _results.set(url, status, ttl=ttl)
+        return status
+
+    async def _probe(self, url: str) -> LinkStatus:
+        current = url
+        for _ in range(settings.LINK_CHECK_MAX_REDIRECTS + 1):
+            parts = parse_link(current)
+            if parts is None:
+                return LinkStatus(False, final_url=current, error="invalid URL")
+            host = link_host(parts)
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            address = await public_address(host, port, self.resolver) if is_public_host(host) else None
+            if address is None:
+                return LinkStatus(False, final_url=current, error=_UNREACHABLE)
+
+            try:
+                response = await self._request(host, address, "HEAD", current)
+                if response.status_code in _HEAD_UNSUPPORTED:
+                    response = await self._request(host, address, "GET", current)
+            except (httpx.HTTPError, httpx.InvalidURL):
+                return LinkStatus(False, final_url=current, error=_UNREACHABLE)
+
+            location = response.headers.get("location")
+            if response.status_code in _REDIRECT_STATUSES and location:
+                current = urljoin(current, location)
+                continue
+            if response.status_code >= 400:
+                return LinkStatus(False, response.status_code, current, f"HTTP {response.status_code}")
+            return LinkStatus(True, response.status_code, current)
+
+        return LinkStatus(False, final_url=current, error="too many redirects")
+
+    async def _request(self, host: str, address: str, method: str, url: str) -> httpx.Response:
+        """One request to `address` within the host's concurrency and spacing limits, body unread"""
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(settings.LINK_CHECK_PER_HOST_CONCURRENCY)
+        async with slot:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(host, now))
+            self._next_request[host] = start + settings.LINK_CHECK_HOST_INTERVAL
+            if start > now:
+                await asyncio.sleep(start - now)
+            target = httpx.URL(url)
+            request = self.http_client.build_request(
+                method,
+                target.copy_with(host=address),
+                headers={"Host": target.netloc.decode("ascii")},
+                timeout=settings.LINK_CHECK_TIMEOUT,
+                extensions={"sni_hostname": target.host} if target.scheme == "https" else None,
+            )
+            response = await self.http_client.send(request, stream=True, follow_redirects=False)
+            await response.aclose()
+            return response
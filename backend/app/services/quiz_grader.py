@@ -0,0 +1,215 @@
+"""Quiz grading - answer keys compiled to arrays, submissions scored in batches
+
+Quiz rules (`Task.verification_rules`):
+
+    {
+      "questions": [
+        {"id": "q1", "type": "single", "answer": "b", "points": 1},
+        {"id": "q2", "type": "multi", "answer": ["a", "c"], "options": ["a", "b", "c", "d"],
+         "points": 2, "partial": true},
+        {"id": "q3", "type": "numeric", "answer": 3.14, "tolerance": 0.01}
+      ],
+      "pass_threshold": 0.7
+    }
+
+`points` defaults to 1 and `pass_threshold` (share of the points) to
+0.7. Multi-select questions score all-or-nothing unless `partial`,
+which scores (right picks - wrong picks) / correct options, floored at
+0. Text answers compare trimmed and case-folded. The older
+`correct_answers` form ({"q1": "b", ...}) is read as one-point
+questions, typed by their answer.
+
+Submissions put a JSON object of question id to answer in
+`submission_text`. Parsing is per submission; scoring runs on NumPy
+arrays for the whole batch.
+"""
+
+import json
+from numbers import Real
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_PASS_THRESHOLD = 0.7
+
+
+class QuizGrade(NamedTuple):
+    """Score (share of points, 0-1) of one submission"""
+
+    score: float
+    passed: bool
+    error: Optional[str] = None
+
+
+def _normalize(answer) -> str:
+    return str(answer).strip().casefold()
+
+
+def _number(answer) -> float:
+    if isinstance(answer, bool):
+        return np.nan
+    if isinstance(answer, Real):
+        return float(answer)
+    try:
+        return float(str(answer).strip())
+    except ValueError:
+        return np.nan
+
+
+def _questions(rules: dict) -> list[dict]:
+    """Question list, converting the legacy `correct_answers` mapping"""
+    if rules.get("questions"):
+        return rules["questions"]
+    questions = []
+    for question_id, answer in (rules.get("correct_answers") or {}).items():
+        if isinstance(answer, list):
+            kind = "multi"
+        elif isinstance(answer, Real) and not isinstance(answer, bool):
+            kind = "numeric"
+        else:
+            kind = "single"
+        questions.append({"id": question_id, "type": kind, "answer": answer})
+    return questions
+
+
+class CompiledQuiz:
+    """
+    Answer key of one quiz as arrays:
+
+    - single choice: key answers, compared per question
+    - multi-select: one boolean column per known option; question
+      boundaries as reduceat offsets
+    - numeric: key values and tolerances
+    """
+
+    def __init__(self, rules: dict):
+        self.error: Optional[str] = None
+        self.pass_threshold = float(rules.get("pass_threshold", DEFAULT_PASS_THRESHOLD))
+
+        single, multi, numeric = [], [], []
+        for question in _questions(rules):
+            kind = question.get("type", "single")
+            if (
+                kind not in ("single", "multi", "numeric")
+                or "id" not in question
+                or "answer" not in question
+                or (kind == "multi" and not (isinstance(question["answer"], list) and question["answer"]))
+            ):
+                self.error = f"Invalid quiz question: {question.get('id', question)}"
+                return
+            {"single": single, "multi": multi, "numeric": numeric}[kind].append(question)
+
+        if not (single or multi or numeric):
+            self.error = "Quiz has no correct answers configured"
+            return
+
+        # Single choice
+        self.single_ids = [str(q["id"]) for q in single]
+        self.single_keys = [_normalize(q["answer"]) for q in single]
+        self.single_points = np.array([float(q.get("points", 1)) for q in single])
+
+        # Multi-select: columns of every question's known options, grouped by question
+        self.multi_ids = [str(q["id"]) for q in multi]
+        self.multi_columns: list[dict[str, int]] = []
+        key, starts = [], []
+        for question in multi:
+            correct = {_normalize(option) for option in question["answer"]}
+            options = list(dict.fromkeys(
+                [_normalize(option) for option in question.get("options", [])] + sorted(correct)
+            ))
+            starts.append(len(key))
+            self.multi_columns.append({option: len(key) + i for i, option in enumerate(options)})
+            key.extend(option in correct for option in options)
+        self.multi_key = np.array(key, dtype=bool)
+        self.multi_starts = np.array(starts, dtype=np.intp)
+        self.multi_correct = (
+            np.add.reduceat(self.multi_key.astype(np.int32), self.multi_starts)
+            if multi else np.zeros(0, dtype=np.int32)
+        )
+        self.multi_partial = np.array([bool(q.get("partial", False)) for q in multi])
+        self.multi_points = np.array([float(q.get("points", 1)) for q in multi])
+
+        # Numeric
+        self.numeric_ids = [str(q["id"]) for q in numeric]
+        self.numeric_key = np.array([_number(q["answer"]) for q in numeric])
+        self.numeric_tolerance = np.array([float(q.get("tolerance", 0)) for q in numeric])
+        self.numeric_points = np.array([float(q.get("points", 1)) for q in numeric])
+
+        self.total_points = float(
+            self.single_points.sum() + self.multi_points.sum() + self.numeric_points.sum()
+        )
+        if self.total_points <= 0:
+            self.error = "Quiz has no points to score"
+
+    def grade(self, answers_text: Optional[str]) -> QuizGrade:
+        return self.grade_batch([answers_text])[0]
+
+    def grade_batch(self, answers_texts: list[Optional[str]]) -> list[QuizGrade]:
+        """Grade many submissions of this quiz; results are in input order"""
+        if self.error:
+            return [QuizGrade(0.0, False, self.error)] * len(answers_texts)
+
+        n = len(answers_texts)
+        single = np.zeros((n, len(self.single_ids)), dtype=bool)
+        chosen = np.zeros((n, len(self.multi_key)), dtype=bool)
+        unknown_picks = np.zeros((n, len(self.multi_ids)), dtype=np.int32)
+        numeric = np.full((n, len(self.numeric_ids)), np.nan)
+        errors: list[Optional[str]] = [None] * n
+
+        for row, answers_text in enumerate(answers_texts):
+            answers = self._parse(answers_text)
+            if isinstance(answers, str):
+                errors[row] = answers
+                continue
+            for col, (question_id, key) in enumerate(zip(self.single_ids, self.single_keys)):
+                if question_id in answers:
+                    single[row, col] = _normalize(answers[question_id]) == key
+            for col, (question_id, columns) in enumerate(zip(self.multi_ids, self.multi_columns)):
+                picks = answers.get(question_id)
+                if picks is None:
+                    continue
+                for pick in set(map(_normalize, picks if isinstance(picks, list) else [picks])):
+                    column = columns.get(pick)
+                    if column is None:
+                        unknown_picks[row, col] += 1
+                    else:
+                        chosen[row, column] = True
+            for col, question_id in enumerate(self.numeric_ids):
+                if question_id in answers:
+                    numeric[row, col] = _number(answers[question_id])
+
+        earned = single.astype(float) @ self.single_points
+        if self.multi_ids:
+            right = np.add.reduceat((chosen & self.multi_key).astype(np.int32), self.multi_starts, axis=1)
+            wrong = np.add.reduceat((chosen & ~self.multi_key).astype(np.int32), self.multi_starts, axis=1)
+            wrong += unknown_picks
+            exact = (right == self.multi_correct) & (wrong == 0)
+            partial = np.clip((right - wrong) / self.multi_correct, 0.0, 1.0)
+            earned += np.where(self.multi_partial, partial, exact) @ self.multi_points
+        if self.numeric_ids:
+            with np.errstate(invalid="ignore"):
+                correct = np.abs(numeric - self.numeric_key) <= self.numeric_tolerance
+            earned += correct.astype(float) @ self.numeric_points
+
+        scores = earned / self.total_points
+        passed = scores >= self.pass_threshold
+        return [
+            QuizGrade(0.0, False, errors[row]) if errors[row]
+            else QuizGrade(float(scores[row]), bool(passed[row]),
+                           None if passed[row] else
+                           f"Score {scores[row]:.0%} is below the pass mark of {self.pass_threshold:.0%}")
+            for row in range(n)
+        ]
+
+    @staticmethod
+    def _parse(answers_text: Optional[str]) -> dict | str:
+        """Answers by question id, or an error message"""
+        if not answers_text:
+            return "Quiz answers are required"
+        try:
+            answers = json.loads(answers_text)
+        except ValueError:
+            return "Quiz answers must be JSON"
+        if not isinstance(answers, dict):
+            return "Quiz answers must be a JSON object of question id to answer"
+        return {str(question_id): answer for question_id, answer in answers.items()}
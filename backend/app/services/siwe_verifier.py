@@ -0,0 +1,31 @@
+"""SIWE message verification, run inside the auth worker pool
+
+Kept free of app imports so spawned pool processes start quickly.
+"""
+
+from typing import Optional, Tuple
+
+
+def warm_up() -> None:
+    """Pool initializer - import siwe before the first job arrives"""
+    import siwe  # noqa: F401
+
+
+def verify_siwe_message(
+    message: str, signature: str
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Parse a SIWE message and verify its signature (CPU-bound ecrecover).
+
+    Returns:
+        (nonce, address, error) - error is None on success
+    """
+    from siwe import SiweMessage
+
+    try:
+        siwe_message = SiweMessage.from_message(message=message)
+        siwe_message.verify(signature=signature)
+    except Exception as e:
+        return None, None, f"Signature verification failed: {str(e)}"
+
+    return siwe_message.nonce, siwe_message.address, None
@@ -1,27 +1,110 @@
 """Task service for task and submission management"""
 
+import asyncio
 from uuid import UUID
-from typing import Optional
-from datetime import datetime
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from typing import NamedTuple, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import Boolean, Integer, Text, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
 
-from app.models.task import Task, Submission, SubmissionStatus
+from app.core.config import settings
+from app.core.versions import bump_versions, read_versions
+from app.models.task import Task, Submission, SubmissionStatus, TaskType
 from app.models.user import User
 from app.schemas.task import TaskCreate, TaskUpdate, SubmissionCreate, SubmissionReview
-from app.services.xp_service import XPService
+from app.services.xp_service import XPGrantRow, XPService
 from app.services.verification_service import VerificationService
 
+# Seconds a scheduled worker run suppresses further scheduling for its type
+VERIFY_SCHEDULE_TTL = 60
+
+# One statement per verification batch; rows already reviewed are skipped
+_APPLY_VERIFICATION_SQL = text(
+    """
+    UPDATE submissions s
+    SET status = CASE WHEN v.approved THEN 'APPROVED'::submissionstatus ELSE s.status END,
+        xp_awarded = CASE WHEN v.approved THEN v.xp_reward ELSE s.xp_awarded END,
+        reviewed_at = CASE WHEN v.approved THEN :reviewed_at ELSE s.reviewed_at END,
+        feedback = v.feedback
+    FROM unnest(:ids, :approved, :xp_rewards, :feedback) AS v(id, approved, xp_reward, feedback)
+    WHERE s.id = v.id AND s.status = 'PENDING'
+    RETURNING s.id, s.user_id, s.task_id, v.approved, v.xp_reward
+    """
+).bindparams(
+    bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("approved", type_=ARRAY(Boolean)),
+    bindparam("xp_rewards", type_=ARRAY(Integer)),
+    bindparam("feedback", type_=ARRAY(Text)),
+)
+
+
+class VerificationBatchResult(NamedTuple):
+    """Outcome of one verification batch"""
+
+    popped: int
+    verified: int
+    approved: int
+
+
+def schedule_verification(task_type: str) -> None:
+    """Send a verification run for `task_type` to the Celery worker (blocking)"""
+    # Imported here: Celery stays out of the API's startup path
+    from app.workers.celery_app import celery_app
+
+    try:
+        celery_app.send_task("app.workers.verification.verify_submissions", args=[task_type])
+    except Exception as e:
+        # Broker or result backend unreachable; the periodic sweep drains the queue
+        print(f"Verification scheduling failed: {e}")
+
 
 class TaskService:
     """Service for managing tasks and submissions"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis_client: Optional[aioredis.Redis] = None):
         self.db = db
-        self.xp_service = XPService(db)
-        self.verification_service = VerificationService()
+        self.redis = redis_client
+        self.xp_service = XPService(db, redis_client)
+        self.verification_service = VerificationService(redis_client)
+
+    # ===== List Versions =====
+    # Counters bumped on every change to a course's tasks or a user's
+    # submissions; the course task list ETag is derived from them.
+
+    @staticmethod
+    def _tasks_version_key(course_id: UUID) -> str:
+        return f"tasks:version:{course_id}"
+
+    @staticmethod
+    def _submissions_version_key(user_id: UUID) -> str:
+        return f"submissions:version:{user_id}"
+
+    async def _bump_versions(self, *keys: str) -> None:
+        if self.redis is None:
+            return
+        try:
+            await bump_versions(self.redis, *keys)
+        except RedisError as e:
+            print(f"Task list version bump failed: {e}")
+
+    async def get_course_tasks_version(
+        self, course_id: UUID, user_id: UUID
+    ) -> Optional[list[str]]:
+        """Versions the user's view of a course task list derives from, None if unknown"""
+        if self.redis is None:
+            return None
+        try:
+            return await read_versions(
+                self.redis, self._tasks_version_key(course_id), self._submissions_version_key(user_id)
+            )
+        except RedisError as e:
+            print(f"Task list version lookup failed: {e}")
+            return None
 
     async def create_task(self, task_data: TaskCreate, user: User) -> Task:
         """Create a new task (instructor/admin only)"""
@@ -36,6 +119,7 @@ class TaskService:
         self.db.add(task)
         await self.db.commit()
         await self.db.refresh(task)
+        await self._bump_versions(self._tasks_version_key(task.course_id))
         return task
 
     async def get_task(self, task_id: UUID) -> Task:
@@ -81,6 +165,7 @@ class TaskService:
 
         await self.db.commit()
         await self.db.refresh(task)
+        await self._bump_versions(self._tasks_version_key(task.course_id))
         return task
 
     async def delete_task(self, task_id: UUID, user: User) -> None:
@@ -92,8 +177,10 @@ class TaskService:
             )
 
         task = await self.get_task(task_id)
+        course_id = task.course_id
         await self.db.delete(task)
         await self.db.commit()
+        await self._bump_versions(self._tasks_version_key(course_id))
 
     # ===== Submission Methods =====
 
@@ -126,6 +213,8 @@ class TaskService:
                 if value is not None:
                     setattr(existing, field, value)
             existing.status = SubmissionStatus.PENDING
+            existing.feedback = None
+            existing.submitted_at = datetime.utcnow()
             submission = existing
         else:
             # Create new submission
@@ -137,10 +226,11 @@ class TaskService:
         await self.db.commit()
         await self.db.refresh(submission)
 
-        # Auto-verify if enabled
-        if task.auto_verify:
-            await self._auto_verify_submission(submission, task)
+        # Verified asynchronously by the worker
+        if task.auto_verify and settings.ENABLE_AUTO_VERIFICATION:
+            await self._enqueue_verification([submission.id], task.task_type)
 
+        await self._bump_versions(self._submissions_version_key(user.id))
         return submission
 
     async def get_submission(self, submission_id: UUID) -> Submission:
@@ -202,11 +292,12 @@ class TaskService:
                 xp_amount=review_data.xp_awarded,
                 source_type="task_completion",
                 source_id=submission.task_id,
-                description=f"Completed task: {submission.task.title}",
+                reason=f"Completed task: {submission.task.title}",
             )
 
         await self.db.commit()
         await self.db.refresh(submission)
+        await self._bump_versions(self._submissions_version_key(submission.user_id))
         return submission
 
     async def get_pending_submissions(self, course_id: Optional[UUID] = None) -> list[Submission]:
@@ -224,36 +315,152 @@ class TaskService:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
-    # ===== Auto-Verification =====
+    async def count_pending_submissions(self) -> int:
+        """Number of submissions waiting for verification (partial index only)"""
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(Submission)
+            .where(Submission.status == SubmissionStatus.PENDING)
+        )
+        return result.scalar_one()
 
-    async def _auto_verify_submission(self, submission: Submission, task: Task) -> None:
-        """Auto-verify submission based on rules"""
+    # ===== Auto-Verification =====
+    # Auto-verified submissions are pushed onto a Redis list per task type
+    # after the submit commits; the Celery worker drains the lists in
+    # batches (app.workers.verification). Submissions missing from the
+    # lists (Redis outage, worker crash) are re-queued by a periodic sweep.
+
+    @staticmethod
+    def _verification_queue_key(task_type: TaskType) -> str:
+        return f"verify:queue:{task_type.name}"
+
+    @staticmethod
+    def _verification_scheduled_key(task_type: TaskType) -> str:
+        return f"verify:scheduled:{task_type.name}"
+
+    async def _enqueue_verification(self, submission_ids: list[UUID], task_type: TaskType) -> None:
+        """Queue submissions and make sure a worker run is scheduled for the type"""
+        if self.redis is None or not submission_ids:
+            return
         try:
-            is_valid, error_message = await self.verification_service.verify_submission(
-                submission, task
-            )
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(self._verification_queue_key(task_type), *map(str, submission_ids))
+                pipe.set(self._verification_scheduled_key(task_type), 1, nx=True, ex=VERIFY_SCHEDULE_TTL)
+                _, newly_scheduled = await pipe.execute()
+        except RedisError as e:
+            print(f"Verification enqueue failed (sweep will retry): {e}")
+            return
+
+        if newly_scheduled:
+            await asyncio.to_thread(schedule_verification, task_type.name)
+
+    async def clear_verification_schedule(self, task_types: list[TaskType]) -> None:
+        """Called by a starting worker run: later enqueues schedule a new run"""
+        await self.redis.delete(*(self._verification_scheduled_key(t) for t in task_types))
+
+    async def verification_queue_lengths(self) -> dict[str, int]:
+        """Queued submissions per task type, empty if Redis is unavailable"""
+        if self.redis is None:
+            return {}
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for task_type in TaskType:
+                    pipe.llen(self._verification_queue_key(task_type))
+                lengths = await pipe.execute()
+        except RedisError as e:
+            print(f"Verification queue length lookup failed: {e}")
+            return {}
+        return {task_type.name: length for task_type, length in zip(TaskType, lengths)}
+
+    async def verify_queued_submissions(
+        self, task_type: TaskType, batch_size: int
+    ) -> VerificationBatchResult:
+        """
+        Pop up to `batch_size` queued submissions of one type and verify them.
+
+        Outcomes are written with one UPDATE ... FROM unnest(...) for the
+        batch, which skips submissions no longer pending (reviewed in the
+        meantime). Approvals are then awarded through bulk_award_xp, whose
+        single commit also commits the UPDATE. Rejected submissions stay
+        pending for manual review with the reason in their feedback, except
+        retryable ones, which the stale sweep re-queues.
+        """
+        ids = await self.redis.lpop(self._verification_queue_key(task_type), batch_size)
+        if not ids:
+            return VerificationBatchResult(popped=0, verified=0, approved=0)
+
+        query = (
+            select(Submission, Task)
+            .join(Task, Submission.task_id == Task.id)
+            .where(Submission.id.in_([UUID(id_) for id_ in ids]))
+            .where(Submission.status == SubmissionStatus.PENDING)
+            .where(Task.auto_verify.is_(True))
+        )
+        if task_type == TaskType.TRANSACTION_PROOF:
+            # The sender must be the learner's wallet
+            query = query.options(joinedload(Submission.user).load_only(User.wallet_address))
+        result = await self.db.execute(query)
+        pairs = [tuple(row) for row in result.all()]
+        if not pairs:
+            return VerificationBatchResult(popped=len(ids), verified=0, approved=0)
+
+        outcomes = await self.verification_service.verify_batch(pairs)
+        result = await self.db.execute(
+            _APPLY_VERIFICATION_SQL,
+            {
+                "ids": [submission.id for submission, _ in pairs],
+                "approved": [outcome.is_valid for outcome in outcomes],
+                # Graded tasks (quizzes) earn XP in proportion to their score
+                "xp_rewards": [
+                    round(task.xp_reward * outcome.score) for (_, task), outcome in zip(pairs, outcomes)
+                ],
+                # Outcomes that may still change keep no feedback, so the
+                # stale sweep verifies them again
+                "feedback": [
+                    None if outcome.retry
+                    else f"Auto-verification failed: {outcome.error}" if not outcome.is_valid
+                    else f"Score: {outcome.score:.0%}" if outcome.score < 1
+                    else None
+                    for outcome in outcomes
+                ],
+                "reviewed_at": datetime.utcnow(),
+            },
+        )
+        applied = result.all()
+
+        grants = [
+            XPGrantRow(user_id, xp_reward, "task_completion", task_id, "Auto-verified task completion")
+            for _, user_id, task_id, approved, xp_reward in applied
+            if approved and xp_reward > 0
+        ]
+        if grants:
+            await self.xp_service.bulk_award_xp(grants, chunk_size=len(grants))
+        else:
+            await self.db.commit()
 
-            if is_valid:
-                await self._approve_submission(submission, task.xp_reward)
-            else:
-                # Store validation error in feedback
-                submission.feedback = f"Auto-verification failed: {error_message}"
-                await self.db.commit()
-
-        except Exception as e:
-            print(f"Auto-verification failed: {e}")
-            # Don't fail the submission, just leave it pending
-
-    async def _approve_submission(self, submission: Submission, xp_reward: int) -> None:
-        """Approve submission and award XP"""
-        submission.status = SubmissionStatus.APPROVED
-        submission.xp_awarded = xp_reward
-        submission.reviewed_at = datetime.utcnow()
+        await self._bump_versions(
+            *{self._submissions_version_key(user_id) for _, user_id, _, _, _ in applied}
+        )
+        return VerificationBatchResult(
+            popped=len(ids),
+            verified=len(applied),
+            approved=sum(1 for row in applied if row.approved),
+        )
 
-        await self.xp_service.award_xp(
-            user_id=submission.user_id,
-            xp_amount=xp_reward,
-            source_type="task_completion",
-            source_id=submission.task_id,
-            description="Auto-verified task completion",
+    async def requeue_stale_submissions(self, older_than: timedelta, limit: int = 10_000) -> int:
+        """Re-queue pending auto-verify submissions that were never verified"""
+        result = await self.db.execute(
+            select(Submission.id, Task.task_type)
+            .join(Task, Submission.task_id == Task.id)
+            .where(Submission.status == SubmissionStatus.PENDING)
+            .where(Submission.feedback.is_(None))
+            .where(Submission.created_at < datetime.utcnow() - older_than)
+            .where(Task.auto_verify.is_(True))
+            .limit(limit)
         )
+        by_type: dict[TaskType, list[UUID]] = {}
+        for submission_id, task_type in result.all():
+            by_type.setdefault(task_type, []).append(submission_id)
+        for task_type, submission_ids in by_type.items():
+            await self._enqueue_verification(submission_ids, task_type)
+        return sum(len(submission_ids) for submission_ids in by_type.values())
@@ -2,18 +2,22 @@
 
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
 from uuid import UUID
+import redis.asyncio as aioredis
 
-from app.models.user import User
+from app.core.user_cache import user_cache
+from app.models.user import User, UserRole
 from app.schemas.user import UserUpdate
+from app.services.leaderboard_service import LeaderboardService
 
 
 class UserService:
     """User management service"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis_client: Optional[aioredis.Redis] = None):
         self.db = db
+        self.redis = redis_client
 
     async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID"""
@@ -41,6 +45,25 @@ class UserService:
 
         await self.db.commit()
         await self.db.refresh(user)
+        await user_cache.invalidate([user.id], self.redis)
+
+        # Keep the leaderboard's cached public profile in sync
+        if self.redis:
+            await LeaderboardService(self.redis).update_profile(user)
+
+        return user
+
+    async def set_role(self, user_id: UUID, role: UserRole) -> User:
+        """Change a user's role (admin only)"""
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        user.role = role
+
+        await self.db.commit()
+        await self.db.refresh(user)
+        await user_cache.invalidate([user.id], self.redis)
         return user
 
     async def get_user_xp_history(self, user_id: UUID, limit: int = 50):
@@ -64,23 +87,16 @@ class UserService:
         )
         return result.scalars().all()
 
-    async def get_leaderboard(
-        self, limit: int = 100, offset: int = 0, time_period: str = "all_time"
-    ):
-        """Get leaderboard rankings"""
-        # All-time leaderboard
-        query = select(User).order_by(desc(User.xp_total)).limit(limit).offset(offset)
-
-        result = await self.db.execute(query)
-        users = result.scalars().all()
-
-        # Add rankings
-        leaderboard = []
-        for idx, user in enumerate(users, start=offset + 1):
-            leaderboard.append({
-                "rank": idx,
-                "user": user,
-                "xp_total": user.xp_total,
-            })
-
-        return leaderboard
+    async def get_user_badges_version(self, user_id: UUID) -> tuple:
+        """Cheap fingerprint of a user's badges (one aggregate, no rows loaded)"""
+        from app.models.badge import UserBadge
+
+        result = await self.db.execute(
+            select(
+                func.count(),
+                func.max(UserBadge.earned_at),
+                func.count(UserBadge.nft_tx_hash),
+                func.count(UserBadge.ipfs_metadata_uri),
+            ).where(UserBadge.user_id == user_id)
+        )
+        return tuple(result.one())
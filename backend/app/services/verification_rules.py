@@ -0,0 +1,90 @@
+"""Compiled verification rules
+
+A task's `verification_rules` JSON is turned into an executable
+validator once and cached per worker under (task_id, updated_at), so
+editing a task invalidates its entry and unchanged tasks are never
+re-interpreted.
+
+Text rules:
+    min_length:          minimum characters
+    required_keywords:   all must occur
+    forbidden_keywords:  none may occur
+    word_boundary:       keywords must be whole words (default false)
+    case_sensitive:      exact case instead of Unicode case folding (default false)
+
+Quiz rules are described in app.services.quiz_grader, which is
+imported on first use to keep NumPy out of the API process until a quiz
+is graded.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from app.core.cache import TTLCache
+from app.models.task import Task
+from app.services.keyword_matcher import KeywordMatcher
+
+if TYPE_CHECKING:
+    from app.services.quiz_grader import CompiledQuiz
+
+# Compiled validators per worker; stale versions age out of the LRU
+_compiled_rules = TTLCache(max_size=2048)
+
+
+class TextRules:
+    """Text submission validator compiled from a task's rules"""
+
+    def __init__(self, rules: dict):
+        self.min_length = rules.get("min_length", 0)
+        self.required = list(rules.get("required_keywords", []))
+        self.forbidden = list(rules.get("forbidden_keywords", []))
+        # One automaton for both lists: forbidden keyword i is index len(required) + i
+        self.matcher = KeywordMatcher(
+            self.required + self.forbidden,
+            case_sensitive=bool(rules.get("case_sensitive", False)),
+            word_boundary=bool(rules.get("word_boundary", False)),
+        )
+
+    def validate(self, text: Optional[str]) -> tuple[bool, Optional[str]]:
+        """(is_valid, error_message)"""
+        if not text:
+            return False, "Text submission is required"
+
+        if len(text) < self.min_length:
+            return False, f"Text must be at least {self.min_length} characters"
+
+        if not self.required and not self.forbidden:
+            return True, None
+
+        found = self.matcher.find(text)
+        missing = [kw for i, kw in enumerate(self.required) if i not in found]
+        if missing:
+            return False, f"Missing required keywords: {', '.join(missing)}"
+
+        offset = len(self.required)
+        present = [kw for i, kw in enumerate(self.forbidden) if offset + i in found]
+        if present:
+            return False, f"Contains forbidden keywords: {', '.join(present)}"
+
+        return True, None
+
+
+def compiled_text_rules(task: Task) -> TextRules:
+    """Compiled text rules of `task`, from the cache when the task is unchanged"""
+    key = ("text", task.id, task.updated_at)
+    rules = _compiled_rules.get(key)
+    if rules is None:
+        rules = TextRules(task.verification_rules or {})
+        _compiled_rules.set(key, rules)
+    return rules
+
+
+def compiled_quiz(task: Task) -> "CompiledQuiz":
+    """Compiled answer key of `task`, from the cache when the task is unchanged"""
+    from app.services.quiz_grader import CompiledQuiz
+
+    key = ("quiz", task.id, task.updated_at)
+    quiz = _compiled_rules.get(key)
+    if quiz is None:
+        quiz = CompiledQuiz(task.verification_rules or {})
+        _compiled_rules.set(key, quiz)
+    return quiz
@@ -1,137 +1,142 @@
 """Verification service for auto-verifying task submissions"""
 
-from typing import Optional
+from typing import NamedTuple, Optional
+import redis.asyncio as aioredis
+from app.core.config import settings
 from app.models.task import Task, Submission, TaskType
+from app.services.verification_rules import compiled_quiz, compiled_text_rules
+
+
+class VerificationResult(NamedTuple):
+    """
+    Outcome of one verification; `score` (0-1) scales the XP reward.
+
+    `retry` marks a rejection that may change (transaction not mined or
+    confirmed yet, RPC down): the submission is verified again later.
+    """
+
+    is_valid: bool
+    error: Optional[str]
+    score: float = 1.0
+    retry: bool = False
 
 
 class VerificationService:
     """Service for auto-verifying task submissions"""
 
-    def __init__(self):
-        pass
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None):
+        self.redis = redis_client
 
-    async def verify_submission(self, submission: Submission, task: Task) -> tuple[bool, Optional[str]]:
+    async def verify_submission(self, submission: Submission, task: Task) -> VerificationResult:
         """
         Verify submission based on task type and rules.
 
         Returns:
-            (is_valid, error_message)
+            VerificationResult(is_valid, error_message, score, retry)
         """
         rules = task.verification_rules or {}
 
         try:
             if task.task_type == TaskType.TRANSACTION_PROOF:
-                return await self._verify_transaction(submission, rules)
+                return (await self._verify_transactions([(submission, task)]))[0]
 
             elif task.task_type == TaskType.LINK_SUBMISSION:
-                return await self._verify_link(submission, rules)
+                return (await self._verify_links([(submission, task)]))[0]
 
             elif task.task_type == TaskType.TEXT_SUBMISSION:
-                return await self._verify_text(submission, rules)
+                return VerificationResult(*await self._verify_text(submission, task))
 
             elif task.task_type == TaskType.QUIZ:
-                return await self._verify_quiz(submission, rules)
+                return (await self._verify_quizzes([(submission, task)]))[0]
 
             elif task.task_type == TaskType.FILE_UPLOAD:
-                return await self._verify_file(submission, rules)
+                return VerificationResult(*await self._verify_file(submission, rules))
 
-            return False, "Unsupported task type for auto-verification"
+            return VerificationResult(False, "Unsupported task type for auto-verification")
 
         except Exception as e:
-            return False, f"Verification failed: {str(e)}"
-
-    async def _verify_transaction(self, submission: Submission, rules: dict) -> tuple[bool, Optional[str]]:
-        """Verify blockchain transaction"""
-        if not submission.transaction_hash:
-            return False, "Transaction hash is required"
-
-        # Check format
-        if not submission.transaction_hash.startswith("0x"):
-            return False, "Invalid transaction hash format"
-
-        if len(submission.transaction_hash) != 66:
-            return False, "Invalid transaction hash length"
-
-        # Check required chain if specified
-        required_chain = rules.get("chain_id")
-        if required_chain:
-            # TODO: Verify transaction on specific chain
-            pass
-
-        # Check minimum value if specified
-        min_value = rules.get("min_value")
-        if min_value:
-            # TODO: Verify transaction value
-            pass
-
-        return True, None
-
-    async def _verify_link(self, submission: Submission, rules: dict) -> tuple[bool, Optional[str]]:
-        """Verify submitted link"""
-        if not submission.links or len(submission.links) == 0:
-            return False, "At least one link is required"
+            return VerificationResult(False, f"Verification failed: {str(e)}")
 
-        # Check required domain
-        required_domain = rules.get("required_domain")
-        if required_domain:
-            has_domain = any(required_domain in link for link in submission.links)
-            if not has_domain:
-                return False, f"Link must be from domain: {required_domain}"
-
-        # Check URL format
-        for link in submission.links:
-            if not link.startswith(("http://", "https://")):
-                return False, f"Invalid URL format: {link}"
-
-        return True, None
-
-    async def _verify_text(self, submission: Submission, rules: dict) -> tuple[bool, Optional[str]]:
-        """Verify text submission contains required keywords"""
-        if not submission.submission_text:
-            return False, "Text submission is required"
-
-        text_lower = submission.submission_text.lower()
-
-        # Check minimum length
-        min_length = rules.get("min_length", 0)
-        if len(submission.submission_text) < min_length:
-            return False, f"Text must be at least {min_length} characters"
-
-        # Check required keywords
-        required_keywords = rules.get("required_keywords", [])
-        if required_keywords:
-            missing_keywords = [
-                kw for kw in required_keywords if kw.lower() not in text_lower
-            ]
-            if missing_keywords:
-                return False, f"Missing required keywords: {', '.join(missing_keywords)}"
-
-        # Check forbidden keywords
-        forbidden_keywords = rules.get("forbidden_keywords", [])
-        if forbidden_keywords:
-            found_forbidden = [
-                kw for kw in forbidden_keywords if kw.lower() in text_lower
-            ]
-            if found_forbidden:
-                return False, f"Contains forbidden keywords: {', '.join(found_forbidden)}"
-
-        return True, None
-
-    async def _verify_quiz(self, submission: Submission, rules: dict) -> tuple[bool, Optional[str]]:
-        """Verify quiz answers"""
-        if not submission.submission_text:
-            return False, "Quiz answers are required"
-
-        # TODO: Implement proper quiz verification
-        # Expected format: JSON with question_id: answer pairs
-        # Compare with correct_answers in rules
-
-        correct_answers = rules.get("correct_answers", {})
-        if not correct_answers:
-            return False, "Quiz has no correct answers configured"
+    async def verify_batch(self, items: list[tuple[Submission, Task]]) -> list[VerificationResult]:
+        """
+        Verify a batch of (submission, task) pairs of one task type, in order.
 
-        # For now, just check that submission is not empty
-        return True, None
+        Quizzes are graded together, one NumPy batch per task, transaction
+        proofs are looked up with one round of JSON-RPC batch requests per
+        chain, and all links of the batch are probed concurrently.
+        """
+        batch_verifiers = {
+            TaskType.QUIZ: self._verify_quizzes,
+            TaskType.TRANSACTION_PROOF: self._verify_transactions,
+            TaskType.LINK_SUBMISSION: self._verify_links,
+        }
+        task_types = {task.task_type for _, task in items}
+        verify = batch_verifiers.get(task_types.pop()) if len(task_types) == 1 else None
+        if verify:
+            try:
+                return await verify(items)
+            except Exception as e:
+                return [VerificationResult(False, f"Verification failed: {str(e)}")] * len(items)
+        return [await self.verify_submission(submission, task) for submission, task in items]
+
+    async def _verify_transactions(self, items: list[tuple[Submission, Task]]) -> list[VerificationResult]:
+        """Verify transaction proofs on chain (submission.user must be loaded)"""
+        # Imported here: httpx stays out of the API's startup path
+        from app.services.chain_verifier import ChainVerifier
+
+        return await ChainVerifier(self.redis).verify_batch(items)
+
+    async def _verify_links(self, items: list[tuple[Submission, Task]]) -> list[VerificationResult]:
+        """Check link format and domain, then probe every link of the batch under one deadline"""
+        # Imported here: httpx stays out of the API's startup path
+        from app.services.link_checker import LinkChecker, link_rule_error
+
+        results: list[Optional[VerificationResult]] = [None] * len(items)
+        probing = []
+        for position, (submission, task) in enumerate(items):
+            error = link_rule_error(submission.links, (task.verification_rules or {}).get("required_domain"))
+            if error:
+                results[position] = VerificationResult(False, error)
+            elif settings.LINK_CHECK_ENABLED:
+                probing.append(position)
+            else:
+                results[position] = VerificationResult(True, None)
+
+        if probing:
+            statuses = await LinkChecker().check_many(
+                [link for position in probing for link in items[position][0].links],
+                settings.LINK_CHECK_DEADLINE,
+            )
+            for position in probing:
+                results[position] = VerificationResult(True, None)
+                for link in items[position][0].links:
+                    status = statuses.get(link)
+                    if status is None:
+                        results[position] = VerificationResult(False, "Link check timed out", retry=True)
+                        break
+                    if not status.alive:
+                        results[position] = VerificationResult(False, f"Link is not reachable: {link}")
+                        break
+        return results
+
+    async def _verify_text(self, submission: Submission, task: Task) -> tuple[bool, Optional[str]]:
+        """Verify text submission against the task's compiled keyword rules"""
+        return compiled_text_rules(task).validate(submission.submission_text)
+
+    async def _verify_quizzes(self, items: list[tuple[Submission, Task]]) -> list[VerificationResult]:
+        """Grade quiz answers against each task's compiled answer key"""
+        by_task: dict = {}
+        for position, (submission, task) in enumerate(items):
+            by_task.setdefault(task.id, (task, []))[1].append(position)
+
+        results: list[Optional[VerificationResult]] = [None] * len(items)
+        for task, positions in by_task.values():
+            grades = compiled_quiz(task).grade_batch(
+                [items[position][0].submission_text for position in positions]
+            )
+            for position, grade in zip(positions, grades):
+                results[position] = VerificationResult(grade.passed, grade.error, grade.score)
+        return results
 
     async def _verify_file(self, submission: Submission, rules: dict) -> tuple[bool, Optional[str]]:
         """Verify file upload"""
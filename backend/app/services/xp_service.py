@@ -1,30 +1,159 @@
 """XP Service - manages XP awarding and tracking"""
 
+from typing import Awaitable, Callable, Iterable, NamedTuple, Optional
+from sqlalchemy import String, Integer, bindparam, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from datetime import datetime
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
 
-from app.models.xp import XPLedger
+from app.core import metrics
+from app.core.user_cache import user_cache
 from app.models.user import User
+from app.services.leaderboard_service import LeaderboardService
+
+
+class XPAward(NamedTuple):
+    """Result of a single XP award (plain row, no ORM instance)"""
+
+    ledger_id: int
+    user_id: UUID
+    xp_change: int
+    balance_after: int
+
+
+class XPGrantRow(NamedTuple):
+    """One row of a bulk XP grant"""
+
+    user_id: UUID
+    amount: int
+    source_type: str
+    source_id: Optional[UUID] = None
+    reason: Optional[str] = None
+
+
+class BulkXPGrantProgress(NamedTuple):
+    """Progress snapshot emitted after every committed chunk"""
+
+    chunk: int
+    processed: int
+    total: int
+    awarded: int
+    skipped: int
+
+
+class BulkXPGrantResult(NamedTuple):
+    """Summary of a bulk XP grant"""
+
+    requested: int
+    awarded: int
+    skipped: int
+    xp_awarded: int
+    chunks: int
+
+
+ProgressCallback = Callable[[BulkXPGrantProgress], Awaitable[None] | None]
+
+
+# One statement per chunk: lock the users' rows, insert the ledger rows
+# not already present for (source_type, source_id, user_id) with
+# balance_after = locked balance plus a running sum in input order, then
+# apply per-user deltas of the rows the insert returned with a single
+# set-based UPDATE. Rows without a source_id are never duplicates. The
+# NOT EXISTS pre-filter keeps the running sums to rows that will be
+# inserted; ON CONFLICT against the unique partial index uq_xp_ledger_source
+# is what guarantees a row (and its XP) is applied at most once, even when
+# a concurrent grant inserted it after this statement's snapshot.
+_GRANT_SQL = text(
+    """
+    WITH grants AS (
+        SELECT g.user_id, g.xp_change, g.source_type, g.source_id, g.reason, g.ord
+        FROM unnest(:user_ids, :amounts, :source_types, :source_ids, :reasons)
+             WITH ORDINALITY AS g(user_id, xp_change, source_type, source_id, reason, ord)
+    ),
+    fresh AS (
+        SELECT g.* FROM grants g
+        WHERE NOT EXISTS (
+            SELECT 1 FROM xp_ledger l
+            WHERE l.source_type = g.source_type
+              AND l.source_id = g.source_id
+              AND l.user_id = g.user_id
+        )
+    ),
+    locked AS (
+        SELECT u.id, u.xp_total FROM users u
+        WHERE u.id IN (SELECT user_id FROM fresh)
+        ORDER BY u.id
+        FOR UPDATE
+    ),
+    inserted AS (
+        INSERT INTO xp_ledger (user_id, source_type, source_id, xp_change, balance_after, reason, created_at)
+        SELECT f.user_id, f.source_type, f.source_id, f.xp_change,
+               lk.xp_total + sum(f.xp_change) OVER (PARTITION BY f.user_id ORDER BY f.ord),
+               f.reason, :created_at
+        FROM fresh f
+        JOIN locked lk ON lk.id = f.user_id
+        ORDER BY f.ord
+        ON CONFLICT (source_type, source_id, user_id) WHERE source_id IS NOT NULL DO NOTHING
+        RETURNING id, user_id, xp_change, balance_after
+    ),
+    deltas AS (
+        SELECT user_id, sum(xp_change)::integer AS delta FROM inserted GROUP BY user_id
+    ),
+    updated AS (
+        UPDATE users u
+        SET xp_total = u.xp_total + d.delta
+        FROM deltas d
+        WHERE u.id = d.user_id
+    )
+    SELECT id, user_id, xp_change, balance_after FROM inserted ORDER BY id
+    """
+).bindparams(
+    bindparam("user_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("amounts", type_=ARRAY(Integer)),
+    bindparam("source_types", type_=ARRAY(String)),
+    bindparam("source_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("reasons", type_=ARRAY(String)),
+)
+
+
+def _grant_params(rows: list[XPGrantRow]) -> dict:
+    return {
+        "user_ids": [row.user_id for row in rows],
+        "amounts": [row.amount for row in rows],
+        "source_types": [row.source_type for row in rows],
+        "source_ids": [row.source_id for row in rows],
+        "reasons": [row.reason for row in rows],
+        "created_at": datetime.utcnow(),
+    }
 
 
 class XPService:
     """XP management service"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis_client: Optional[aioredis.Redis] = None):
         self.db = db
+        self.redis = redis_client
+        self.leaderboard = LeaderboardService(redis_client) if redis_client else None
 
     async def award_xp(
         self,
         user_id: UUID,
         xp_amount: int,
         source_type: str,
-        source_id: UUID = None,
-        reason: str = None,
-    ) -> XPLedger:
+        source_id: Optional[UUID] = None,
+        reason: Optional[str] = None,
+    ) -> Optional[XPAward]:
         """
         Award XP to a user and create ledger entry.
 
+        Runs the bulk grant statement for one row: the user's row is locked,
+        the ledger row inserted and the balance updated from what the insert
+        returned, so concurrent awards for the same user serialize on the
+        row lock instead of overwriting each other's totals.
+
         Args:
             user_id: User receiving XP
             xp_amount: Amount of XP to award
@@ -33,46 +162,43 @@ class XPService:
             reason: Optional reason for XP award
 
         Returns:
-            XP ledger entry
+            XP award row (ledger id and new balance), or None when the user
+            already has a ledger entry for this source_type and source_id
         """
-        # Get user and current XP
-        from sqlalchemy import select
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-
-        if not user:
-            raise ValueError("User not found")
+        grant = XPGrantRow(user_id, xp_amount, source_type, source_id, reason)
+        result = await self.db.execute(_GRANT_SQL, _grant_params([grant]))
+        row = result.one_or_none()
 
-        # Calculate new balance
-        new_balance = user.xp_total + xp_amount
-
-        # Create ledger entry
-        ledger_entry = XPLedger(
-            user_id=user_id,
-            source_type=source_type,
-            source_id=source_id,
-            xp_change=xp_amount,
-            balance_after=new_balance,
-            reason=reason,
-        )
-        self.db.add(ledger_entry)
-
-        # Update user's total XP
-        user.xp_total = new_balance
+        if row is None:
+            if await self.db.scalar(select(User.id).where(User.id == user_id)) is None:
+                raise ValueError("User not found")
+            await self.db.commit()
+            return None
 
         await self.db.commit()
-        await self.db.refresh(ledger_entry)
+        award = XPAward(*row)
+        metrics.record_xp_awards("single", [award.xp_change])
+        await user_cache.invalidate([award.user_id], self.redis)
+
+        if self.leaderboard is not None:
+            try:
+                await self.leaderboard.record_award(
+                    award.user_id, award.xp_change, award.balance_after
+                )
+            except RedisError as e:
+                # The scheduled rebuild repairs missed leaderboard updates
+                print(f"Leaderboard update failed: {e}")
 
-        return ledger_entry
+        return award
 
     async def deduct_xp(
         self,
         user_id: UUID,
         xp_amount: int,
         source_type: str,
-        source_id: UUID = None,
-        reason: str = None,
-    ) -> XPLedger:
+        source_id: Optional[UUID] = None,
+        reason: Optional[str] = None,
+    ) -> Optional[XPAward]:
         """Deduct XP from a user (admin only)"""
         return await self.award_xp(
             user_id=user_id,
@@ -81,3 +207,84 @@ class XPService:
             source_id=source_id,
             reason=reason,
         )
+
+    async def bulk_award_xp(
+        self,
+        grants: Iterable[XPGrantRow],
+        chunk_size: int = 1000,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> BulkXPGrantResult:
+        """
+        Award XP to many users (campaigns, bounty payouts).
+
+        Rows are sent in chunks; each chunk is one multi-row statement plus
+        one commit, so a partially applied grant can simply be re-run.
+        Rows whose (source_type, source_id, user_id) already exists in the
+        ledger, repeats within the input and rows for unknown users are
+        skipped. Idempotency therefore requires a source_id (campaign or
+        bounty id).
+
+        Args:
+            grants: Grant rows
+            chunk_size: Rows per statement/commit
+            on_progress: Optional (sync or async) callback called after each chunk
+
+        Returns:
+            Summary of awarded and skipped rows
+        """
+        rows: list[XPGrantRow] = []
+        seen: set[tuple] = set()
+        requested = 0
+        for grant in grants:
+            requested += 1
+            if grant.source_id is not None:
+                key = (grant.source_type, grant.source_id, grant.user_id)
+                if key in seen:
+                    continue
+                seen.add(key)
+            rows.append(grant)
+
+        awarded = 0
+        xp_awarded = 0
+        chunks = 0
+        processed = requested - len(rows)
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            result = await self.db.execute(_GRANT_SQL, _grant_params(chunk))
+            changes = [(user_id, xp_change) for _, user_id, xp_change, _ in result.all()]
+            await self.db.commit()
+            metrics.record_xp_awards("bulk", [xp_change for _, xp_change in changes])
+            await user_cache.invalidate({user_id for user_id, _ in changes}, self.redis)
+
+            chunks += 1
+            processed += len(chunk)
+            awarded += len(changes)
+            xp_awarded += sum(xp_change for _, xp_change in changes)
+
+            if self.leaderboard is not None:
+                try:
+                    await self.leaderboard.record_awards(changes)
+                except RedisError as e:
+                    print(f"Leaderboard update failed: {e}")
+
+            if on_progress is not None:
+                outcome = on_progress(
+                    BulkXPGrantProgress(
+                        chunk=chunks,
+                        processed=processed,
+                        total=requested,
+                        awarded=awarded,
+                        skipped=processed - awarded,
+                    )
+                )
+                if outcome is not None:
+                    await outcome
+
+        return BulkXPGrantResult(
+            requested=requested,
+            awarded=awarded,
+            skipped=requested - awarded,
+            xp_awarded=xp_awarded,
+            chunks=chunks,
+        )
@@ -0,0 +1 @@
+"""Celery background workers"""
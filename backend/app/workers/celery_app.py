@@ -0,0 +1,80 @@
+"""Celery application and helpers for running async service code in workers"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, TypeVar
+
+from celery import Celery
+from celery.schedules import crontab
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.http_client import close_http_client
+
+T = TypeVar("T")
+
+celery_app = Celery(
+    "learnfi",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.workers.leaderboard", "app.workers.verification"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="UTC",
+    enable_utc=True,
+)
+
+celery_app.conf.beat_schedule = {
+    # Pick up auto-verify submissions that never reached the queue
+    "requeue-stale-submissions": {
+        "task": "app.workers.verification.requeue_stale_submissions",
+        "schedule": 60.0,
+    },
+    # Repair drift in the live windows
+    "rebuild-leaderboards-hourly": {
+        "task": "app.workers.leaderboard.rebuild_leaderboards",
+        "schedule": crontab(minute=5),
+    },
+    # Seed the new windows right after they roll over
+    "rebuild-weekly-leaderboard-on-rollover": {
+        "task": "app.workers.leaderboard.rebuild_leaderboards",
+        "schedule": crontab(minute=0, hour=0, day_of_week="mon"),
+        "args": (["weekly"],),
+    },
+    "rebuild-monthly-leaderboard-on-rollover": {
+        "task": "app.workers.leaderboard.rebuild_leaderboards",
+        "schedule": crontab(minute=0, hour=0, day_of_month=1),
+        "args": (["monthly"],),
+    },
+}
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion from a synchronous Celery task"""
+    return asyncio.run(coro)
+
+
+@asynccontextmanager
+async def worker_resources() -> AsyncIterator[tuple[AsyncSession, aioredis.Redis]]:
+    """
+    Database session and Redis client scoped to one task run.
+
+    Each `asyncio.run` gets a fresh event loop, so connections (including
+    the shared outbound HTTP client) are not pooled across runs.
+    """
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    redis_client = aioredis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    try:
+        async with session_factory() as session:
+            yield session, redis_client
+    finally:
+        await close_http_client()
+        await redis_client.aclose()
+        await engine.dispose()
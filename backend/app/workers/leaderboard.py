@@ -0,0 +1,18 @@
+"""Leaderboard maintenance tasks"""
+
+from typing import Optional
+
+from app.services.leaderboard_service import LeaderboardService, PERIODS
+from app.workers.celery_app import celery_app, run_async, worker_resources
+
+
+async def _rebuild(periods: list[str]) -> dict[str, Optional[int]]:
+    async with worker_resources() as (db, redis_client):
+        service = LeaderboardService(redis_client, db)
+        return {period: await service.rebuild(period) for period in periods}
+
+
+@celery_app.task(name="app.workers.leaderboard.rebuild_leaderboards")
+def rebuild_leaderboards(periods: Optional[list[str]] = None) -> dict[str, Optional[int]]:
+    """Rebuild leaderboard windows from Postgres (defaults to all of them; None if skipped)"""
+    return run_async(_rebuild(periods or list(PERIODS)))
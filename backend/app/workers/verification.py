@@ -0,0 +1,47 @@
+"""Submission auto-verification tasks"""
+
+from datetime import timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.models.task import TaskType
+from app.services.task_service import TaskService
+from app.workers.celery_app import celery_app, run_async, worker_resources
+
+
+async def _drain(service: TaskService, task_type: TaskType) -> dict[str, int]:
+    totals = {"verified": 0, "approved": 0, "batches": 0}
+    while True:
+        batch = await service.verify_queued_submissions(task_type, settings.VERIFICATION_BATCH_SIZE)
+        if batch.popped == 0:
+            return totals
+        totals["verified"] += batch.verified
+        totals["approved"] += batch.approved
+        totals["batches"] += 1
+
+
+async def _verify(task_types: list[TaskType]) -> dict[str, dict[str, int]]:
+    async with worker_resources() as (db, redis_client):
+        service = TaskService(db, redis_client)
+        await service.clear_verification_schedule(task_types)
+        return {task_type.name: await _drain(service, task_type) for task_type in task_types}
+
+
+async def _sweep(older_than: timedelta) -> int:
+    async with worker_resources() as (db, redis_client):
+        return await TaskService(db, redis_client).requeue_stale_submissions(older_than)
+
+
+@celery_app.task(name="app.workers.verification.verify_submissions")
+def verify_submissions(task_type: Optional[str] = None) -> dict[str, dict[str, int]]:
+    """Drain the verification queue of one task type (defaults to all of them)"""
+    task_types = [TaskType[task_type]] if task_type else list(TaskType)
+    return run_async(_verify(task_types))
+
+
+@celery_app.task(name="app.workers.verification.requeue_stale_submissions")
+def requeue_stale_submissions() -> int:
+    """Re-queue auto-verify submissions left pending, then drain all queues"""
+    requeued = run_async(_sweep(timedelta(seconds=settings.VERIFICATION_STALE_SECONDS)))
+    verify_submissions.delay()
+    return requeued
@@ -0,0 +1 @@
+"""Performance benchmarks (run against a live database/Redis)"""
@@ -0,0 +1,90 @@
+"""Benchmark - unrelated endpoint latency while /auth/verify is saturated
+
+Runs against a live server. A probe client hits a cheap endpoint (default
+/health) at a fixed interval, first on an idle server and then while
+`--clients` concurrent clients hammer /auth/nonce + /auth/verify with
+freshly signed SIWE messages. Reports probe p50/p99 for both phases, plus
+verify throughput and the number of fast 503 rejections.
+
+Requires eth-account (already a backend dependency).
+
+Usage:
+    python -m benchmarks.bench_auth_verify_load --base-url http://localhost:8000 --clients 64
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(int(len(ordered) * pct) - 1, 0)]
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login_loop(client: httpx.AsyncClient, api: str, stop: asyncio.Event, counts: dict) -> None:
+    account = Account.create()
+    while not stop.is_set():
+        nonce = await client.post(f"{api}/auth/nonce", json={"address": account.address})
+        message = nonce.json()["message"]
+        signature = account.sign_message(encode_defunct(text=message)).signature.hex()
+        if not signature.startswith("0x"):
+            signature = "0x" + signature
+        response = await client.post(
+            f"{api}/auth/verify",
+            json={"address": account.address, "signature": signature, "message": message},
+        )
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+
+async def run_phase(base_url: str, api: str, probe_path: str, clients: int, duration: float) -> tuple[list[float], dict]:
+    stop = asyncio.Event()
+    counts: dict[int, int] = {}
+    limits = httpx.Limits(max_connections=clients + 4)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        probe_task = asyncio.create_task(probe(client, probe_path, stop, 0.01))
+        loaders = [asyncio.create_task(login_loop(client, api, stop, counts)) for _ in range(clients)]
+        await asyncio.sleep(duration)
+        stop.set()
+        latencies = await probe_task
+        await asyncio.gather(*loaders, return_exceptions=True)
+    return latencies, counts
+
+
+async def main(base_url: str, api: str, probe_path: str, clients: int, duration: float) -> None:
+    idle, _ = await run_phase(base_url, api, probe_path, 0, duration)
+    loaded, counts = await run_phase(base_url, api, probe_path, clients, duration)
+
+    print(f"probe {probe_path}")
+    print(f"  idle     p50 {statistics.median(idle):8.2f} ms   p99 {percentile(idle, 0.99):8.2f} ms")
+    print(f"  loaded   p50 {statistics.median(loaded):8.2f} ms   p99 {percentile(loaded, 0.99):8.2f} ms")
+    print(f"/auth/verify over {duration:.0f}s with {clients} clients")
+    print(f"  200/s    {counts.get(200, 0) / duration:8.1f}")
+    print(f"  503s     {counts.get(503, 0)}")
+    print(f"  other    { {k: v for k, v in counts.items() if k not in (200, 503)} }")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.api_prefix, args.probe_path, args.clients, args.duration))
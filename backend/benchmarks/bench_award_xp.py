@@ -0,0 +1,96 @@
+"""Benchmark - XPService.award_xp throughput under concurrent approvals
+
+Measures awards/sec for two workloads against the configured DATABASE_URL:
+
+- same_user: every concurrent award targets one learner (row-lock contention)
+- many_users: awards are spread over distinct learners
+
+Usage:
+    python -m benchmarks.bench_award_xp --awards 5000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete, select
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.user import User
+from app.models.xp import XPLedger
+from app.services.xp_service import XPService
+
+SOURCE_TYPE = "benchmark"
+
+
+async def create_users(count: int) -> list[uuid.UUID]:
+    """Create throwaway benchmark users"""
+    async with AsyncSessionLocal() as session:
+        users = [User(wallet_address=f"0x{uuid.uuid4().hex:0>40}") for _ in range(count)]
+        session.add_all(users)
+        await session.commit()
+        return [user.id for user in users]
+
+
+async def cleanup(user_ids: list[uuid.UUID]) -> None:
+    """Remove benchmark users and their ledger rows"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(XPLedger).where(XPLedger.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+async def run_awards(user_ids: list[uuid.UUID], awards: int, concurrency: int) -> float:
+    """Run `awards` award_xp calls with `concurrency` workers, return awards/sec"""
+    queue: asyncio.Queue[uuid.UUID] = asyncio.Queue()
+    for i in range(awards):
+        queue.put_nowait(user_ids[i % len(user_ids)])
+
+    async def worker() -> None:
+        async with AsyncSessionLocal() as session:
+            service = XPService(session)
+            while True:
+                try:
+                    user_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await service.award_xp(user_id, 1, SOURCE_TYPE, reason="benchmark award")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return awards / (time.perf_counter() - start)
+
+
+async def verify_totals(user_ids: list[uuid.UUID], expected_total: int) -> None:
+    """Check that no award was lost"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(User.xp_total).where(User.id.in_(user_ids)))
+        actual = sum(result.scalars().all())
+    if actual != expected_total:
+        raise SystemExit(f"Lost updates: expected {expected_total} XP, found {actual}")
+
+
+async def main(awards: int, concurrency: int) -> None:
+    same_user = await create_users(1)
+    many_users = await create_users(concurrency * 4)
+
+    try:
+        rate = await run_awards(same_user, awards, concurrency)
+        await verify_totals(same_user, awards)
+        print(f"same_user   {rate:10.1f} awards/sec")
+
+        rate = await run_awards(many_users, awards, concurrency)
+        await verify_totals(many_users, awards)
+        print(f"many_users  {rate:10.1f} awards/sec")
+    finally:
+        await cleanup(same_user + many_users)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--awards", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.awards, args.concurrency))
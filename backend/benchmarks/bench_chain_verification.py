@@ -0,0 +1,130 @@
+"""Benchmark - transaction proof verification against a local dev chain
+
+Needs an Anvil or Hardhat node (`anvil`, or `npx hardhat node`), whose
+unlocked dev accounts send `--transactions` transfers to a target
+address. Each learner is one of those accounts. The benchmark then
+verifies the proofs with ChainVerifier the way the verification worker
+does, and reports submissions/sec for:
+
+- each `--batch-sizes` entry: JSON-RPC calls per batch request
+  (1 is one HTTP round trip per call)
+- cached: after mining CHAIN_FINALITY_CONFIRMATIONS blocks, a first
+  pass caches the now final receipts and a second pass is timed (no RPC)
+
+Every genuine proof must verify. A proof claimed by the wrong wallet,
+an unknown hash and a wrong target must be rejected. No database
+needed; Redis is used when `--redis` is given.
+
+Usage:
+    anvil &
+    python -m benchmarks.bench_chain_verification --rpc-url http://127.0.0.1:8545 --transactions 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.models.task import Submission, Task, TaskType
+from app.models.user import User
+from app.services.chain_verifier import ChainVerifier, JSONRPCBatchClient, _final_proofs
+
+TARGET = "0x000000000000000000000000000000000000beef"
+VALUE_WEI = 10**15
+
+
+async def send_transactions(rpc: JSONRPCBatchClient, count: int) -> tuple[int, list[tuple[str, str]]]:
+    """(chain id, [(sender, tx hash)]) for `count` transfers from the dev accounts"""
+    chain_id, accounts = await rpc.call_many([("eth_chainId", []), ("eth_accounts", [])])
+    calls = [
+        ("eth_sendTransaction", [{"from": accounts[n % len(accounts)], "to": TARGET, "value": hex(VALUE_WEI)}])
+        for n in range(count)
+    ]
+    hashes = await rpc.call_many(calls)
+    return int(chain_id, 16), [(call[1][0]["from"], tx_hash) for call, tx_hash in zip(calls, hashes)]
+
+
+async def mine(rpc: JSONRPCBatchClient, blocks: int) -> None:
+    await rpc.call_many([("evm_mine", [])] * blocks)
+
+
+def make_items(chain_id: int, sent: list[tuple[str, str]]) -> list[tuple[Submission, Task]]:
+    task = Task(
+        id=uuid.uuid4(),
+        task_type=TaskType.TRANSACTION_PROOF,
+        verification_rules={"chain_id": chain_id, "contract_address": TARGET, "min_value": VALUE_WEI},
+    )
+    return [
+        (
+            Submission(
+                id=uuid.uuid4(),
+                transaction_hash=tx_hash,
+                submitted_at=datetime.utcnow(),
+                user=User(wallet_address=sender),
+            ),
+            task,
+        )
+        for sender, tx_hash in sent
+    ]
+
+
+async def time_pass(verifier: ChainVerifier, items: list[tuple[Submission, Task]]) -> float:
+    """Submissions/sec of one verification pass; every proof must pass"""
+    start = time.perf_counter()
+    results = await verifier.verify_batch(items)
+    seconds = time.perf_counter() - start
+    failed = [result for result in results if not result.is_valid]
+    if failed:
+        raise SystemExit(f"{len(failed)} genuine proofs rejected, e.g. {failed[0]}")
+    return len(items) / seconds
+
+
+async def check_rejections(verifier: ChainVerifier, chain_id: int, sent: list[tuple[str, str]]) -> None:
+    (sender, tx_hash), other = sent[0], next(s for s, _ in sent if s != sent[0][0])
+    items = make_items(chain_id, [(other, tx_hash), (sender, "0x" + "ab" * 32)])
+    wrong_target = make_items(chain_id, [(sender, tx_hash)])
+    wrong_target[0][1].verification_rules = {"chain_id": chain_id, "contract_address": "0x" + "11" * 20}
+    results = await verifier.verify_batch(items + wrong_target)
+    if any(result.is_valid for result in results):
+        raise SystemExit(f"bad proof accepted: {results}")
+    print("  rejected: " + "; ".join(result.error for result in results))
+
+
+async def main(rpc_url: str, transactions: int, batch_sizes: list[int], use_redis: bool) -> None:
+    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True) if use_redis else None
+    async with httpx.AsyncClient(timeout=60) as http_client:
+        rpc = JSONRPCBatchClient(rpc_url, http_client, batch_size=100)
+        chain_id, sent = await send_transactions(rpc, transactions)
+        await mine(rpc, settings.CHAIN_MIN_CONFIRMATIONS)
+        verifier = ChainVerifier(redis_client, http_client, rpc_urls={chain_id: rpc_url})
+        items = make_items(chain_id, sent)
+        print(f"chain {chain_id}, {transactions} transaction proofs")
+
+        for batch_size in batch_sizes:
+            settings.CHAIN_RPC_BATCH_SIZE = batch_size
+            print(f"  batch {batch_size:5}  {await time_pass(verifier, items):10.1f} submissions/sec")
+
+        await mine(rpc, settings.CHAIN_FINALITY_CONFIRMATIONS)
+        _final_proofs.clear()
+        await time_pass(verifier, items)
+        print(f"  cached      {await time_pass(verifier, items):10.1f} submissions/sec")
+
+        await check_rejections(verifier, chain_id, sent)
+
+    if redis_client:
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--transactions", type=int, default=500)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--redis", action="store_true", help="also cache final receipts in REDIS_URL")
+    args = parser.parse_args()
+    asyncio.run(main(args.rpc_url, args.transactions, args.batch_sizes, args.redis))
@@ -0,0 +1,121 @@
+"""Benchmark - course search: ILIKE scan vs full-text + trigram search
+
+Seeds `--courses` synthetic published courses (slug prefix `bench-`),
+ANALYZEs, then times the legacy `ILIKE '%term%'` filter against
+`course_search` for a mix of whole-word, prefix and misspelt queries,
+first page of 20 each. Seeded rows are removed afterwards unless --keep.
+
+Requires a database with the pg_trgm extension and the courses search
+indexes (DATABASE_URL).
+
+Usage:
+    python -m benchmarks.bench_course_search --courses 100000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import or_, select, text
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.course import Course
+from app.services.course_search import course_search
+
+QUERIES = ["solidity", "defi lend", "reentr", "solidty", "zero knowledge", "nft mint"]
+
+_SEED_SQL = text("""
+    WITH words AS (
+        SELECT ARRAY[
+            'solidity', 'defi', 'lending', 'staking', 'nft', 'minting', 'wallet',
+            'security', 'reentrancy', 'audit', 'oracle', 'governance', 'dao',
+            'layer', 'rollup', 'bridge', 'zero', 'knowledge', 'proof', 'token',
+            'swap', 'liquidity', 'gas', 'optimization', 'intro', 'advanced'
+        ] AS w
+    )
+    INSERT INTO courses (id, slug, title, description, author_id, published,
+                         token_gated, xp_total, created_at, updated_at)
+    SELECT gen_random_uuid(),
+           'bench-' || n,
+           initcap(w[1 + (n * 7) % 26] || ' ' || w[1 + (n * 13) % 26] || ' ' || w[1 + (n * 3) % 26]),
+           w[1 + (n * 5) % 26] || ' ' || w[1 + (n * 11) % 26] || ' ' || w[1 + (n * 17) % 26]
+               || ' course number ' || n,
+           :author_id, true, false, 0,
+           now() - n * interval '1 minute', now()
+    FROM words, generate_series(1, :count) AS n
+""")
+
+
+async def seed(count: int) -> None:
+    async with AsyncSessionLocal() as db:
+        author_id = (await db.execute(text(
+            "INSERT INTO users (id, wallet_address, role, xp_total, created_at, updated_at) "
+            "VALUES (gen_random_uuid(), '0xbench', 'LEARNER', 0, now(), now()) "
+            "ON CONFLICT (wallet_address) DO UPDATE SET updated_at = now() RETURNING id"
+        ))).scalar_one()
+        await db.execute(_SEED_SQL, {"author_id": author_id, "count": count})
+        await db.execute(text("ANALYZE courses"))
+        await db.commit()
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("DELETE FROM courses WHERE slug LIKE 'bench-%'"))
+        await db.execute(text("DELETE FROM users WHERE wallet_address = '0xbench'"))
+        await db.commit()
+
+
+def legacy_query(term: str):
+    return (
+        select(Course)
+        .where(Course.published.is_(True))
+        .where(or_(Course.title.ilike(f"%{term}%"), Course.description.ilike(f"%{term}%")))
+        .limit(20)
+    )
+
+
+def search_query(term: str):
+    matcher = course_search(term)
+    return (
+        select(Course)
+        .where(Course.published.is_(True))
+        .where(matcher.condition)
+        .order_by(matcher.relevance.desc(), Course.id.desc())
+        .limit(20)
+    )
+
+
+async def time_query(build, term: str, rounds: int) -> tuple[float, int]:
+    samples = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            rows = (await db.execute(build(term))).scalars().all()
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(rows)
+
+
+async def main(courses: int, rounds: int, keep: bool) -> None:
+    print(f"Seeding {courses} courses...")
+    await cleanup()  # rows left by an interrupted --keep run
+    await seed(courses)
+    try:
+        print(f"{'query':16} {'ilike ms':>9} {'hits':>5} {'search ms':>10} {'hits':>5}")
+        for term in QUERIES:
+            legacy_ms, legacy_hits = await time_query(legacy_query, term, rounds)
+            search_ms, search_hits = await time_query(search_query, term, rounds)
+            print(f"{term:16} {legacy_ms:9.2f} {legacy_hits:5d} {search_ms:10.2f} {search_hits:5d}")
+    finally:
+        if not keep:
+            await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.courses, args.rounds, args.keep))
@@ -0,0 +1,111 @@
+"""Benchmark - pool occupancy of read endpoints, get_db vs get_db_readonly
+
+Drives read endpoints in-process (no HTTP server) with `--concurrency`
+clients, first with every read dependency overridden back to the
+transactional get_db, then with get_db_readonly. Pool checkout/checkin
+events measure how long each request holds a pooled connection.
+
+Reports per phase: requests/s, mean and p99 connection hold time, and
+the peak number of connections checked out at once.
+
+Requires a migrated database (DATABASE_URL); rate limiting is disabled
+for the run.
+
+Usage:
+    python -m benchmarks.bench_db_readonly --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import engine, get_db, get_db_readonly
+from app.main import app
+
+PATHS = [
+    "/courses",
+    "/users/00000000-0000-0000-0000-000000000000/xp",
+    "/users/00000000-0000-0000-0000-000000000000/badges",
+]
+
+
+class PoolProbe:
+    def __init__(self):
+        self.holds: list[float] = []
+        self.checked_out = 0
+        self.peak = 0
+        self._since: dict[int, float] = {}
+        pool = engine.sync_engine.pool
+        event.listen(pool, "checkout", self.on_checkout)
+        event.listen(pool, "checkin", self.on_checkin)
+
+    def reset(self) -> None:
+        self.holds.clear()
+        self.peak = self.checked_out
+
+    def on_checkout(self, dbapi_connection, record, proxy) -> None:
+        self._since[id(record)] = time.perf_counter()
+        self.checked_out += 1
+        self.peak = max(self.peak, self.checked_out)
+
+    def on_checkin(self, dbapi_connection, record) -> None:
+        started = self._since.pop(id(record), None)
+        if started is not None:
+            self.holds.append((time.perf_counter() - started) * 1000)
+            self.checked_out -= 1
+
+
+async def run_phase(client: AsyncClient, requests: int, concurrency: int) -> float:
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(f"{settings.API_V1_PREFIX}{PATHS[i % len(PATHS)]}")
+
+    async def worker() -> None:
+        while not queue.empty():
+            response = await client.get(queue.get_nowait())
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    settings.RATE_LIMIT_ENABLED = False
+    probe = PoolProbe()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        # Warm up connections and prepared statements
+        await run_phase(client, len(PATHS) * 4, 4)
+
+        print(f"{requests} requests, concurrency {concurrency}, pool size {settings.DATABASE_POOL_SIZE}")
+        print(f"{'session':10} {'req/s':>9} {'hold mean':>10} {'hold p99':>10} {'peak':>6}")
+        for label, override in (("get_db", get_db), ("readonly", None)):
+            if override:
+                app.dependency_overrides[get_db_readonly] = override
+            else:
+                app.dependency_overrides.pop(get_db_readonly, None)
+
+            probe.reset()
+            rate = await run_phase(client, requests, concurrency)
+            holds = sorted(probe.holds)
+            p99 = holds[max(int(len(holds) * 0.99) - 1, 0)]
+            print(
+                f"{label:10} {rate:9.0f} {statistics.mean(holds):8.2f}ms "
+                f"{p99:8.2f}ms {probe.peak:6d}"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
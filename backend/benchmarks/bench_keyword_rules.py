@@ -0,0 +1,112 @@
+"""Benchmark - text rule verification: per-keyword scans vs compiled Aho-Corasick
+
+Builds a task with `--keywords` keywords (half required, half
+forbidden) and `--essays` synthetic essays of `--essay-kb` KB, then
+reports per-essay latency of:
+
+- legacy:   lowercase the text, one `kw.lower() in text` scan per keyword
+            (the rules JSON re-read on every submission)
+- compiled: TextRules from compiled_text_rules, cached per (task_id,
+            updated_at) - one pass over the text per submission; also
+            with word_boundary
+
+plus the one-off compile time. No database needed.
+
+Usage:
+    python -m benchmarks.bench_keyword_rules --keywords 1000 --essay-kb 50
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+import uuid
+from datetime import datetime
+
+from app.models.task import Task, TaskType
+from app.services.verification_rules import TextRules, compiled_text_rules
+
+
+def legacy_validate(text: str, rules: dict) -> tuple[bool, str | None]:
+    """The pre-compilation _verify_text logic"""
+    text_lower = text.lower()
+    if len(text) < rules.get("min_length", 0):
+        return False, "too short"
+    missing = [kw for kw in rules.get("required_keywords", []) if kw.lower() not in text_lower]
+    if missing:
+        return False, "missing"
+    found = [kw for kw in rules.get("forbidden_keywords", []) if kw.lower() in text_lower]
+    if found:
+        return False, "forbidden"
+    return True, None
+
+
+def make_words(count: int, rng: random.Random) -> list[str]:
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 11))) for _ in range(count)]
+
+
+def make_essay(vocabulary: list[str], required: list[str], size: int, rng: random.Random) -> str:
+    """Essay containing every required keyword, padded with vocabulary words"""
+    words = list(required)
+    length = sum(len(word) + 1 for word in words)
+    while length < size:
+        word = rng.choice(vocabulary)
+        words.append(word.capitalize() if rng.random() < 0.1 else word)
+        length += len(word) + 1
+    rng.shuffle(words)
+    return " ".join(words)[:size]
+
+
+def time_per_essay(validate, essays: list[str]) -> tuple[float, float]:
+    """(median ms, p95 ms)"""
+    samples = []
+    for essay in essays:
+        start = time.perf_counter()
+        validate(essay)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main(keywords: int, essays: int, essay_kb: int, seed: int) -> None:
+    rng = random.Random(seed)
+    vocabulary = make_words(20_000, rng)
+    keyword_list = rng.sample(make_words(keywords * 4, rng), keywords)
+    required, forbidden = keyword_list[: keywords // 2], keyword_list[keywords // 2:]
+    rules = {"min_length": 100, "required_keywords": required, "forbidden_keywords": forbidden}
+    texts = [make_essay(vocabulary, required, essay_kb * 1024, rng) for _ in range(essays)]
+
+    task = Task(
+        id=uuid.uuid4(),
+        task_type=TaskType.TEXT_SUBMISSION,
+        verification_rules=rules,
+        updated_at=datetime.utcnow(),
+    )
+    start = time.perf_counter()
+    compiled_text_rules(task)
+    compile_ms = (time.perf_counter() - start) * 1000
+    words_only = TextRules({**rules, "word_boundary": True})
+
+    if any(compiled_text_rules(task).validate(text)[0] != legacy_validate(text, rules)[0] for text in texts):
+        raise SystemExit("compiled rules disagree with the legacy check")
+
+    print(f"{keywords} keywords, {essays} essays of {essay_kb} KB")
+    print(f"  compile (once per task version)  {compile_ms:8.2f} ms")
+    for name, validate in [
+        ("legacy", lambda text: legacy_validate(text, rules)),
+        ("compiled", lambda text: compiled_text_rules(task).validate(text)),
+        ("compiled, word_boundary", words_only.validate),
+    ]:
+        median, p95 = time_per_essay(validate, texts)
+        print(f"  {name:24} p50 {median:8.2f} ms   p95 {p95:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keywords", type=int, default=1000)
+    parser.add_argument("--essays", type=int, default=50)
+    parser.add_argument("--essay-kb", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.keywords, args.essays, args.essay_kb, args.seed)
@@ -0,0 +1,84 @@
+"""Benchmark - "my rank" lookups on a 1M-member leaderboard
+
+Loads N synthetic users into the all-time sorted set of a scratch Redis
+database, with XP drawn from a narrow range so that most scores are shared
+by many users, then measures LeaderboardService.get_rank latency and
+throughput. Rank correctness under ties is spot-checked against a
+brute-force count.
+
+Usage:
+    python -m benchmarks.bench_leaderboard_rank --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+import redis.asyncio as aioredis
+
+from app.services.leaderboard_service import LeaderboardService
+
+LOAD_BATCH = 10_000
+
+
+async def load(redis_client: aioredis.Redis, key: str, users: int, max_xp: int) -> dict[str, int]:
+    """Populate the sorted set, return member -> score"""
+    scores: dict[str, int] = {}
+    for start in range(0, users, LOAD_BATCH):
+        batch = {str(uuid.uuid4()): random.randint(0, max_xp) for _ in range(min(LOAD_BATCH, users - start))}
+        await redis_client.zadd(key, batch)
+        scores.update(batch)
+    return scores
+
+
+async def main(redis_url: str, users: int, lookups: int, max_xp: int, k: int, force: bool) -> None:
+    redis_client = aioredis.from_url(redis_url, decode_responses=True)
+    if await redis_client.dbsize() and not force:
+        raise SystemExit(f"{redis_url} is not empty; pass --force to flush it")
+    await redis_client.flushdb()
+
+    service = LeaderboardService(redis_client)
+    key = service.window_key("all_time")
+
+    start = time.perf_counter()
+    scores = await load(redis_client, key, users, max_xp)
+    print(f"loaded {users} users in {time.perf_counter() - start:.1f}s")
+
+    members = list(scores)
+    sorted_scores = sorted(scores.values(), reverse=True)
+    for member in random.sample(members, 20):
+        result = await service.get_rank(member, "all_time", k)
+        expected = sum(1 for score in sorted_scores if score > scores[member]) + 1
+        assert result["rank"] == expected, (member, result["rank"], expected)
+
+    latencies = []
+    start = time.perf_counter()
+    for member in random.choices(members, k=lookups):
+        t0 = time.perf_counter()
+        await service.get_rank(member, "all_time", k)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"lookups      {lookups} (k={k})")
+    print(f"throughput   {lookups / elapsed:10.1f} lookups/sec (sequential)")
+    print(f"p50          {statistics.median(latencies):10.3f} ms")
+    print(f"p99          {latencies[int(len(latencies) * 0.99) - 1]:10.3f} ms")
+
+    await redis_client.flushdb()
+    await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--max-xp", type=int, default=5_000, help="Small range => many ties")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.redis_url, args.users, args.lookups, args.max_xp, args.k, args.force))
@@ -0,0 +1,83 @@
+"""Benchmark - link liveness checks: sequential vs concurrent probes
+
+Probes `--links` links spread over `--hosts` simulated hosts, each
+answering after `--latency-ms`, with a few redirects and dead links
+mixed in. Reports wall time for:
+
+- sequential: LinkChecker.check one link at a time
+- concurrent: LinkChecker.check_many, as link verification does per
+              batch (per-host limits and spacing still apply)
+- cached:     check_many again, answered from the result cache
+
+Hosts are simulated with an httpx MockTransport and resolve to a fixed
+public address, so no network is needed. Lower LINK_CHECK_HOST_INTERVAL to see the effect of politeness
+spacing.
+
+Usage:
+    python -m benchmarks.bench_link_checker --links 500 --hosts 50 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.services.link_checker import LinkChecker, _results
+
+
+async def resolve(host: str, port: int) -> list[str]:
+    return ["93.184.215.14"]
+
+
+def make_transport(latency: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        if request.url.path.endswith("/moved"):
+            return httpx.Response(301, headers={"location": "/page"})
+        if request.url.path.endswith("/gone"):
+            return httpx.Response(404)
+        return httpx.Response(200)
+
+    return httpx.MockTransport(handler)
+
+
+def make_links(count: int, hosts: int) -> list[str]:
+    paths = ["page"] * 8 + ["moved", "gone"]
+    return [f"https://site{n % hosts}.example.com/{n}/{paths[n % len(paths)]}" for n in range(count)]
+
+
+async def main(links: int, hosts: int, latency_ms: float) -> None:
+    urls = make_links(links, hosts)
+    async with httpx.AsyncClient(transport=make_transport(latency_ms / 1000)) as client:
+        start = time.perf_counter()
+        checker = LinkChecker(client, resolve)
+        sequential = {url: await checker.check(url) for url in urls}
+        sequential_seconds = time.perf_counter() - start
+
+        _results.clear()
+        start = time.perf_counter()
+        concurrent = await LinkChecker(client, resolve).check_many(urls, deadline=600)
+        concurrent_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await LinkChecker(client, resolve).check_many(urls, deadline=600)
+        cached_seconds = time.perf_counter() - start
+
+    if concurrent != sequential:
+        raise SystemExit("concurrent results disagree with sequential ones")
+
+    alive = sum(status.alive for status in concurrent.values())
+    print(f"{links} links on {hosts} hosts, {latency_ms:.0f} ms latency ({alive} alive)")
+    print(f"  sequential  {sequential_seconds:8.2f} s")
+    print(f"  concurrent  {concurrent_seconds:8.2f} s")
+    print(f"  cached      {cached_seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, default=500)
+    parser.add_argument("--hosts", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.links, args.hosts, args.latency_ms))
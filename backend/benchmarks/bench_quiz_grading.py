@@ -0,0 +1,92 @@
+"""Benchmark - quiz grading: one submission at a time vs NumPy batches
+
+Builds a quiz of `--questions` questions (a third each single choice,
+partial-credit multi-select and numeric) and `--submissions` random
+answer sheets, then reports submissions/sec of:
+
+- per-item: CompiledQuiz.grade for each submission
+- batch:    CompiledQuiz.grade_batch over the whole list, as the
+            verification worker does per task
+
+Both must produce identical grades. No database needed.
+
+Usage:
+    python -m benchmarks.bench_quiz_grading --questions 30 --submissions 5000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from app.services.quiz_grader import CompiledQuiz
+
+OPTIONS = ["a", "b", "c", "d", "e"]
+
+
+def make_quiz(questions: int, rng: random.Random) -> dict:
+    rules = []
+    for n in range(questions):
+        kind = ("single", "multi", "numeric")[n % 3]
+        if kind == "single":
+            rules.append({"id": f"q{n}", "type": kind, "answer": rng.choice(OPTIONS)})
+        elif kind == "multi":
+            rules.append({
+                "id": f"q{n}", "type": kind, "answer": rng.sample(OPTIONS, 2),
+                "options": OPTIONS, "points": 2, "partial": True,
+            })
+        else:
+            rules.append({"id": f"q{n}", "type": kind, "answer": round(rng.uniform(0, 100), 2), "tolerance": 0.5})
+    return {"questions": rules, "pass_threshold": 0.6}
+
+
+def make_answers(quiz: dict, rng: random.Random) -> str:
+    """Answer sheet that is right about half the time and skips some questions"""
+    answers = {}
+    for question in quiz["questions"]:
+        if rng.random() < 0.05:
+            continue
+        right = rng.random() < 0.5
+        if question["type"] == "single":
+            answers[question["id"]] = question["answer"] if right else rng.choice(OPTIONS)
+        elif question["type"] == "multi":
+            answers[question["id"]] = question["answer"] if right else rng.sample(OPTIONS, rng.randint(1, 3))
+        else:
+            answers[question["id"]] = question["answer"] + (0 if right else rng.uniform(-5, 5))
+    return json.dumps(answers)
+
+
+def main(questions: int, submissions: int, seed: int) -> None:
+    rng = random.Random(seed)
+    rules = make_quiz(questions, rng)
+    sheets = [make_answers(rules, rng) for _ in range(submissions)]
+
+    start = time.perf_counter()
+    quiz = CompiledQuiz(rules)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    single = [quiz.grade(sheet) for sheet in sheets]
+    per_item = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = quiz.grade_batch(sheets)
+    batched = time.perf_counter() - start
+
+    if single != batch:
+        raise SystemExit("batch grades disagree with per-item grades")
+
+    passed = sum(grade.passed for grade in batch)
+    print(f"{questions} questions, {submissions} submissions ({passed} passed)")
+    print(f"  compile   {compile_ms:10.2f} ms")
+    print(f"  per-item  {submissions / per_item:10.1f} submissions/sec")
+    print(f"  batch     {submissions / batched:10.1f} submissions/sec")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.questions, args.submissions, args.seed)
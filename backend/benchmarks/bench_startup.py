@@ -0,0 +1,145 @@
+"""Benchmark - worker cold start: import time and time to first 200
+
+Measures, in fresh interpreters (`--rounds` each):
+- import time of `app.main` (median wall time), plus the slowest
+  imports by cumulative time from `python -X importtime`
+- time from spawning `uvicorn app.main:app` to the first 200 from
+  /health, which includes the lifespan (schema check, Redis, JWT keys)
+
+Also reports heavy optional modules (web3, boto3, Pillow, siwe, ...)
+that `import app.main` loads eagerly; they should only be imported on
+first use. With --record, appends the results as a JSON line tagged
+with APP_VERSION, so cold start can be tracked release to release.
+
+Requires a migrated database and Redis for the time-to-first-200 phase.
+
+Usage:
+    python -m benchmarks.bench_startup --rounds 5 --record benchmarks/startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from app.core.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Must not be imported by `import app.main`
+LAZY_MODULES = ["web3", "boto3", "PIL", "imagehash", "siwe", "eth_account", "celery", "passlib", "numpy"]
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % LAZY_MODULES
+
+
+def measure_import() -> tuple[float, list[str]]:
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+def slowest_imports(limit: int) -> list[tuple[int, str]]:
+    """(cumulative microseconds, module) of the slowest top-level imports"""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only imports made directly by app modules or the app itself
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def measure_first_200(port: int, timeout: float) -> float:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "RATE_LIMIT_ENABLED": "false"},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client() as client:
+            while time.perf_counter() - start < timeout:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with {server.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health", timeout=0.5).status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"No 200 from /health within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(rounds: int, port: int, record: str | None, skip_server: bool) -> None:
+    import_times = []
+    loaded: list[str] = []
+    for _ in range(rounds):
+        seconds, loaded = measure_import()
+        import_times.append(seconds * 1000)
+    import_ms = statistics.median(import_times)
+    print(f"import app.main: median {import_ms:.0f} ms over {rounds} rounds")
+
+    print("slowest imports (cumulative):")
+    for micros, name in slowest_imports(10):
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    if loaded:
+        print(f"eagerly imported heavy modules: {', '.join(loaded)}")
+    else:
+        print("no heavy optional modules imported at startup")
+
+    first_200_ms = None
+    if not skip_server:
+        first_200_ms = statistics.median(
+            measure_first_200(port, timeout=30) * 1000 for _ in range(rounds)
+        )
+        print(f"spawn to first 200: median {first_200_ms:.0f} ms over {rounds} rounds")
+
+    if record:
+        with open(record, "a") as f:
+            f.write(json.dumps({
+                "version": settings.APP_VERSION,
+                "recorded_at": datetime.utcnow().isoformat(),
+                "python": sys.version.split()[0],
+                "import_ms": round(import_ms, 1),
+                "first_200_ms": round(first_200_ms, 1) if first_200_ms is not None else None,
+                "eager_heavy_modules": loaded,
+            }) + "\n")
+        print(f"recorded to {record}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--record", help="Append results as a JSON line to this file")
+    parser.add_argument("--skip-server", action="store_true", help="Only measure imports")
+    args = parser.parse_args()
+    main(args.rounds, args.port, args.record, args.skip_server)
@@ -0,0 +1,140 @@
+"""Benchmark - verification worker throughput (submissions verified/sec)
+
+Seeds `--submissions` pending text submissions for auto-verify tasks,
+pushes them onto the TEXT_SUBMISSION verification queue and drains it
+with TaskService.verify_queued_submissions - the loop the Celery worker
+runs - once per `--batch-sizes` entry. Half of the submissions pass the
+keyword rule, so each batch exercises both the UPDATE and the bulk XP
+award. Batch size 1 approximates verifying every submission on its own.
+
+Runs against DATABASE_URL and REDIS_URL. Stop the Celery worker first,
+or it will consume the benchmark's queue.
+
+Usage:
+    python -m benchmarks.bench_verification --submissions 5000 --batch-sizes 1 50 200
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import redis.asyncio as aioredis
+from sqlalchemy import delete, insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.course import Course
+from app.models.task import Submission, SubmissionStatus, Task, TaskType
+from app.models.user import User
+from app.models.xp import XPLedger
+from app.services.task_service import TaskService
+
+USERS = 500
+
+
+async def create_fixtures(submissions: int) -> tuple[list[uuid.UUID], list[uuid.UUID], uuid.UUID]:
+    """Throwaway users, a course and enough auto-verify tasks for one submission per (task, user)"""
+    async with AsyncSessionLocal() as session:
+        users = [User(wallet_address=f"0x{uuid.uuid4().hex:0>40}") for _ in range(USERS)]
+        session.add_all(users)
+        await session.flush()
+        course = Course(
+            slug=f"bench-verify-{uuid.uuid4().hex[:8]}",
+            title="Verification benchmark",
+            description="Benchmark course",
+            author_id=users[0].id,
+        )
+        session.add(course)
+        await session.flush()
+        tasks = [
+            Task(
+                course_id=course.id,
+                title=f"Benchmark task {n}",
+                description="Mention ethereum",
+                task_type=TaskType.TEXT_SUBMISSION,
+                xp_reward=10,
+                auto_verify=True,
+                verification_rules={"min_length": 8, "required_keywords": ["ethereum"]},
+            )
+            for n in range(-(-submissions // USERS))
+        ]
+        session.add_all(tasks)
+        await session.commit()
+        return [user.id for user in users], [task.id for task in tasks], course.id
+
+
+async def seed_submissions(
+    user_ids: list[uuid.UUID], task_ids: list[uuid.UUID], count: int, redis_client: aioredis.Redis
+) -> None:
+    """Fresh pending submissions, queued for the worker"""
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "task_id": task_ids[n // len(user_ids)],
+            "user_id": user_ids[n % len(user_ids)],
+            "submission_text": "ethereum is a world computer" if n % 2 == 0 else "no keyword here",
+            "status": SubmissionStatus.PENDING,
+            "xp_awarded": 0,
+        }
+        for n in range(count)
+    ]
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Submission).where(Submission.task_id.in_(task_ids)))
+        await session.execute(delete(XPLedger).where(XPLedger.user_id.in_(user_ids)))
+        await session.execute(insert(Submission), rows)
+        await session.commit()
+
+    key = TaskService._verification_queue_key(TaskType.TEXT_SUBMISSION)
+    await redis_client.delete(key)
+    for start in range(0, count, 1000):
+        await redis_client.rpush(key, *(str(row["id"]) for row in rows[start:start + 1000]))
+
+
+async def drain(redis_client: aioredis.Redis, batch_size: int) -> tuple[int, int, float]:
+    """Drain the queue like the worker does; returns (verified, approved, seconds)"""
+    verified = approved = 0
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        service = TaskService(session, redis_client)
+        while True:
+            batch = await service.verify_queued_submissions(TaskType.TEXT_SUBMISSION, batch_size)
+            if batch.popped == 0:
+                break
+            verified += batch.verified
+            approved += batch.approved
+    return verified, approved, time.perf_counter() - start
+
+
+async def cleanup(user_ids: list[uuid.UUID], course_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Submission).where(Submission.user_id.in_(user_ids)))
+        await session.execute(delete(XPLedger).where(XPLedger.user_id.in_(user_ids)))
+        await session.execute(delete(Task).where(Task.course_id == course_id))
+        await session.execute(delete(Course).where(Course.id == course_id))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+async def main(submissions: int, batch_sizes: list[int]) -> None:
+    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    user_ids, task_ids, course_id = await create_fixtures(submissions)
+    try:
+        for batch_size in batch_sizes:
+            await seed_submissions(user_ids, task_ids, submissions, redis_client)
+            verified, approved, seconds = await drain(redis_client, batch_size)
+            if verified != submissions or approved != submissions // 2 + submissions % 2:
+                raise SystemExit(f"batch {batch_size}: verified {verified}, approved {approved}")
+            print(f"batch {batch_size:5}  {verified / seconds:10.1f} submissions/sec")
+    finally:
+        await cleanup(user_ids, course_id)
+        await redis_client.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 50, 200])
+    args = parser.parse_args()
+    asyncio.run(main(args.submissions, args.batch_sizes))
@@ -0,0 +1 @@
+"""Maintenance scripts (run against a live database)"""
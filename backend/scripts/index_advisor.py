@@ -0,0 +1,263 @@
+"""Index advisor - EXPLAIN the hot service queries and flag sequential scans
+
+Seeds synthetic users, courses, tasks, submissions, enrollments and XP
+ledger rows (ids derived from an `advisor-` prefix), ANALYZEs, then runs
+the service methods behind the hot read paths while capturing every
+SELECT they send. Each distinct statement is EXPLAINed with its real
+parameters. A plan is flagged when it sequentially scans a seeded table
+to return a small fraction of it (where an index would do), or sorts
+the output of such a scan. Seeded rows are removed afterwards unless
+--keep.
+
+Exits with status 1 when anything is flagged, so it can gate CI.
+
+Requires a migrated database (DATABASE_URL).
+
+Usage:
+    python -m scripts.index_advisor --users 20000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+from uuid import UUID
+
+from sqlalchemy import event, text
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.user import User
+from app.schemas.task import SubmissionCreate
+from app.services.course_service import CourseService
+from app.services.task_service import TaskService
+from app.services.user_service import UserService
+
+SEEDED_TABLES = (
+    "users", "courses", "tasks", "submissions", "course_enrollments", "xp_ledger", "user_badges",
+)
+
+# A scan returning more than this share of a table is fine without an index
+SELECTIVE_FRACTION = 0.1
+
+# Deterministic ids: md5('advisor-<kind>-<n>')::uuid
+_SEED_SQL = [
+    """
+    INSERT INTO users (id, wallet_address, role, xp_total, created_at, updated_at)
+    SELECT md5('advisor-user-' || n)::uuid, '0xadvisor' || n, 'LEARNER', n % 5000, now(), now()
+    FROM generate_series(1, :users) AS n
+    """,
+    """
+    INSERT INTO courses (id, slug, title, description, author_id, published,
+                         token_gated, xp_total, created_at, updated_at)
+    SELECT md5('advisor-course-' || n)::uuid, 'advisor-' || n, 'Advisor course ' || n,
+           'Synthetic course ' || n, md5('advisor-user-1')::uuid, n % 10 <> 0,
+           false, 0, now() - n * interval '1 minute', now()
+    FROM generate_series(1, :courses) AS n
+    """,
+    """
+    INSERT INTO tasks (id, course_id, title, description, task_type, xp_reward,
+                       auto_verify, created_at, updated_at)
+    SELECT md5('advisor-task-' || n)::uuid, md5('advisor-course-' || (1 + n % :courses))::uuid,
+           'Task ' || n, 'Synthetic task', 'TEXT_SUBMISSION', 10, false,
+           now() - n * interval '1 second', now()
+    FROM generate_series(1, :tasks) AS n
+    """,
+    # One submission per (user, task): user u gets tasks u+q for q = 0, 1, ...
+    """
+    INSERT INTO submissions (id, task_id, user_id, submission_text, status, xp_awarded,
+                             created_at, submitted_at)
+    SELECT gen_random_uuid(),
+           md5('advisor-task-' || (1 + (n / :users + n % :users) % :tasks))::uuid,
+           md5('advisor-user-' || (1 + n % :users))::uuid,
+           'answer', (ARRAY['PENDING', 'APPROVED', 'REJECTED'])[1 + n % 3]::submissionstatus,
+           0, now() - n * interval '1 second', now() - n * interval '1 second'
+    FROM generate_series(0, :submissions - 1) AS n
+    """,
+    """
+    INSERT INTO course_enrollments (id, user_id, course_id, completion_percentage,
+                                    started_at, last_accessed_at)
+    SELECT gen_random_uuid(),
+           md5('advisor-user-' || (1 + n % :users))::uuid,
+           md5('advisor-course-' || (1 + (n / :users + n % :users) % :courses))::uuid,
+           0, now(), now()
+    FROM generate_series(0, :enrollments - 1) AS n
+    """,
+    # One row per (user, task), like submissions: ledger sources are unique
+    """
+    INSERT INTO xp_ledger (user_id, source_type, source_id, xp_change, balance_after, reason, created_at)
+    SELECT md5('advisor-user-' || (1 + n % :users))::uuid, 'task_completion',
+           md5('advisor-task-' || (1 + (n / :users + n % :users) % :tasks))::uuid, 10, n, 'advisor',
+           now() - n * interval '1 second'
+    FROM generate_series(1, :ledger) AS n
+    """,
+    """
+    INSERT INTO badges (id, name, tier, criteria_type, criteria_config, created_at)
+    VALUES (md5('advisor-badge')::uuid, 'Advisor badge', 'BRONZE', 'XP_MILESTONE', '{}', now())
+    """,
+    """
+    INSERT INTO user_badges (id, user_id, badge_id, nft_minted, earned_at)
+    SELECT gen_random_uuid(), md5('advisor-user-' || (1 + n % :users))::uuid,
+           md5('advisor-badge')::uuid, false, now()
+    FROM generate_series(1, :users * 2) AS n
+    """,
+]
+
+_CLEANUP_SQL = [
+    "DELETE FROM user_badges WHERE badge_id = md5('advisor-badge')::uuid",
+    "DELETE FROM badges WHERE id = md5('advisor-badge')::uuid",
+    "DELETE FROM xp_ledger WHERE user_id IN (SELECT id FROM users WHERE wallet_address LIKE '0xadvisor%')",
+    "DELETE FROM course_enrollments WHERE user_id IN (SELECT id FROM users WHERE wallet_address LIKE '0xadvisor%')",
+    "DELETE FROM submissions WHERE user_id IN (SELECT id FROM users WHERE wallet_address LIKE '0xadvisor%')",
+    "DELETE FROM tasks WHERE course_id IN (SELECT id FROM courses WHERE slug LIKE 'advisor-%')",
+    "DELETE FROM courses WHERE slug LIKE 'advisor-%'",
+    "DELETE FROM users WHERE wallet_address LIKE '0xadvisor%'",
+]
+
+
+def seeded_id(kind: str, n: int) -> UUID:
+    return UUID(hashlib.md5(f"advisor-{kind}-{n}".encode()).hexdigest())
+
+
+async def seed(users: int) -> None:
+    sizes = {
+        "users": users,
+        "courses": max(users // 10, 10),
+        "tasks": max(users, 100),
+        "submissions": users * 10,
+        "enrollments": users * 3,
+        "ledger": users * 10,
+    }
+    async with AsyncSessionLocal() as db:
+        for statement in _SEED_SQL:
+            clause = text(statement)
+            await db.execute(clause, {k: v for k, v in sizes.items() if f":{k}" in statement})
+        await db.commit()
+        for table in SEEDED_TABLES:
+            await db.execute(text(f"ANALYZE {table}"))
+        await db.commit()
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        for statement in _CLEANUP_SQL:
+            await db.execute(text(statement))
+        await db.commit()
+
+
+async def table_sizes() -> dict[str, float]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            text("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(:tables)"),
+            {"tables": list(SEEDED_TABLES)},
+        )
+        return dict(result.all())
+
+
+async def capture_queries() -> dict[str, tuple[str, tuple, int]]:
+    """
+    Run the hot service paths. Returns {statement: (label, parameters, count)}
+    for every distinct SELECT, keeping the parameters of its first execution.
+    """
+    captured: dict[str, tuple[str, tuple, int]] = {}
+    label = None
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if label and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            first_label, first_parameters, count = captured.get(statement, (label, parameters, 0))
+            captured[statement] = (first_label, first_parameters, count + 1)
+
+    user_id = seeded_id("user", 1)
+    course_id = seeded_id("course", 1)
+    task_id = seeded_id("task", 1)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with AsyncSessionLocal() as db:
+            tasks = TaskService(db)
+            courses = CourseService(db)
+            users = UserService(db)
+            user = await db.get(User, user_id)
+
+            label = "TaskService.submit_task"
+            await tasks.submit_task(SubmissionCreate(task_id=task_id, submission_text="retry"), user)
+            label = "TaskService.get_course_tasks"
+            await tasks.get_course_tasks(course_id, user_id)
+            label = "TaskService.get_user_submissions"
+            await tasks.get_user_submissions(user_id)
+            label = "TaskService.get_pending_submissions"
+            await tasks.get_pending_submissions()
+            label = "CourseService.get_user_enrollment"
+            await courses.get_user_enrollment(course_id, user_id)
+            label = "CourseService.list_courses"
+            await courses.list_courses(limit=20)
+            label = "UserService.get_user_xp_history"
+            await users.get_user_xp_history(user_id)
+            label = "UserService.get_user_badges"
+            await users.get_user_badges(user_id)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    return captured
+
+
+def selective_seq_scan(node: dict, sizes: dict[str, float]) -> bool:
+    relation = node.get("Relation Name")
+    if node["Node Type"] != "Seq Scan" or relation not in SEEDED_TABLES:
+        return False
+    return node["Plan Rows"] < sizes.get(relation, 0) * SELECTIVE_FRACTION
+
+
+def find_problems(node: dict, sizes: dict[str, float]) -> list[str]:
+    """Selective sequential scans of seeded tables, and sorts fed by them, anywhere in a plan"""
+    problems = []
+    if selective_seq_scan(node, sizes):
+        condition = node.get("Filter", "no filter")
+        if len(condition) > 80:
+            condition = condition[:77] + "..."
+        problems.append(
+            f"Seq Scan on {node['Relation Name']} for ~{node['Plan Rows']} of "
+            f"{sizes[node['Relation Name']]:.0f} rows ({condition})"
+        )
+    if node["Node Type"] == "Sort" and any(
+        selective_seq_scan(child, sizes) for child in node.get("Plans", [])
+    ):
+        problems.append(f"Sort on {', '.join(node['Sort Key'])} over a sequential scan")
+    for child in node.get("Plans", []):
+        problems.extend(find_problems(child, sizes))
+    return problems
+
+
+async def main(users: int, keep: bool) -> int:
+    print(f"Seeding {users} users and related rows...")
+    await cleanup()  # rows left by an interrupted --keep run
+    await seed(users)
+    flagged = 0
+    try:
+        sizes = await table_sizes()
+        captured = await capture_queries()
+        async with engine.connect() as conn:
+            for statement, (label, parameters, count) in captured.items():
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar_one()[0]["Plan"]
+                problems = find_problems(plan, sizes)
+                status = "FLAG" if problems else "ok"
+                runs = f" x{count}" if count > 1 else ""
+                print(f"[{status:4}] {label}{runs}: {plan['Node Type']}, cost {plan['Total Cost']:.0f}")
+                for problem in problems:
+                    print(f"         {problem}")
+                flagged += bool(problems)
+    finally:
+        if not keep:
+            await cleanup()
+        await engine.dispose()
+
+    print(f"{flagged} of {len(captured)} distinct queries flagged")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded rows")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.users, args.keep)))
@@ -0,0 +1,98 @@
+"""SIWE sign-in: one Redis round trip per verify, nonces are single-use"""
+
+from datetime import datetime, timezone
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from siwe import SiweMessage
+from sqlalchemy import func, select
+
+from app.models.user import User
+
+
+def signed(account, nonce: str) -> dict:
+    message = SiweMessage(
+        domain="app.learnfi.com",
+        address=account.address,
+        uri="https://app.learnfi.com",
+        version="1",
+        chain_id=8453,
+        nonce=nonce,
+        issued_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    ).prepare_message()
+    signature = account.sign_message(encode_defunct(text=message)).signature.hex()
+    return {"address": account.address, "message": message, "signature": "0x" + signature.removeprefix("0x")}
+
+
+@pytest.fixture
+def count_commands(redis_client, monkeypatch):
+    commands = []
+    execute = redis_client.execute_command
+
+    async def counted(*args, **options):
+        commands.append(args[0])
+        return await execute(*args, **options)
+
+    monkeypatch.setattr(redis_client, "execute_command", counted)
+    return commands
+
+
+async def request_nonce(client, account) -> str:
+    response = await client.post("/api/v1/auth/nonce", json={"address": account.address})
+    assert response.status_code == 200
+    return response.json()["nonce"]
+
+
+async def test_verify_is_one_round_trip(client, redis_client, make_user, count_commands):
+    account = Account.create()
+    user = await make_user(wallet_address=account.address.lower())
+    body = signed(account, await request_nonce(client, account))
+    count_commands.clear()
+
+    response = await client.post("/api/v1/auth/verify", json=body)
+
+    assert response.status_code == 200
+    assert count_commands == ["EVAL"]
+    assert await redis_client.get(f"refresh_token:{user.id}") == response.json()["refresh_token"]
+    assert await redis_client.get(f"nonce:{account.address.lower()}") is None
+
+
+async def test_replayed_or_mismatched_nonce_is_rejected(client, redis_client, make_user):
+    account = Account.create()
+    user = await make_user(wallet_address=account.address.lower())
+    body = signed(account, await request_nonce(client, account))
+    refresh_token = (await client.post("/api/v1/auth/verify", json=body)).json()["refresh_token"]
+
+    replay = await client.post("/api/v1/auth/verify", json=body)
+    assert replay.status_code == 401
+    assert replay.json()["detail"] == "Nonce expired or invalid"
+
+    await request_nonce(client, account)
+    mismatch = await client.post("/api/v1/auth/verify", json=signed(account, "a" * 16))
+    assert mismatch.status_code == 401
+    assert mismatch.json()["detail"] == "Nonce mismatch"
+
+    # The issued nonce is gone and the session's refresh token untouched
+    assert await redis_client.get(f"nonce:{account.address.lower()}") is None
+    assert await redis_client.get(f"refresh_token:{user.id}") == refresh_token
+
+
+async def test_first_sign_in_creates_the_user_only_for_a_valid_nonce(client, db, redis_client):
+    account = Account.create()
+    wallet = account.address.lower()
+
+    async def users() -> int:
+        return await db.scalar(select(func.count()).where(User.wallet_address == wallet))
+
+    # No nonce issued, then a nonce other than the signed one
+    assert (await client.post("/api/v1/auth/verify", json=signed(account, "b" * 16))).status_code == 401
+    await request_nonce(client, account)
+    assert (await client.post("/api/v1/auth/verify", json=signed(account, "b" * 16))).status_code == 401
+    assert await users() == 0
+
+    response = await client.post("/api/v1/auth/verify", json=signed(account, await request_nonce(client, account)))
+    assert response.status_code == 200
+    assert await users() == 1
+    user_id = response.json()["user"]["id"]
+    assert await redis_client.get(f"refresh_token:{user_id}") == response.json()["refresh_token"]
@@ -0,0 +1,219 @@
+"""Transaction proofs against a mocked JSON-RPC node"""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.models.task import Submission, Task, TaskType
+from app.models.user import User
+from app.services import chain_verifier
+from app.services.chain_verifier import ChainRPCError, ChainVerifier, JSONRPCBatchClient
+
+CHAIN = 84532
+URL = "http://node.test"
+WALLET = "0x" + "ab" * 20
+CONTRACT = "0x" + "cd" * 20
+
+
+def tx_hash(n: int) -> str:
+    return "0x" + f"{n:064x}"
+
+
+class Node:
+    """JSON-RPC node answering batches in reverse order"""
+
+    def __init__(self, head: int = 1000):
+        self.head = head
+        self.txs: dict[str, tuple[dict, dict | None]] = {}
+        self.batches: list[list[dict]] = []
+        self.errors: dict[str, dict] = {}
+
+    def mine(self, n: int, block: int | None = None, sender=WALLET, to=CONTRACT, value=10, status="0x1"):
+        tx = {"from": sender, "to": to, "value": hex(value)}
+        receipt = {"blockNumber": hex(block), "status": status} if block is not None else None
+        self.txs[tx_hash(n)] = (tx, receipt)
+
+    def answer(self, call: dict) -> dict:
+        method, params = call["method"], call["params"]
+        if method in self.errors:
+            return {"jsonrpc": "2.0", "id": call["id"], "error": self.errors[method]}
+        if method == "eth_blockNumber":
+            result = hex(self.head)
+        else:
+            tx, receipt = self.txs.get(params[0], (None, None))
+            result = tx if method == "eth_getTransactionByHash" else receipt
+        return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)
+        self.batches.append(batch)
+        return httpx.Response(200, json=[self.answer(call) for call in reversed(batch)])
+
+    @property
+    def calls(self) -> int:
+        return sum(len(batch) for batch in self.batches)
+
+
+@pytest.fixture
+def node() -> Node:
+    return Node()
+
+
+@pytest.fixture
+async def http_client(node):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(node.handler)) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    chain_verifier._final_proofs.clear()
+    yield
+    chain_verifier._final_proofs.clear()
+
+
+def item(n: int, submitted_ago: float = 0, created_ago: float | None = None, **rules):
+    now = datetime.utcnow()
+    submission = Submission(
+        id=uuid.uuid4(),
+        transaction_hash=tx_hash(n) if isinstance(n, int) else n,
+        created_at=now - timedelta(seconds=submitted_ago if created_ago is None else created_ago),
+        submitted_at=now - timedelta(seconds=submitted_ago),
+        user=User(wallet_address=WALLET.upper().replace("0X", "0x")),
+    )
+    task = Task(
+        id=uuid.uuid4(),
+        task_type=TaskType.TRANSACTION_PROOF,
+        verification_rules={"chain_id": CHAIN, "contract_address": CONTRACT, "min_value": 10, **rules},
+    )
+    return submission, task
+
+
+def verifier(http_client, redis_client=None) -> ChainVerifier:
+    return ChainVerifier(redis_client, http_client, {CHAIN: URL})
+
+
+# ===== Batch client =====
+
+
+async def test_batch_client_orders_results_and_chunks(node, http_client):
+    for n in range(5):
+        node.mine(n, block=900 + n)
+    client = JSONRPCBatchClient(URL, http_client, batch_size=4)
+
+    calls = [("eth_blockNumber", [])] + [("eth_getTransactionReceipt", [tx_hash(n)]) for n in range(5)]
+    results = await client.call_many(calls)
+
+    assert results[0] == hex(1000)
+    assert [int(r["blockNumber"], 16) for r in results[1:]] == [900, 901, 902, 903, 904]
+    assert [len(batch) for batch in node.batches] == [4, 2]
+
+
+async def test_batch_client_item_error_fails_the_batch(node, http_client):
+    node.errors["eth_getTransactionReceipt"] = {"code": -32000, "message": "header not found"}
+    client = JSONRPCBatchClient(URL, http_client, batch_size=10)
+    with pytest.raises(ChainRPCError, match="header not found"):
+        await client.call_many([("eth_blockNumber", []), ("eth_getTransactionReceipt", [tx_hash(1)])])
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(500),
+        httpx.Response(200, json={"jsonrpc": "2.0", "id": None, "error": {"message": "batch too large"}}),
+        httpx.Response(200, json=[{"jsonrpc": "2.0", "id": 7, "result": "0x1"}]),
+        httpx.Response(200, content=b"<html>"),
+    ],
+)
+async def test_batch_client_rejects_bad_responses(response):
+    transport = httpx.MockTransport(lambda request: response)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        with pytest.raises(ChainRPCError):
+            await JSONRPCBatchClient(URL, http_client, 10).call_many([("eth_blockNumber", [])])
+
+
+# ===== Verification =====
+
+
+async def test_verify_batch_outcomes(node, http_client, monkeypatch):
+    monkeypatch.setattr(settings, "CHAIN_RPC_BATCH_SIZE", 3)
+    node.mine(1, block=990)                               # valid, 11 confirmations
+    node.mine(2, block=990, status="0x0")                 # reverted
+    node.mine(3, block=990, sender="0x" + "ee" * 20)      # someone else's
+    node.mine(4, block=990, to="0x" + "ff" * 20)          # wrong contract
+    node.mine(5, block=990, value=9)                      # too little value
+    node.mine(6)                                          # not mined yet
+    node.mine(7, block=999)                               # 2 of 3 confirmations
+    items = [
+        item(1), item(2), item(3), item(4), item(5), item(6), item(7),
+        item(8),                                          # unknown, just submitted
+        item(9, submitted_ago=3600),                      # unknown, long ago
+        item(6, submitted_ago=3600),                      # never mined
+        item("0x123"),
+        item(1, chain_id=1),
+        item(""),
+    ]
+
+    results = await verifier(http_client).verify_batch(items)
+
+    assert [(r.is_valid, r.error, r.retry) for r in results] == [
+        (True, None, False),
+        (False, "Transaction reverted", False),
+        (False, "Transaction was not sent from your wallet", False),
+        (False, f"Transaction must be sent to {CONTRACT}", False),
+        (False, "Transaction value must be at least 10 wei", False),
+        (False, "Transaction is not mined yet", True),
+        (False, "Waiting for confirmations (2/3)", True),
+        (False, "Transaction not found yet", True),
+        (False, f"Transaction not found on chain {CHAIN}", False),
+        (False, "Transaction was never mined", False),
+        (False, "Invalid transaction hash format", False),
+        (False, "Unsupported chain: 1", False),
+        (False, "Transaction hash is required", False),
+    ]
+    # One eth_blockNumber plus two calls per distinct hash, in batches of 3
+    assert node.calls == 1 + 2 * 9
+    assert all(len(batch) <= 3 for batch in node.batches)
+
+
+async def test_grace_window_restarts_on_resubmission(node, http_client):
+    # Created long ago, but the (new) hash was submitted just now
+    result, = await verifier(http_client).verify_batch([item(8, submitted_ago=10, created_ago=86400)])
+    assert (result.error, result.retry) == ("Transaction not found yet", True)
+
+    stale = settings.CHAIN_TX_NOT_FOUND_GRACE_SECONDS + 1
+    result, = await verifier(http_client).verify_batch([item(8, submitted_ago=stale, created_ago=stale)])
+    assert (result.error, result.retry) == (f"Transaction not found on chain {CHAIN}", False)
+
+
+async def test_rpc_failure_is_retried(node, http_client):
+    node.errors["eth_blockNumber"] = {"code": -32005, "message": "rate limited"}
+    result, = await verifier(http_client).verify_batch([item(1)])
+    assert (result.is_valid, result.error, result.retry) == (False, "Chain RPC unavailable", True)
+
+
+async def test_final_receipts_are_cached(node, http_client, redis_client):
+    final = settings.CHAIN_FINALITY_CONFIRMATIONS
+    node.mine(1, block=node.head - final + 1)   # final
+    node.mine(2, block=node.head - 5)           # not final yet
+
+    first = await verifier(http_client, redis_client).verify_batch([item(1), item(2)])
+    assert [r.is_valid for r in first] == [True, True]
+    assert await redis_client.exists(f"chain:tx:{CHAIN}:{tx_hash(1)}")
+    assert not await redis_client.exists(f"chain:tx:{CHAIN}:{tx_hash(2)}")
+
+    # Per-worker cache: the final receipt needs no RPC call at all
+    node.batches.clear()
+    result, = await verifier(http_client, redis_client).verify_batch([item(1)])
+    assert result.is_valid and node.calls == 0
+
+    # Another worker finds it in Redis; the shallow receipt is looked up again
+    chain_verifier._final_proofs.clear()
+    results = await verifier(http_client, redis_client).verify_batch([item(1), item(2)])
+    assert [r.is_valid for r in results] == [True, True]
+    assert node.calls == 3
+    assert {call["params"][0] for batch in node.batches for call in batch if call["params"]} == {tx_hash(2)}
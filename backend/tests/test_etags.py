@@ -0,0 +1,76 @@
+"""Conditional GETs across version bumps and a Redis flush"""
+
+import uuid
+
+from app.core.catalog_cache import catalog_cache
+from app.core.versions import bump_versions, read_versions
+from app.models.course import Course
+from app.models.user import UserRole
+from app.services import leaderboard_service
+from app.services.leaderboard_service import LeaderboardService
+
+
+async def test_missing_counters_are_seeded_above_old_values(redis_client):
+    await redis_client.set("v:old", 3)
+    (old,) = await read_versions(redis_client, "v:old")
+    await redis_client.flushall()
+
+    first, second = await read_versions(redis_client, "v:old", "v:other")
+    assert int(first) > int(old) and int(second) > int(old)
+    assert await read_versions(redis_client, "v:old") == [first]
+
+    await bump_versions(redis_client, "v:old", "v:new")
+    assert await redis_client.get("v:old") == str(int(first) + 1)
+    assert int(await redis_client.get("v:new")) > int(old)
+
+
+async def test_leaderboard_etag_across_bump_and_flush(client, redis_client, make_user, monkeypatch):
+    monkeypatch.setattr(leaderboard_service, "schedule_rebuild", lambda period: None)
+    user = await make_user(xp_total=10)
+    service = LeaderboardService(redis_client)
+
+    async def get(etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return await client.get("/api/v1/users/leaderboard", headers=headers)
+
+    etag = (await get()).headers["etag"]
+    await service.record_award(user.id, 5, 15)
+    response = await get(etag)
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    etag = response.headers["etag"]
+    assert (await get(etag)).status_code == 304
+
+    # The counter is gone after a flush; the same number of bumps must not
+    # bring the old tag back
+    await redis_client.flushall()
+    await get()
+    await service.record_award(user.id, 5, 15)
+    assert (await get(etag)).status_code == 200
+
+
+async def test_catalog_etag_across_bump_and_flush(client, db, redis_client, make_user):
+    author = await make_user(UserRole.INSTRUCTOR)
+    db.add(Course(
+        slug=f"course-{uuid.uuid4().hex[:10]}",
+        title="Intro to rollups",
+        description="Learn how rollups work",
+        author_id=author.id,
+        published=True,
+    ))
+    await db.commit()
+
+    async def get(etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return await client.get("/api/v1/courses", headers=headers)
+
+    etag = (await get()).headers["etag"]
+    await catalog_cache.bump(redis_client)
+    response = await get(etag)
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    etag = response.headers["etag"]
+    assert (await get(etag)).status_code == 304
+
+    await redis_client.flushall()
+    await get()
+    await catalog_cache.bump(redis_client)
+    assert (await get(etag)).status_code == 200
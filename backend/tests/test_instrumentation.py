@@ -0,0 +1,65 @@
+"""Serialization timings reported in Server-Timing"""
+
+import re
+import time
+
+import httpx
+from fastapi import APIRouter, FastAPI, Response
+from pydantic import BaseModel, field_serializer
+
+from app.core.config import settings
+from app.core.instrumentation import (
+    InstrumentationMiddleware,
+    TimedJSONResponse,
+    TimedRoute,
+    timed_serialization,
+)
+
+DELAY = 0.05
+
+
+class SlowItem(BaseModel):
+    name: str
+
+    @field_serializer("name")
+    def slow_name(self, name: str) -> str:
+        time.sleep(DELAY)
+        return name
+
+
+def make_app() -> FastAPI:
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/model", response_model=SlowItem)
+    async def model():
+        time.sleep(DELAY)  # endpoint work is not serialization
+        return {"name": "item"}
+
+    @router.get("/sync", response_model=SlowItem)
+    def sync():
+        return {"name": "item"}
+
+    @router.get("/raw")
+    async def raw():
+        with timed_serialization():
+            payload = SlowItem(name="item").model_dump_json()
+        return Response(payload, media_type="application/json")
+
+    app = FastAPI(default_response_class=TimedJSONResponse)
+    app.include_router(router)
+    app.add_middleware(InstrumentationMiddleware)
+    return app
+
+
+def serialize_ms(response: httpx.Response) -> float:
+    return float(re.search(r"serialize;dur=([\d.]+)", response.headers["server-timing"]).group(1))
+
+
+async def test_response_model_and_handler_encoding_are_timed(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    transport = httpx.ASGITransport(app=make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in ("/model", "/sync", "/raw"):
+            response = await client.get(path)
+            assert response.json() == {"name": "item"}
+            assert DELAY * 1000 <= serialize_ms(response) < 2 * DELAY * 1000, path
@@ -0,0 +1,75 @@
+"""KeywordMatcher against a brute-force substring search"""
+
+import random
+
+import pytest
+
+from app.services.keyword_matcher import KeywordMatcher
+
+ALPHABET = "abcAB_ ß1."
+
+
+def is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def brute_force(keywords, text, case_sensitive=False, word_boundary=False) -> set[int]:
+    if not case_sensitive:
+        text = text.casefold()
+    found = set()
+    for index, keyword in enumerate(keywords):
+        keyword = keyword if case_sensitive else keyword.casefold()
+        if not keyword:
+            continue
+        start = text.find(keyword)
+        while start != -1:
+            end = start + len(keyword)
+            if not word_boundary or (
+                (start == 0 or not is_word_char(text[start - 1]))
+                and (end == len(text) or not is_word_char(text[end]))
+            ):
+                found.add(index)
+                break
+            start = text.find(keyword, start + 1)
+    return found
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+@pytest.mark.parametrize("case_sensitive", [False, True])
+@pytest.mark.parametrize("word_boundary", [False, True])
+def test_matches_brute_force(case_sensitive, word_boundary):
+    rng = random.Random(f"{case_sensitive}-{word_boundary}")
+    for _ in range(300):
+        keywords = [random_text(rng, rng.randint(0, 4)) for _ in range(rng.randint(1, 8))]
+        matcher = KeywordMatcher(keywords, case_sensitive, word_boundary)
+        # Several texts per matcher exercise the memoized transitions
+        for _ in range(5):
+            text = random_text(rng, rng.randint(0, 40))
+            assert matcher.find(text) == brute_force(keywords, text, case_sensitive, word_boundary), (
+                keywords, text,
+            )
+
+
+def test_overlapping_and_nested_keywords():
+    matcher = KeywordMatcher(["he", "she", "his", "hers", "e"])
+    assert matcher.find("ushers") == {0, 1, 3, 4}
+    assert matcher.find("HIS") == {2}
+
+
+def test_unicode_case_folding():
+    assert KeywordMatcher(["STRASSE"]).find("Straße") == {0}
+    assert KeywordMatcher(["STRASSE"], case_sensitive=True).find("Straße") == set()
+
+
+def test_word_boundary():
+    matcher = KeywordMatcher(["cat", "cat_food", ""], word_boundary=True)
+    assert matcher.find("concatenate cats") == set()
+    assert matcher.find("a cat, some cat_food.") == {0, 1}
+    assert matcher.find("") == set()
+
+
+def test_duplicate_keywords_report_every_index():
+    assert KeywordMatcher(["abc", "ABC", "b"]).find("xabcx") == {0, 1, 2}
@@ -0,0 +1,156 @@
+"""Leaderboard windows: cold starts, overlapping rebuilds, awards racing a rebuild and tied ranks"""
+
+import pytest
+
+from app.services import leaderboard_service
+from app.services.leaderboard_service import LeaderboardService
+
+
+def scores(page: list[dict]) -> dict[str, int]:
+    return {entry["user"]["id"]: entry["xp_total"] for entry in page}
+
+
+@pytest.fixture
+def scheduled(monkeypatch) -> list[str]:
+    """Periods whose rebuild was sent to the worker"""
+    periods: list[str] = []
+    monkeypatch.setattr(leaderboard_service, "schedule_rebuild", periods.append)
+    return periods
+
+
+async def rebuild_keys(redis_client) -> list[str]:
+    return [key async for key in redis_client.scan_iter("leaderboard:*:rebuild*")] + [
+        key async for key in redis_client.scan_iter("leaderboard:*:deltas*")
+    ]
+
+
+async def test_award_on_cold_redis_does_not_hide_rebuild(db, redis_client, make_user, scheduled):
+    users = [await make_user(xp_total=xp) for xp in (300, 200, 100)]
+    service = LeaderboardService(redis_client, db)
+
+    # The award lands before anything built the window
+    await service.record_award(users[2].id, 10, 100)
+    await service.record_awards([(users[1].id, 5)])
+
+    # Pages never rebuild themselves: the worker is asked to, once
+    assert await service.get_page("all_time") == []
+    assert await service.get_page("all_time") == []
+    assert scheduled == ["all_time"]
+
+    await service.rebuild("all_time")
+    page = await service.get_page("all_time")
+    assert scores(page) == {str(user.id): user.xp_total for user in users}
+    assert [entry["rank"] for entry in page] == [1, 2, 3]
+    assert scheduled == ["all_time"]
+
+
+async def test_awards_update_built_windows(db, redis_client, make_user):
+    user, other = await make_user(xp_total=50), await make_user(xp_total=80)
+    service = LeaderboardService(redis_client, db)
+    await service.rebuild("all_time")
+
+    await service.record_awards([(user.id, 20), (user.id, 15)])
+    await service.record_award(other.id, 5, 85)
+
+    assert scores(await service.get_page("all_time")) == {str(user.id): 85, str(other.id): 85}
+
+
+async def test_rebuild_keeps_awards_made_while_streaming(db, redis_client, make_user, monkeypatch):
+    early, late = await make_user(xp_total=40), await make_user(xp_total=70)
+    service = LeaderboardService(redis_client, db)
+    await service.rebuild("all_time")
+    stream = db.stream
+
+    async def stream_then_award(query):
+        result = await stream(query)
+        # Committed after the rebuild's snapshot, recorded mid-stream
+        await service.record_awards([(late.id, 30)])
+        await service.record_award(early.id, 5, 45)
+        return result
+
+    monkeypatch.setattr(db, "stream", stream_then_award)
+    assert await service.rebuild("all_time") == 2
+
+    assert scores(await service.get_page("all_time")) == {str(late.id): 100, str(early.id): 45}
+    assert await rebuild_keys(redis_client) == []
+
+
+async def test_overlapping_rebuilds_keep_the_window(db, redis_client, make_user, monkeypatch):
+    user = await make_user(xp_total=40)
+    service = LeaderboardService(redis_client, db)
+    stream = db.stream
+    inner = []
+
+    async def stream_and_rebuild(query):
+        result = await stream(query)
+        if not inner:
+            inner.append(await LeaderboardService(redis_client, db).rebuild("all_time"))
+        return result
+
+    monkeypatch.setattr(db, "stream", stream_and_rebuild)
+    assert await service.rebuild("all_time") == 1
+    assert inner == [None]
+    assert scores(await service.get_page("all_time")) == {str(user.id): 40}
+
+
+async def test_rebuild_that_lost_its_lock_or_scratch_does_not_swap(db, redis_client, make_user, monkeypatch):
+    user = await make_user(xp_total=40)
+    service = LeaderboardService(redis_client, db)
+    await service.rebuild("all_time")
+    version = await service.version()
+    await make_user(xp_total=90)
+    stream = db.stream
+
+    async def stream_then_expire_lock(query):
+        result = await stream(query)
+        # The lock timed out and another run took the window over
+        await redis_client.set("leaderboard:all_time:rebuilding", "other-run")
+        return result
+
+    monkeypatch.setattr(db, "stream", stream_then_expire_lock)
+    assert await service.rebuild("all_time") is None
+    assert scores(await service.get_page("all_time")) == {str(user.id): 40}
+    await redis_client.delete("leaderboard:all_time:rebuilding")
+
+    monkeypatch.setattr(db, "stream", stream)
+    make_pipeline = redis_client.pipeline
+
+    def pipeline(*args, **kwargs):
+        # The scratch set is lost (evicted) right after each batch
+        pipe = make_pipeline(*args, **kwargs)
+        pipe.expire = lambda key, seconds: pipe.delete(key)
+        return pipe
+
+    monkeypatch.setattr(redis_client, "pipeline", pipeline)
+    assert await service.rebuild("all_time") is None
+    assert scores(await service.get_page("all_time")) == {str(user.id): 40}
+    assert await service.version() == version
+    assert await rebuild_keys(redis_client) == []
+
+
+async def test_rank_with_tied_scores(redis_client):
+    service = LeaderboardService(redis_client)
+    scores = {"a": 100, "b": 80, "c": 80, "d": 80, "e": 50}
+    await redis_client.zadd(service.window_key("all_time"), scores)
+
+    # Equal XP shares a rank; positions still break the tie
+    tied = [await service.get_rank(member, k=1) for member in ("b", "c", "d")]
+    assert [result["rank"] for result in tied] == [2, 2, 2]
+    assert sorted(result["position"] for result in tied) == [2, 3, 4]
+
+    result = await service.get_rank("e", k=1)
+    assert (result["rank"], result["position"], result["xp_total"]) == (5, 5, 50)
+    assert result["percentile"] == 20.0
+    # The window starts inside the tie: its first entry keeps the tie's rank
+    assert [(entry["rank"], entry["position"], entry["xp_total"]) for entry in result["neighbours"]] == [
+        (2, 4, 80), (5, 5, 50),
+    ]
+
+    result = await service.get_rank("a", k=2)
+    assert (result["rank"], result["percentile"]) == (1, 100.0)
+    assert [entry["rank"] for entry in result["neighbours"]] == [1, 2, 2]
+
+    # Users without XP rank after everyone who has some
+    result = await service.get_rank("nobody", k=1)
+    assert (result["rank"], result["position"], result["total_ranked"]) == (6, None, 5)
+    assert [(entry["rank"], entry["xp_total"]) for entry in result["neighbours"]] == [(5, 50)]
@@ -0,0 +1,150 @@
+"""Link rules and probes, including SSRF bypass attempts"""
+
+import httpx
+import pytest
+
+from app.services import link_checker
+from app.services.link_checker import LinkChecker, is_public_host, link_rule_error, public_address
+
+PUBLIC = "93.184.215.14"
+
+
+def resolver(table: dict[str, list[str]]):
+    async def resolve(host: str, port: int) -> list[str]:
+        if host not in table:
+            raise OSError(f"unknown host {host}")
+        return table[host]
+
+    return resolve
+
+
+class Web:
+    """MockTransport recording requests, answering by method, Host header and path"""
+
+    def __init__(self, routes: dict[str, httpx.Response]):
+        self.routes = routes
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        route = f"{request.headers['host']}{request.url.path}"
+        return self.routes.get(f"{request.method} {route}", self.routes.get(route, httpx.Response(404)))
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    link_checker._results.clear()
+    yield
+    link_checker._results.clear()
+
+
+async def probe(url: str, routes: dict, table: dict, resolve=None):
+    web = Web(routes)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(web.handler)) as client:
+        status = await LinkChecker(client, resolve or resolver(table)).check(url)
+    return status, web.requests
+
+
+@pytest.mark.parametrize(
+    "host",
+    ["localhost", "127.0.0.1", "10.1.2.3", "169.254.169.254", "::1", "::ffff:127.0.0.1",
+     "0x7f.1", "2130706433", "127.1", "017700000001", "intranet", "printer.local"],
+)
+def test_private_hosts_fail_the_rules(host):
+    assert not is_public_host(host)
+    link = f"http://[{host}]/" if ":" in host else f"http://{host}/"
+    assert link_rule_error([link], None) == f"Link must point to a public host: {link}"
+
+
+def test_public_hosts_pass_the_rules():
+    assert is_public_host("github.com") and is_public_host(PUBLIC)
+    assert link_rule_error(["https://github.com/a/b"], "github.com") is None
+    assert link_rule_error(["https://evil.com/?github.com"], "github.com") == "Link must be from domain: github.com"
+
+
+async def test_public_address_requires_every_address_global():
+    table = {"ok.test": [PUBLIC, "2606:2800:220:1::1"], "mixed.test": [PUBLIC, "10.0.0.1"], "none.test": []}
+    assert await public_address("ok.test", 443, resolver(table)) == PUBLIC
+    assert await public_address("mixed.test", 443, resolver(table)) is None
+    assert await public_address("none.test", 443, resolver(table)) is None
+    assert await public_address("missing.test", 443, resolver(table)) is None
+    # The system resolver reads shorthand IPv4 like inet_aton does
+    assert await public_address("0x7f.1", 80) is None
+    assert await public_address("2130706433", 80) is None
+
+
+async def test_probe_pins_the_vetted_address():
+    status, requests = await probe(
+        "https://docs.example.org:8443/page",
+        {"docs.example.org:8443/page": httpx.Response(200)},
+        {"docs.example.org": [PUBLIC]},
+    )
+    assert status == (True, 200, "https://docs.example.org:8443/page", None)
+    request, = requests
+    assert request.method == "HEAD"
+    assert (request.url.host, request.url.port) == (PUBLIC, 8443)
+    assert request.headers["host"] == "docs.example.org:8443"
+    assert request.extensions["sni_hostname"] == "docs.example.org"
+
+
+async def test_probe_rejects_names_resolving_to_private_addresses():
+    # Passes the name rules but points at loopback, like *.nip.io
+    url = "http://127.0.0.1.nip.io/admin"
+    assert link_rule_error([url], None) is None
+    status, requests = await probe(url, {}, {"127.0.0.1.nip.io": ["127.0.0.1"]})
+    assert status == (False, None, url, "link unreachable")
+    assert requests == []
+
+
+async def test_probe_rejects_shorthand_ip_hosts():
+    # Real resolver: getaddrinfo expands 0x7f.1 to 127.0.0.1 without DNS
+    status, requests = await probe("http://0x7f.1/", {}, {}, resolve=link_checker.resolve_host)
+    assert status.error == "link unreachable"
+    assert requests == []
+
+
+@pytest.mark.parametrize(
+    "location",
+    ["http://internal.example.org/secrets", "http://169.254.169.254/latest/meta-data", "http://0x7f.1/", "file:///etc/passwd"],
+)
+async def test_probe_rechecks_every_redirect(location):
+    status, requests = await probe(
+        "https://blog.example.org/post",
+        {"blog.example.org/post": httpx.Response(302, headers={"location": location})},
+        {"blog.example.org": [PUBLIC], "internal.example.org": ["10.0.0.5"]},
+    )
+    assert not status.alive and status.final_url == location
+    assert [request.headers["host"] for request in requests] == ["blog.example.org"]
+
+
+async def test_probe_follows_public_redirects_and_falls_back_to_get():
+    status, requests = await probe(
+        "http://old.example.org/a",
+        {
+            "old.example.org/a": httpx.Response(301, headers={"location": "https://new.example.org/b"}),
+            "HEAD new.example.org/b": httpx.Response(405),
+            "GET new.example.org/b": httpx.Response(200),
+        },
+        {"old.example.org": [PUBLIC], "new.example.org": ["93.184.215.15"]},
+    )
+    assert status == (True, 200, "https://new.example.org/b", None)
+    assert [(r.method, r.url.host) for r in requests] == [
+        ("HEAD", PUBLIC), ("HEAD", "93.184.215.15"), ("GET", "93.184.215.15"),
+    ]
+
+
+async def test_transport_errors_are_generic():
+    def fail(request):
+        raise httpx.ConnectError("[Errno 111] Connection refused to 93.184.215.14")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(fail)) as client:
+        status = await LinkChecker(client, resolver({"down.example.org": [PUBLIC]})).check("https://down.example.org/")
+    assert status == (False, None, "https://down.example.org/", "link unreachable")
+
+
+async def test_pinned_probes_never_reuse_connections():
+    # Connections are pooled by address, not host name: a kept-alive TLS
+    # connection to a shared CDN address would carry another host's SNI
+    client = LinkChecker().http_client
+    assert client._transport._pool._max_keepalive_connections == 0
+    assert not client._trust_env
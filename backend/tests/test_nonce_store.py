@@ -0,0 +1,88 @@
+"""Nonce stores: single use, expiry (timing wheel vs brute force), redeem"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import nonce_store
+from app.core.nonce_store import InMemoryNonceStore, RedisNonceStore
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(nonce_store, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+async def test_wheel_matches_brute_force_expiry(clock):
+    rng = random.Random(3)
+    # A small wheel so TTLs span several revolutions
+    store = InMemoryNonceStore(slots=8, tick=0.5)
+    reference: dict[str, tuple[str, float]] = {}
+    addresses = [f"0xAbC{n}" for n in range(6)]
+
+    for step in range(5000):
+        clock.now += rng.choice([0, 0.01, 0.2, 0.5, 1.3, 7.0])
+        address = rng.choice(addresses)
+        if rng.random() < 0.5:
+            nonce, ttl = f"n{step}", rng.choice([1, 2, 3, 5, 30])
+            await store.issue(address, nonce, ttl)
+            reference[address.lower()] = (nonce, clock.now + ttl)
+        else:
+            entry = reference.pop(address.lower(), None)
+            expected = entry[0] if entry and entry[1] > clock.now else None
+            assert await store.consume(address.upper()) == expected, step
+        live = sum(expires_at > clock.now for _, expires_at in reference.values())
+        assert live <= len(store) <= len(reference)
+
+    # Expired entries are dropped once the wheel passes them
+    clock.now += 60
+    assert await store.consume(addresses[0]) is None
+    assert len(store) == 0
+
+
+async def test_expires_at_ttl(clock):
+    store = InMemoryNonceStore()
+    await store.issue("0xabc", "n1", 300)
+    clock.now += 299.9
+    assert await store.consume("0xabc") == "n1"
+    assert await store.consume("0xabc") is None
+
+    await store.issue("0xabc", "n2", 300)
+    clock.now += 300
+    assert await store.consume("0xabc") is None
+
+
+async def test_reissue_replaces_nonce(clock):
+    store = InMemoryNonceStore(slots=4, tick=1)
+    await store.issue("0xabc", "old", 2)
+    await store.issue("0xabc", "new", 10)
+    clock.now += 5
+    assert await store.consume("0xabc") == "new"
+
+
+@pytest.mark.parametrize("store_kind", ["redis", "memory"])
+async def test_redeem(store_kind, redis_client):
+    store = RedisNonceStore(redis_client) if store_kind == "redis" else InMemoryNonceStore()
+
+    assert await store.redeem("0xAbc", "n1", "refresh", "token", 60, redis_client) is None
+
+    await store.issue("0xAbc", "n1", 60)
+    assert await store.redeem("0xabc", "n2", "refresh", "token", 60, redis_client) == "n1"
+    assert await redis_client.get("refresh") is None
+
+    await store.issue("0xAbc", "n3", 60)
+    assert await store.redeem("0xABC", "n3", "refresh", "token", 60, redis_client) == "n3"
+    assert await redis_client.get("refresh") == "token"
+    assert 0 < await redis_client.ttl("refresh") <= 60
+    assert await store.consume("0xabc") is None
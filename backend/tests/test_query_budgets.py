@@ -0,0 +1,117 @@
+"""Query budgets of the hot read endpoints
+
+Each request must stay within a fixed number of statements however many
+rows it returns, and never lazy load - a regression to N+1 fails here.
+"""
+
+import uuid
+
+from app.models.course import Course
+from app.models.task import Submission, SubmissionStatus, Task, TaskType
+from app.models.user import UserRole
+from app.services import leaderboard_service
+from app.services.leaderboard_service import LeaderboardService
+from tests.conftest import auth_headers
+
+ROWS = 15
+
+
+async def make_course(db, author, tasks: int = 0, published: bool = True) -> Course:
+    course = Course(
+        slug=f"course-{uuid.uuid4().hex[:10]}",
+        title="Intro to rollups",
+        description="Learn how rollups work",
+        author_id=author.id,
+        published=published,
+    )
+    db.add(course)
+    await db.flush()
+    db.add_all(
+        Task(
+            course_id=course.id,
+            title=f"Task {n}",
+            description="Do the thing",
+            task_type=TaskType.TEXT_SUBMISSION,
+            xp_reward=10,
+        )
+        for n in range(tasks)
+    )
+    await db.commit()
+    return course
+
+
+async def test_course_list(client, db, make_user, query_budget):
+    author = await make_user(UserRole.INSTRUCTOR)
+    for _ in range(ROWS):
+        await make_course(db, author)
+
+    # Page and exact count, then the page comes from the catalog cache
+    with query_budget(max_queries=2, max_repeats=1):
+        response = await client.get("/api/v1/courses", params={"per_page": 10})
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 10
+
+    with query_budget(max_queries=0):
+        response = await client.get("/api/v1/courses", params={"per_page": 10})
+    assert response.status_code == 200
+
+    cursor = response.json()["meta"]["next_cursor"]
+    with query_budget(max_queries=1, max_repeats=1):
+        response = await client.get("/api/v1/courses", params={"per_page": 10, "cursor": cursor})
+    assert len(response.json()["data"]) == ROWS - 10
+
+
+async def test_course_tasks_with_submissions(client, db, make_user, query_budget):
+    learner = await make_user()
+    course = await make_course(db, await make_user(UserRole.INSTRUCTOR), tasks=ROWS)
+    tasks = (await db.execute(Task.__table__.select().where(Task.course_id == course.id))).all()
+    db.add_all(
+        Submission(task_id=task.id, user_id=learner.id, submission_text="done", status=SubmissionStatus.PENDING)
+        for task in tasks
+    )
+    await db.commit()
+
+    with query_budget(max_queries=3, max_repeats=1):
+        response = await client.get(f"/api/v1/tasks/course/{course.id}", headers=auth_headers(learner))
+    assert response.status_code == 200
+    assert len(response.json()) == ROWS
+    assert all(task["user_submission"] for task in response.json())
+
+
+async def test_user_submissions(client, db, make_user, query_budget):
+    learner = await make_user()
+    course = await make_course(db, await make_user(UserRole.INSTRUCTOR), tasks=ROWS)
+    tasks = (await db.execute(Task.__table__.select().where(Task.course_id == course.id))).all()
+    db.add_all(
+        Submission(task_id=task.id, user_id=learner.id, submission_text="done", status=SubmissionStatus.PENDING)
+        for task in tasks
+    )
+    await db.commit()
+
+    with query_budget(max_queries=3, max_repeats=1):
+        response = await client.get(
+            f"/api/v1/tasks/submissions/user/{learner.id}", headers=auth_headers(learner)
+        )
+    assert response.status_code == 200
+    assert len(response.json()) == ROWS
+
+
+async def test_leaderboard(client, db, redis_client, make_user, query_budget, monkeypatch):
+    for n in range(ROWS):
+        await make_user(xp_total=100 + n)
+    monkeypatch.setattr(leaderboard_service, "schedule_rebuild", lambda period: None)
+
+    # A cold Redis is served empty; the worker rebuilds the window
+    with query_budget(max_queries=0):
+        response = await client.get("/api/v1/users/leaderboard", params={"limit": 10})
+    assert response.status_code == 200
+    assert response.json() == []
+
+    await LeaderboardService(redis_client, db).rebuild("all_time")
+    with query_budget(max_queries=0):
+        response = await client.get("/api/v1/users/leaderboard", params={"limit": 10})
+    assert [entry["xp_total"] for entry in response.json()] == list(range(100 + ROWS - 1, 100 + ROWS - 11, -1))
+
+    with query_budget(max_queries=0):
+        response = await client.get("/api/v1/users/leaderboard", params={"limit": 10, "offset": 10})
+    assert len(response.json()) == ROWS - 10
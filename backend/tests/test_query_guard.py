@@ -0,0 +1,109 @@
+"""Query guard: SQL normalization, repeat and lazy-load detection"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.query_guard import (
+    QueryGuardError,
+    QueryGuardMiddleware,
+    QueryLog,
+    normalize_sql,
+    track,
+)
+from app.models.user import User
+
+
+@pytest.mark.parametrize(
+    "statement, normalized",
+    [
+        ("SELECT * FROM t1 WHERE a = 'it''s' AND b = 42", "SELECT * FROM t1 WHERE a = ? AND b = ?"),
+        ("SELECT col_2 FROM t WHERE id = $1::UUID AND x > $2", "SELECT col_2 FROM t WHERE id = ? AND x > ?"),
+        ("SELECT 1 FROM t WHERE id IN ($1, $2,\n $3)", "SELECT ? FROM t WHERE id IN (?...)"),
+        ("UPDATE t SET v = %(v)s WHERE id IN (?, ?)", "UPDATE t SET v = ? WHERE id IN (?...)"),
+        ("SELECT 1.5, ARRAY[$1::VARCHAR[]]", "SELECT ?, ARRAY[?]"),
+    ],
+)
+def test_normalize_sql(statement, normalized):
+    assert normalize_sql(statement) == normalized
+
+
+def test_in_lists_of_any_length_share_one_entry():
+    log = QueryLog(max_repeats=None)
+    for n in range(2, 6):
+        params = ", ".join(f"${i}" for i in range(1, n + 1))
+        log.record_statement(normalize_sql(f"SELECT * FROM t WHERE id IN ({params})"))
+    assert log.statements.most_common() == [("SELECT * FROM t WHERE id IN (?...)", 4)]
+
+
+def test_raise_mode_stops_at_first_excess_repeat():
+    log = QueryLog("raise", max_repeats=2)
+    log.record_statement("SELECT ?")
+    log.record_statement("SELECT ?")
+    with pytest.raises(QueryGuardError, match="more than 2 times"):
+        log.record_statement("SELECT ?")
+
+
+def test_warn_mode_reports():
+    log = QueryLog("warn", max_repeats=1)
+    for _ in range(3):
+        log.record_statement("SELECT ?")
+    log.record_statement("SELECT ? FROM t")
+    log.record_lazy_load("User.xp_entries")
+    log.record_lazy_load("User.xp_entries")
+    assert log.report() == ["3x SELECT ?", "lazy load of User.xp_entries"]
+    assert log.total == 4
+
+
+async def test_detects_repeats_against_the_database(db, make_user):
+    users = [await make_user() for _ in range(3)]
+    with track("raise", max_repeats=2) as log:
+        for user in users[:2]:
+            await db.execute(select(User).where(User.id == user.id))
+        with pytest.raises(QueryGuardError):
+            await db.execute(select(User).where(User.id == users[2].id))
+    assert log.total == 3
+
+
+async def test_detects_lazy_loads(db, make_user):
+    for _ in range(2):
+        await make_user()
+    db.expunge_all()
+
+    def lazy(session):
+        return [len(user.xp_entries) for user in session.scalars(select(User))]
+
+    def eager(session):
+        query = select(User).options(selectinload(User.xp_entries))
+        return [len(user.xp_entries) for user in session.scalars(query)]
+
+    with track("raise", max_repeats=1):
+        with pytest.raises(QueryGuardError, match="Lazy load of User.xp_entries"):
+            await db.run_sync(lazy)
+    db.expunge_all()
+    with track("raise", max_repeats=1) as log:
+        assert await db.run_sync(eager) == [0, 0]
+    assert log.total == 2 and not log.lazy_loads
+
+
+async def test_nested_logs_feed_their_parents(db):
+    with track("warn") as outer:
+        await db.execute(select(User))
+        with track("warn") as inner:
+            await db.execute(select(User.id))
+    assert (outer.total, inner.total) == (2, 1)
+
+
+async def test_middleware_warns_per_request(db, make_user, capsys):
+    user = await make_user()
+
+    async def app(scope, receive, send):
+        for _ in range(3):
+            await db.execute(select(User).where(User.id == user.id))
+
+    middleware = QueryGuardMiddleware(app, mode="warn", max_repeats=2)
+    await middleware({"type": "http", "method": "GET", "path": "/users"}, None, None)
+
+    output = capsys.readouterr().out
+    assert "Query guard: GET /users ran 3 statements" in output
+    assert "3x SELECT" in output
@@ -0,0 +1,135 @@
+"""CompiledQuiz batch grading against a per-question reference loop"""
+
+import json
+import math
+import random
+
+import pytest
+
+from app.services.quiz_grader import CompiledQuiz
+
+OPTIONS = ["a", "b", "c", "d"]
+
+
+def number(answer) -> float:
+    if isinstance(answer, bool):
+        return math.nan
+    if isinstance(answer, (int, float)):
+        return float(answer)
+    try:
+        return float(str(answer).strip())
+    except ValueError:
+        return math.nan
+
+
+def norm(answer) -> str:
+    return str(answer).strip().casefold()
+
+
+def reference(questions: list[dict], threshold: float, answers: dict) -> tuple[float, bool]:
+    earned = total = 0.0
+    for question in questions:
+        points = question.get("points", 1)
+        total += points
+        if question["id"] not in answers:
+            continue
+        answer = answers[question["id"]]
+        if question["type"] == "single":
+            earned += points * (norm(answer) == norm(question["answer"]))
+        elif question["type"] == "numeric":
+            earned += points * (abs(number(answer) - question["answer"]) <= question.get("tolerance", 0))
+        elif answer is not None:
+            picks = {norm(pick) for pick in (answer if isinstance(answer, list) else [answer])}
+            correct = set(question["answer"])
+            right, wrong = len(picks & correct), len(picks - correct)
+            if question.get("partial"):
+                earned += points * min(max((right - wrong) / len(correct), 0.0), 1.0)
+            else:
+                earned += points * (right == len(correct) and wrong == 0)
+    score = earned / total
+    return score, score >= threshold
+
+
+def random_quiz(rng: random.Random) -> list[dict]:
+    questions = []
+    for n in range(rng.randint(1, 6)):
+        question = {"id": f"q{n}", "type": rng.choice(["single", "multi", "numeric"])}
+        if rng.random() < 0.5:
+            question["points"] = rng.randint(1, 3)
+        if question["type"] == "single":
+            question["answer"] = rng.choice(OPTIONS)
+        elif question["type"] == "multi":
+            question["answer"] = rng.sample(OPTIONS, rng.randint(1, 3))
+            question["options"] = OPTIONS[: rng.randint(0, 4)]
+            question["partial"] = rng.random() < 0.5
+        else:
+            question["answer"] = rng.choice([3, 2.5, -1.25])
+            question["tolerance"] = rng.choice([0, 0.1, 0.5])
+        questions.append(question)
+    return questions
+
+
+def random_answer(rng: random.Random, question: dict):
+    return rng.choice([
+        lambda: rng.choice(OPTIONS),
+        lambda: " " + rng.choice(OPTIONS).upper() + " ",
+        lambda: rng.sample(OPTIONS + ["e"], rng.randint(0, 4)),
+        lambda: question["answer"],
+        lambda: rng.choice([3, 3.05, "2.5", 2.9, -1.25, True, "x"]),
+        lambda: None,
+    ])()
+
+
+def test_batch_matches_reference():
+    rng = random.Random(7)
+    for _ in range(200):
+        questions = random_quiz(rng)
+        threshold = rng.choice([0.5, 0.7, 1.0])
+        quiz = CompiledQuiz({"questions": questions, "pass_threshold": threshold})
+        batch = [
+            {q["id"]: random_answer(rng, q) for q in questions if rng.random() < 0.85}
+            for _ in range(rng.randint(1, 20))
+        ]
+
+        grades = quiz.grade_batch([json.dumps(answers) for answers in batch])
+
+        for grade, answers in zip(grades, batch):
+            score, passed = reference(questions, threshold, answers)
+            assert grade.score == pytest.approx(score), (questions, answers)
+            assert grade.passed == passed
+            assert (grade.error is None) == passed
+
+
+def test_legacy_correct_answers():
+    quiz = CompiledQuiz({"correct_answers": {"q1": "B", "q2": ["a", "c"], "q3": 42}})
+    assert quiz.grade(json.dumps({"q1": "b", "q2": ["c", "a"], "q3": "42"})).score == 1.0
+    assert quiz.grade(json.dumps({"q1": "b", "q2": ["a"], "q3": 41})).score == pytest.approx(1 / 3)
+
+
+@pytest.mark.parametrize(
+    "answers_text, error",
+    [
+        (None, "Quiz answers are required"),
+        ("not json", "Quiz answers must be JSON"),
+        ("[1, 2]", "Quiz answers must be a JSON object of question id to answer"),
+    ],
+)
+def test_malformed_answers(answers_text, error):
+    grades = CompiledQuiz({"questions": [{"id": "q1", "answer": "a"}]}).grade_batch(
+        [answers_text, '{"q1": "a"}']
+    )
+    assert grades[0] == (0.0, False, error)
+    assert grades[1] == (1.0, True, None)
+
+
+@pytest.mark.parametrize(
+    "rules, error",
+    [
+        ({}, "Quiz has no correct answers configured"),
+        ({"questions": [{"id": "q1", "type": "essay", "answer": "x"}]}, "Invalid quiz question: q1"),
+        ({"questions": [{"id": "q1", "type": "multi", "answer": []}]}, "Invalid quiz question: q1"),
+        ({"questions": [{"id": "q1", "answer": "a", "points": 0}]}, "Quiz has no points to score"),
+    ],
+)
+def test_invalid_rules(rules, error):
+    assert CompiledQuiz(rules).grade('{"q1": "a"}') == (0.0, False, error)
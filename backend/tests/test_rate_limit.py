@@ -0,0 +1,151 @@
+"""GCRA rate limiter: token-bucket reference, shared leases, failing open"""
+
+import random
+from types import SimpleNamespace
+
+import fakeredis
+import httpx
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core import cache, rate_limit
+from app.core.config import settings
+from app.core.rate_limit import (
+    RateLimit,
+    RateLimiter,
+    RateLimitMiddleware,
+    client_identity,
+    route_limit,
+)
+from app.core.security import create_access_token
+
+
+class Clock:
+    """Drives both the wall clock sent to Redis and the local monotonic clock"""
+
+    def __init__(self):
+        self.now = 1_800_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    fake_time = SimpleNamespace(time=clock.time, monotonic=clock.monotonic)
+    # Leases and denials are cached in TTLCaches, which expire on the same clock
+    monkeypatch.setattr(rate_limit, "time", fake_time)
+    monkeypatch.setattr(cache, "time", fake_time)
+    return clock
+
+
+def limiter_for(redis_client, **options) -> RateLimiter:
+    async def factory():
+        return redis_client
+
+    return RateLimiter(factory, **options)
+
+
+async def test_matches_token_bucket(clock, redis_client):
+    # One token per second, burst of 60; leases of one token go to Redis every time
+    limit = RateLimit("reads", 60)
+    limiter = limiter_for(redis_client, lease_fraction=0)
+    rng = random.Random(5)
+    tokens, last = 60.0, clock.now
+
+    for step in range(3000):
+        clock.now += rng.choice([0, 0.001, 0.25, 0.999, 1.0, 3.5])
+        tokens = min(60.0, tokens + (clock.now - last))
+        last = clock.now
+
+        retry_after = await limiter.hit("ip:1", limit)
+
+        if tokens >= 1:
+            assert retry_after == 0, step
+            tokens -= 1
+        else:
+            assert retry_after == pytest.approx(1 - tokens, abs=0.002), step
+
+
+async def test_leases_never_exceed_the_shared_budget(clock, redis_client):
+    limit = RateLimit("default", 60)
+    workers = [limiter_for(redis_client, lease_fraction=0.1) for _ in range(3)]
+    rng = random.Random(9)
+    start = clock.now
+
+    # A burst at one instant is served in full, then denied
+    allowed = 0
+    for _ in range(100):
+        allowed += await rng.choice(workers).hit("user:1", limit) == 0
+    assert allowed == 60
+
+    for _ in range(2000):
+        clock.now += rng.choice([0, 0.05, 0.3, 1.1])
+        allowed += await rng.choice(workers).hit("user:1", limit) == 0
+        assert allowed <= 60 + (clock.now - start) + 1e-9
+
+
+async def test_clients_and_groups_are_independent(clock, redis_client):
+    limiter = limiter_for(redis_client, lease_fraction=0)
+    auth = RateLimit("auth", 2)
+    assert [await limiter.hit("ip:1", auth) for _ in range(2)] == [0, 0]
+    assert await limiter.hit("ip:1", auth) > 0
+    assert await limiter.hit("ip:2", auth) == 0
+    assert await limiter.hit("ip:1", RateLimit("reads", 2)) == 0
+
+
+async def test_redis_errors_fail_open(clock):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    limiter = limiter_for(fakeredis.FakeAsyncRedis(server=server))
+    with pytest.raises(ConnectionError):
+        await fakeredis.FakeAsyncRedis(server=server).ping()
+    assert [await limiter.hit("ip:1", RateLimit("auth", 1)) for _ in range(5)] == [0] * 5
+
+
+@pytest.mark.parametrize(
+    "method, path, group",
+    [
+        ("POST", "/api/v1/auth/verify", "auth"),
+        ("POST", "/api/v1/tasks/submissions/", "submissions"),
+        ("GET", "/api/v1/tasks/submissions", "reads"),
+        ("PATCH", "/api/v1/users/me", "default"),
+        ("GET", "/metrics", None),
+    ],
+)
+def test_route_limit(method, path, group):
+    limit = route_limit(method, path)
+    assert (limit.group if limit else None) == group
+
+
+def test_client_identity():
+    token = create_access_token({"sub": "42"})
+    scope = {"headers": [(b"authorization", f"Bearer {token}".encode())], "client": ("10.0.0.1", 1234)}
+    assert client_identity(scope) == "user:42"
+    scope["headers"] = [(b"authorization", b"Bearer not-a-token")]
+    assert client_identity(scope) == "ip:10.0.0.1"
+    assert client_identity({"headers": []}) == "ip:unknown"
+
+
+async def test_middleware_answers_429(clock, redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_PER_MINUTE", 1)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def factory():
+        return redis_client
+
+    transport = httpx.ASGITransport(app=RateLimitMiddleware(app, factory))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.post("/api/v1/auth/nonce")).status_code == 204
+        response = await client.post("/api/v1/auth/nonce")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "60"
+        assert (await client.get("/metrics")).status_code == 204
@@ -0,0 +1,66 @@
+"""User cache: a read racing an invalidation must not cache the stale row"""
+
+import uuid
+from datetime import datetime
+
+from app.core.user_cache import UserCache
+from app.models.user import User, UserRole
+
+
+def make_cache() -> UserCache:
+    return UserCache(l1_size=100, l1_ttl=60, l2_ttl=300)
+
+
+def make_user(**fields) -> User:
+    now = datetime.utcnow()
+    return User(
+        id=fields.pop("id", uuid.uuid4()),
+        wallet_address="0x" + "ab" * 20,
+        username="alice",
+        role=UserRole.LEARNER,
+        xp_total=fields.pop("xp_total", 0),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+async def test_miss_then_set_is_cached(redis_client):
+    cache, other_worker = make_cache(), make_cache()
+    user = make_user(xp_total=10)
+
+    cached = await cache.get(user.id, redis_client)
+    assert cached.user is None
+    await cache.set(user, redis_client, cached.generation)
+
+    assert (await cache.get(user.id, redis_client)).user.xp_total == 10
+    assert (await other_worker.get(user.id, redis_client)).user.xp_total == 10
+
+
+async def test_set_after_invalidation_is_dropped(redis_client):
+    reader, writer = make_cache(), make_cache()
+    stale = make_user(xp_total=10)
+
+    # Reader misses and loads the row; the writer then updates the user and
+    # invalidates before the reader gets to populate the cache
+    cached = await reader.get(stale.id, redis_client)
+    await writer.invalidate([stale.id], redis_client)
+    await reader.set(stale, redis_client, cached.generation)
+
+    assert await redis_client.get(f"user:{stale.id}") is None
+    assert (await reader.get(stale.id, redis_client)).user is None
+
+    # The next miss sees the new generation and may cache the fresh row
+    fresh = make_user(id=stale.id, xp_total=20)
+    cached = await reader.get(stale.id, redis_client)
+    await reader.set(fresh, redis_client, cached.generation)
+    assert (await writer.get(stale.id, redis_client)).user.xp_total == 20
+
+
+async def test_invalidate_evicts_both_tiers(redis_client):
+    cache = make_cache()
+    user = make_user()
+    await cache.set(user, redis_client, (await cache.get(user.id, redis_client)).generation)
+
+    await cache.invalidate([user.id], redis_client)
+
+    assert (await cache.get(user.id, redis_client)).user is None
@@ -0,0 +1,91 @@
+"""Bulk XP grants: running balances and replay idempotency"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import func, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+from app.models.xp import XPLedger
+from app.services.xp_service import _GRANT_SQL, XPGrantRow, XPService, _grant_params
+
+
+async def ledger(db) -> list[XPLedger]:
+    result = await db.execute(select(XPLedger).order_by(XPLedger.id))
+    return list(result.scalars())
+
+
+async def xp_totals(db, *users: User) -> list[int]:
+    return [await db.scalar(select(User.xp_total).where(User.id == user.id)) for user in users]
+
+
+async def test_bulk_grant_running_balances(db, make_user):
+    alice = await make_user(xp_total=100)
+    bob = await make_user()
+    grants = [
+        XPGrantRow(alice.id, 10, "bounty", uuid.uuid4()),
+        XPGrantRow(bob.id, 5, "bounty", uuid.uuid4()),
+        XPGrantRow(alice.id, 20, "bounty", uuid.uuid4()),
+        XPGrantRow(uuid.uuid4(), 50, "bounty", uuid.uuid4()),  # unknown user
+    ]
+
+    result = await XPService(db).bulk_award_xp(grants, chunk_size=2)
+
+    assert (result.awarded, result.skipped, result.xp_awarded, result.chunks) == (3, 1, 35, 2)
+    rows = await ledger(db)
+    assert [(row.user_id, row.balance_after) for row in rows] == [
+        (alice.id, 110), (bob.id, 5), (alice.id, 130)
+    ]
+    assert await xp_totals(db, alice, bob) == [130, 5]
+
+
+async def test_bulk_grant_replay_is_idempotent(db, make_user):
+    users = [await make_user() for _ in range(5)]
+    campaign = uuid.uuid4()
+    grants = [XPGrantRow(user.id, 25, "campaign", campaign) for user in users]
+    # Repeats within the input count once; unsourced rows are never duplicates
+    grants += [grants[0], XPGrantRow(users[0].id, 1, "admin_grant")]
+    service = XPService(db)
+
+    first = await service.bulk_award_xp(grants, chunk_size=2)
+    replay = await service.bulk_award_xp(grants[:5], chunk_size=3)
+
+    assert (first.awarded, first.xp_awarded) == (6, 126)
+    assert (replay.requested, replay.awarded, replay.skipped, replay.xp_awarded) == (5, 0, 5, 0)
+    assert await db.scalar(select(func.count()).select_from(XPLedger)) == 6
+    assert await xp_totals(db, *users) == [26, 25, 25, 25, 25]
+
+
+async def test_concurrent_replay_is_idempotent(db, make_user):
+    users = [await make_user() for _ in range(3)]
+    campaign = uuid.uuid4()
+    grants = [XPGrantRow(user.id, 25, "campaign", campaign) for user in users]
+
+    # The replay starts while the first grant is uncommitted: its snapshot
+    # cannot see the first grant's rows, so only ON CONFLICT can skip them
+    async with AsyncSessionLocal() as first:
+        await first.execute(_GRANT_SQL, _grant_params(grants))
+        replay = asyncio.create_task(XPService(db).bulk_award_xp(grants))
+        await asyncio.sleep(0.2)
+        assert not replay.done()
+        await first.commit()
+    result = await replay
+
+    assert result.awarded == 0
+    assert await db.scalar(select(func.count()).select_from(XPLedger)) == 3
+    assert await xp_totals(db, *users) == [25, 25, 25]
+
+
+async def test_award_xp_once_per_source(db, make_user):
+    user = await make_user()
+    task_id = uuid.uuid4()
+    service = XPService(db)
+
+    award = await service.award_xp(user.id, 40, "task_completion", task_id)
+    again = await service.award_xp(user.id, 40, "task_completion", task_id)
+
+    assert award.balance_after == 40
+    assert again is None
+    assert len(await ledger(db)) == 1
+    assert await xp_totals(db, user) == [40]